@@ -18,49 +18,180 @@ Provides caching mechanism for parsed configuration files to avoid redundant
 parsing when using pytest-xdist with multiple workers.
 
 The cache stores parsed configuration data (props, transforms, tags, etc.) in a
-temporary file that is shared across all xdist workers. This significantly reduces
-test startup time when running with multiple workers.
+temporary directory that is shared across all xdist workers. This significantly
+reduces test startup time when running with multiple workers.
 
 Key features:
+- One shard file per key, so a lookup only reads the data of its own key
 - Per-key locking to prevent deadlocks when nested cache lookups occur
-- Atomic writes with integrity hash to prevent corruption
+- Atomic writes with an integrity hash in every shard to prevent corruption
+- Process-local LRU memo of the loaded keys, shared by all cache instances
 - Automatic cleanup on process exit
+- Opt-in persistent cache across sessions, keyed by a hash of the add-on content
 """
 import atexit
+import glob
 import hashlib
 import logging
 import os
 import pickle
 import re
+import shutil
 import tempfile
+from collections import OrderedDict
 from contextlib import nullcontext
-from typing import Callable, Dict, Optional, TypeVar
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
 
 from filelock import FileLock
 
-from pytest_splunk_addon import utils
+from pytest_splunk_addon import __version__, utils
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
 
 T = TypeVar("T")
 
+HASH_SEPARATOR = b"\n"
+MEMO_MAX_ENTRIES = 128
+# Keys computed from the tokenized events, which differ between sessions
+# unless the events are pregenerated
+EVENT_KEY_PREFIXES = ("tests::", "pytest_params::")
+PSA_DATA_CONFIG_FILE = "pytest-splunk-addon-data.conf"
+
+
+def get_addon_content_hash(
+    addon_path: str,
+    config_path: str,
+    extra_files: Iterable[str] = (),
+    extra_values: Iterable = (),
+    extra_dirs: Iterable[str] = (),
+) -> str:
+    """
+    Compute a hash of everything the parsed data and the generated tests depend on:
+    the conf files and the lookups of the add-on, the pytest-splunk-addon-data.conf,
+    the sample files and the version of the plugin.
+
+    Args:
+        addon_path: Path to the Splunk App
+        config_path: Path to the directory of pytest-splunk-addon-data.conf
+        extra_files: Other files the tests depend on, e.g. pregenerated events
+        extra_values: Other values the tests depend on, e.g. pytest options
+        extra_dirs: Other folders the tests depend on, e.g. the data models
+
+    Returns:
+        Hex digest of the content
+    """
+    addon_path = os.path.abspath(addon_path)
+    config_path = os.path.abspath(config_path)
+    file_paths = sorted(glob.glob(os.path.join(addon_path, "default", "*.conf")))
+    # The output fields of the LOOKUP extractions are read from the lookups
+    file_paths.extend(sorted(glob.glob(os.path.join(addon_path, "lookups", "*"))))
+    file_paths.append(os.path.join(config_path, PSA_DATA_CONFIG_FILE))
+    # All the folders the samples are looked up in
+    for samples_path in sorted(
+        {
+            os.path.join(config_path, "samples"),
+            os.path.join(os.path.dirname(config_path), "samples"),
+            os.path.join(addon_path, "samples"),
+        }
+    ):
+        file_paths.extend(walk_files(samples_path))
+    for dir_path in extra_dirs:
+        file_paths.extend(walk_files(os.path.abspath(dir_path)))
+    file_paths.extend(os.path.abspath(path) for path in extra_files)
+
+    digest = hashlib.sha256()
+    for value in [__version__, addon_path, *extra_values]:
+        digest.update(repr(value).encode("utf-8") + b"\0")
+    for file_path in file_paths:
+        digest.update(file_path.encode("utf-8") + b"\0")
+        if os.path.isfile(file_path):
+            with open(file_path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def walk_files(dir_path: str) -> Iterable[str]:
+    """
+    Yield the paths of the files in a folder and its sub folders, in a stable order
+    """
+    for root, dirs, files in os.walk(dir_path):
+        dirs.sort()
+        yield from (os.path.join(root, name) for name in sorted(files))
+
+
+class ParserCacheMemo:
+    """
+    Process-local LRU memo of the data loaded from the shards.
+
+    Entries are keyed by the shard path and its generation (inode, mtime and
+    size), so a shard replaced on disk is never served from the memo.
+
+    Args:
+        max_entries: Maximum number of keys kept in memory
+    """
+
+    def __init__(self, max_entries: int = MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Tuple], Any]" = OrderedDict()
+
+    def get(self, key_path: str, generation: Tuple) -> Tuple[bool, Any]:
+        """
+        Get the memoized data of a shard generation.
+
+        Returns:
+            Tuple of whether the data was found and the data
+        """
+        memo_key = (key_path, generation)
+        if memo_key not in self._entries:
+            return False, None
+        self._entries.move_to_end(memo_key)
+        return True, self._entries[memo_key]
+
+    def put(self, key_path: str, generation: Tuple, data: Any):
+        """
+        Memoize the data of a shard generation, evicting the least recently used.
+        """
+        self._entries[(key_path, generation)] = data
+        self._entries.move_to_end((key_path, generation))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all memoized data
+        """
+        self._entries.clear()
+
+
+MEMO = ParserCacheMemo()
+
 
 class ParserCache:
     """
     Caches parsed configuration data to avoid redundant parsing in xdist workers.
 
-    When running under pytest-xdist, this class creates a shared cache file in the
-    system temp directory. The first worker to request a cache key will parse the
-    data and save it; subsequent workers load from cache.
+    When running under pytest-xdist, this class creates a shared cache directory in
+    the system temp directory with one shard file per cache key. The first worker to
+    request a cache key will parse the data and save it; subsequent workers load
+    from cache.
 
     Thread safety is ensured via FileLock with per-key locks to prevent deadlocks
     when nested cache lookups occur (e.g., props_fields -> props -> transforms).
+    Writers of a key never block the readers of other keys.
+
+    Loaded keys are memoized in the process wide MEMO, so the cache instances
+    created for every fixture read each shard from disk only once.
+
+    Once enable_persistent_cache is called, the keys are also stored in a
+    directory which is kept across sessions, with or without xdist.
     """
 
+    persistent_dir: Optional[str] = None
+    persist_event_keys: bool = False
+
     def __init__(self):
         """Initialize the parser cache."""
-        self._cache_file: Optional[str] = None
-        self._cache_hash_file: Optional[str] = None
+        self._shard_dir: Optional[str] = None
         self._cache_lock: Optional[FileLock] = None
         self._cache_dir: Optional[str] = None
 
@@ -69,19 +200,59 @@ class ParserCache:
             self._init_cache_paths()
 
     def _init_cache_paths(self):
-        """Initialize cache file paths for xdist runs."""
+        """Initialize cache directory paths for xdist runs."""
         testrunuid = os.environ.get("PYTEST_XDIST_TESTRUNUID", "")
         safe_testrunuid = re.sub(r"[^A-Za-z0-9_.-]", "_", testrunuid or "xdist")
         self._cache_dir = os.path.join(tempfile.gettempdir(), "pytest-splunk-addon")
-        os.makedirs(self._cache_dir, exist_ok=True)
-
-        self._cache_file = os.path.join(
+        self._shard_dir = os.path.join(
             self._cache_dir, f"{safe_testrunuid}_parser_cache"
         )
-        self._cache_hash_file = f"{self._cache_file}.sha256"
-        self._cache_lock = FileLock(f"{self._cache_file}.lock")
+        os.makedirs(self._shard_dir, exist_ok=True)
+        self._cache_lock = FileLock(f"{self._shard_dir}.lock")
         atexit.register(self._cleanup_cache)
 
+    @classmethod
+    def enable_persistent_cache(
+        cls, cache_dir: str, content_hash: str, persist_event_keys: bool = False
+    ):
+        """
+        Store the parsed data in a directory kept across sessions.
+
+        Args:
+            cache_dir: Directory of the persistent cache
+            content_hash: Hash of the add-on content, see get_addon_content_hash
+            persist_event_keys: Whether the tests generated from the tokenized
+                events are persisted too, only valid for pregenerated events
+        """
+        cls.persistent_dir = os.path.join(os.path.abspath(cache_dir), content_hash)
+        cls.persist_event_keys = persist_event_keys
+        os.makedirs(cls.persistent_dir, exist_ok=True)
+        LOGGER.info("Using persistent parser cache %s", cls.persistent_dir)
+
+    def _is_persistent(self, cache_key: str) -> bool:
+        if not self.persistent_dir:
+            return False
+        return self.persist_event_keys or not cache_key.startswith(EVENT_KEY_PREFIXES)
+
+    def _get_key_path(self, cache_key: str) -> Optional[str]:
+        """
+        Get the path of the shard file of a key.
+
+        Args:
+            cache_key: The cache key to get the shard for
+
+        Returns:
+            Path of the shard file, or None if caching is disabled
+        """
+        shard_dir = (
+            self.persistent_dir if self._is_persistent(cache_key) else self._shard_dir
+        )
+        if not shard_dir:
+            return None
+        safe_key = re.sub(r"[^A-Za-z0-9_.-]", "_", cache_key)[:64]
+        key_hash = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(shard_dir, f"{safe_key}_{key_hash}")
+
     def _get_key_lock(self, cache_key: str) -> Optional[FileLock]:
         """
         Get a per-key lock to prevent deadlocks during nested cache lookups.
@@ -92,9 +263,10 @@ class ParserCache:
         Returns:
             FileLock for the key, or None if caching is disabled
         """
-        if not self._cache_file:
+        key_path = self._get_key_path(cache_key)
+        if not key_path:
             return None
-        return FileLock(f"{self._cache_file}.{cache_key}.lock")
+        return FileLock(f"{key_path}.lock")
 
     def _is_cache_file_valid(self, path: str) -> bool:
         """
@@ -108,12 +280,18 @@ class ParserCache:
         """
         if not path or not os.path.isfile(path):
             return False
-        if self._cache_dir:
-            cache_dir = os.path.abspath(self._cache_dir)
-            target = os.path.abspath(path)
-            if os.path.commonpath([cache_dir, target]) != cache_dir:
-                LOGGER.warning("Cache file path is outside cache directory")
-                return False
+        cache_dirs = [
+            os.path.abspath(cache_dir)
+            for cache_dir in [self._cache_dir, self.persistent_dir]
+            if cache_dir
+        ]
+        target = os.path.abspath(path)
+        if cache_dirs and not any(
+            os.path.commonpath([cache_dir, target]) == cache_dir
+            for cache_dir in cache_dirs
+        ):
+            LOGGER.warning("Cache file path is outside cache directory")
+            return False
         return True
 
     def _write_atomic(self, path: str, data: bytes):
@@ -126,12 +304,12 @@ class ParserCache:
             path: Destination file path
             data: Bytes to write
         """
-        if not self._cache_dir:
+        if not self._shard_dir and not self.persistent_dir:
             raise ValueError("Cache directory not initialized")
         temp_file = None
         try:
             with tempfile.NamedTemporaryFile(
-                mode="wb", delete=False, dir=self._cache_dir
+                mode="wb", delete=False, dir=os.path.dirname(path)
             ) as tmp:
                 temp_file = tmp.name
                 tmp.write(data)
@@ -146,70 +324,59 @@ class ParserCache:
                 except OSError:
                     pass
 
-    def get_cached_data(self) -> Optional[Dict]:
+    def get_cached_data(self, cache_key: str) -> Optional[Dict]:
         """
-        Load cached data from disk if available and valid.
+        Load the cached data of a key from its shard if available and valid.
 
-        Validates that both the cache file and its hash file exist, then
-        verifies the hash matches. If hash mismatch occurs (possibly due to
-        concurrent write), retries once under lock.
+        The shard starts with the hash of its data, which is verified before
+        the data is loaded. Shards are replaced atomically, so a mismatch means
+        the shard is corrupted.
+
+        Args:
+            cache_key: Key to load the data of
 
         Returns:
-            Cached data dictionary, or None if cache is missing/invalid
+            Dictionary with the cached data under cache_key, or None if cache is missing/invalid
         """
-        if not self._cache_file or not os.path.exists(self._cache_file):
-            return None
-        if not self._is_cache_file_valid(self._cache_file):
+        key_path = self._get_key_path(cache_key)
+        if not self._is_cache_file_valid(key_path):
             return None
-        if not self._cache_hash_file or not os.path.exists(self._cache_hash_file):
-            LOGGER.warning("Cache hash file missing, ignoring cache")
-            return None
-        if not self._is_cache_file_valid(self._cache_hash_file):
-            return None
-
-        def _read_and_verify() -> Optional[Dict]:
-            with open(self._cache_file, "rb") as f:
-                cache_bytes = f.read()
-            with open(self._cache_hash_file, "r", encoding="utf-8") as f:
-                expected_hash = f.read().strip()
-            actual_hash = hashlib.sha256(cache_bytes).hexdigest()
+        try:
+            with open(key_path, "rb") as f:
+                shard_bytes = f.read()
+            expected_hash, _, cache_bytes = shard_bytes.partition(HASH_SEPARATOR)
+            actual_hash = hashlib.sha256(cache_bytes).hexdigest().encode("utf-8")
             if expected_hash != actual_hash:
+                LOGGER.warning("Cache hash mismatch for %s, ignoring cache", cache_key)
                 return None
-            return pickle.loads(cache_bytes)
-
-        try:
-            cached_data = _read_and_verify()
-            if cached_data is None:
-                # Hash mismatch - likely read during concurrent write; retry under lock
-                with self._cache_lock or nullcontext():
-                    cached_data = _read_and_verify()
-                if cached_data is None:
-                    LOGGER.warning("Cache hash mismatch, ignoring cache")
-                    return None
-            LOGGER.info("Loaded parser cache from %s", self._cache_file)
+            cached_data = pickle.loads(cache_bytes)
+            LOGGER.info("Loaded %s from parser cache %s", cache_key, key_path)
             return cached_data
         except (IOError, pickle.PickleError) as e:
             LOGGER.warning("Failed to load parser cache: %s", str(e))
             return None
 
-    def _save_cached_data(self, data: Dict):
+    def _save_cached_data(self, cache_key: str, data: Any):
         """
-        Save data to cache file with integrity hash.
+        Save the data of a key to its shard with integrity hash.
 
         Writes are atomic (temp file + rename) to prevent corruption.
-        Must be called under appropriate lock.
+        Must be called under the lock of the key.
 
         Args:
-            data: Dictionary to cache
+            cache_key: Key to store the data under
+            data: Data to cache
         """
-        if not self._cache_file:
+        key_path = self._get_key_path(cache_key)
+        if not key_path:
             return
         try:
-            cache_bytes = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            cache_bytes = pickle.dumps(
+                {cache_key: data}, protocol=pickle.HIGHEST_PROTOCOL
+            )
             cache_hash = hashlib.sha256(cache_bytes).hexdigest().encode("utf-8")
-            self._write_atomic(self._cache_file, cache_bytes)
-            self._write_atomic(self._cache_hash_file, cache_hash)
-            LOGGER.info("Saved parser cache to %s", self._cache_file)
+            self._write_atomic(key_path, cache_hash + HASH_SEPARATOR + cache_bytes)
+            LOGGER.info("Saved %s to parser cache %s", cache_key, key_path)
         except IOError as e:
             LOGGER.warning("Failed to save parser cache: %s", str(e))
 
@@ -222,40 +389,66 @@ class ParserCache:
 
         Args:
             parse_func: Zero-argument function that returns the data to cache
-            cache_key: Key to store/retrieve data under in the cache dict
+            cache_key: Key to store/retrieve data under in the cache
 
         Returns:
             The cached or freshly parsed data
         """
+        key_path = self._get_key_path(cache_key)
+        if not key_path:
+            return parse_func()
+        generation = self._get_generation(key_path)
+        if generation:
+            found, data = MEMO.get(key_path, generation)
+            if found:
+                LOGGER.debug("Using memoized %s", cache_key)
+                return data
+
         # Fast path: check cache without lock
-        if self._cache_file and os.path.exists(self._cache_file):
-            cached_data = self.get_cached_data()
-            if cached_data and cache_key in cached_data:
-                LOGGER.debug("Using cached %s", cache_key)
-                return cached_data[cache_key]
+        cached_data = self.get_cached_data(cache_key)
+        if cached_data and cache_key in cached_data:
+            LOGGER.debug("Using cached %s", cache_key)
+            self._memoize(key_path, generation, cached_data[cache_key])
+            return cached_data[cache_key]
 
         # Not in cache - acquire per-key lock and parse
-        key_lock = self._get_key_lock(cache_key)
-        with key_lock or nullcontext():
+        with self._get_key_lock(cache_key):
             # Double-check after acquiring lock
-            if self._cache_file and os.path.exists(self._cache_file):
-                cached_data = self.get_cached_data()
-                if cached_data and cache_key in cached_data:
-                    LOGGER.debug("Using cached %s (after lock)", cache_key)
-                    return cached_data[cache_key]
+            generation = self._get_generation(key_path)
+            cached_data = self.get_cached_data(cache_key)
+            if cached_data and cache_key in cached_data:
+                LOGGER.debug("Using cached %s (after lock)", cache_key)
+                self._memoize(key_path, generation, cached_data[cache_key])
+                return cached_data[cache_key]
 
             # Parse the data
             LOGGER.info("Parsing %s (cache miss)", cache_key)
             parsed_data = parse_func()
+            self._save_cached_data(cache_key, parsed_data)
+            self._memoize(key_path, self._get_generation(key_path), parsed_data)
+            return parsed_data
 
-            # Save to cache under global lock for consistency
-            if self._cache_lock:
-                with self._cache_lock:
-                    cached_data = self.get_cached_data() or {}
-                    cached_data[cache_key] = parsed_data
-                    self._save_cached_data(cached_data)
+    @staticmethod
+    def _get_generation(key_path: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Get the generation of a shard, which changes whenever the shard is replaced.
 
-            return parsed_data
+        Args:
+            key_path: Path of the shard file
+
+        Returns:
+            Tuple of inode, mtime and size of the shard, or None if it does not exist
+        """
+        try:
+            stat = os.stat(key_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _memoize(key_path: str, generation: Optional[Tuple], data: Any):
+        if generation:
+            MEMO.put(key_path, generation, data)
 
     def _cleanup_cache(self):
         """
@@ -264,16 +457,15 @@ class ParserCache:
         Only the first worker (gw0) performs cleanup to avoid race conditions.
         Called automatically via atexit.
         """
-        if not self._cache_file or not utils.check_first_worker():
+        if not self._shard_dir or not utils.check_first_worker():
             return
         try:
             with self._cache_lock or nullcontext():
-                for path in [
-                    self._cache_file,
-                    self._cache_hash_file,
-                    f"{self._cache_file}.lock",
-                ]:
-                    if path and os.path.exists(path):
-                        os.remove(path)
+                if os.path.isdir(self._shard_dir):
+                    shutil.rmtree(self._shard_dir)
+                MEMO.clear()
+                lock_file = f"{self._shard_dir}.lock"
+                if os.path.exists(lock_file):
+                    os.remove(lock_file)
         except OSError as e:
             LOGGER.warning("Failed to clean cache files: %s", str(e))
@@ -31,6 +31,8 @@ from .transforms_parser import TransformsParser
 from pytest_splunk_addon import utils
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
+# LINE_BREAKER values breaking the events on every newline, the default first
+NEWLINE_BREAKERS = (r"([\r\n]+)", r"([\n\r]+)", r"([\n]+)", r"(\n+)")
 
 
 class PropsParser(object):
@@ -95,6 +97,27 @@ class PropsParser(object):
                                 "fields": field_list,
                             }
 
+    def get_single_line_sourcetypes(self) -> set:
+        """
+        Get the sourcetypes of which every line is an event: the sourcetype
+        stanzas disabling SHOULD_LINEMERGE which break the events on newlines
+
+        Returns:
+            set of the sourcetypes
+        """
+        sourcetypes = set()
+        for stanza_type, stanza_name, stanza_values in self._get_props_stanzas():
+            if stanza_type != "sourcetype":
+                continue
+            line_merge = stanza_values.get("SHOULD_LINEMERGE", "true")
+            line_breaker = stanza_values.get("LINE_BREAKER", NEWLINE_BREAKERS[0])
+            if (
+                line_merge.strip().lower() in ["false", "f", "0"]
+                and line_breaker.strip() in NEWLINE_BREAKERS
+            ):
+                sourcetypes.add(stanza_name)
+        return sourcetypes
+
     def _get_props_method(self, class_name: str):
         """
         Get the parsing method depending on classname
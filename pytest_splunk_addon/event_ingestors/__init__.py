@@ -19,3 +19,4 @@ from .hec_raw_ingestor import HECRawEventIngestor
 from .sc4s_event_ingestor import SC4SEventIngestor
 from .file_monitor_ingestor import FileMonitorEventIngestor
 from .ingestor_helper import IngestorHelper
+from .indexing_barrier import IndexingBarrier
@@ -15,6 +15,9 @@
 #
 import abc
 
+BATCH_EVENT_COUNT = 100
+BATCH_MAX_BYTES = 1000000
+
 
 class EventIngestor(abc.ABC):
     """
@@ -28,3 +31,32 @@ class EventIngestor(abc.ABC):
     @abc.abstractmethod
     def ingest(self, event_object, thread_count):
         raise NotImplementedError
+
+    @staticmethod
+    def get_batches(items, max_count, max_bytes):
+        """
+        Splits the serialized events in batches bounded by the number
+        of events and the size of the payload.
+
+        Args:
+            items (list): List of serialized events (str or bytes)
+            max_count (int): maximum number of events in a batch
+            max_bytes (int): maximum size of a batch in bytes
+
+        Yields:
+            list: serialized events of a batch
+        """
+        batch = []
+        batch_size = 0
+        for item in items:
+            item_size = len(item if isinstance(item, bytes) else item.encode("utf-8"))
+            if batch and (
+                len(batch) >= max_count or batch_size + item_size > max_bytes
+            ):
+                yield batch
+                batch = []
+                batch_size = 0
+            batch.append(item)
+            batch_size += item_size + 1
+        if batch:
+            yield batch
@@ -0,0 +1,88 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Adaptive backoff for HEC requests when Splunk answers 503 (server busy).
+"""
+import logging
+import threading
+from time import sleep
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+SERVER_BUSY_STATUS = 503
+
+
+class HECBackoff(object):
+    """
+    Delays HEC requests while Splunk reports that it is busy.
+
+    The delay is shared by all the threads of an ingestor: it is doubled on every
+    503 response and halved on every successful one, so the ingestion rate adapts
+    to what the indexers can accept.
+
+    Args:
+        initial_delay (float): delay in seconds applied after the first 503 response
+        max_delay (float): upper bound of the delay in seconds
+        max_retries (int): number of retries of a request answered with 503
+    """
+
+    def __init__(self, initial_delay=1, max_delay=30, max_retries=10):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.delay = 0
+        self._lock = threading.Lock()
+
+    def post(self, http_session, url, **kwargs):
+        """
+        Makes a POST request, retrying it with backoff while HEC answers 503.
+
+        Args:
+            http_session (requests.Session): session used to make the request
+            url (str): url of the HEC endpoint
+            **kwargs: keyword arguments of the request
+
+        Returns:
+            requests.Response: the last response received
+        """
+        retry = 0
+        while True:
+            if self.delay:
+                sleep(self.delay)
+            response = http_session.post(url, **kwargs)
+            if response.status_code != SERVER_BUSY_STATUS:
+                self._decrease()
+                return response
+            self._increase()
+            if retry == self.max_retries:
+                LOGGER.warning(
+                    "HEC server is still busy after {} retries".format(retry)
+                )
+                return response
+            retry += 1
+            LOGGER.warning(
+                "HEC server is busy, retry {}/{} in {} seconds".format(
+                    retry, self.max_retries, self.delay
+                )
+            )
+
+    def _increase(self):
+        with self._lock:
+            self.delay = min(max(self.delay * 2, self.initial_delay), self.max_delay)
+
+    def _decrease(self):
+        with self._lock:
+            self.delay = self.delay / 2 if self.delay / 2 >= self.initial_delay else 0
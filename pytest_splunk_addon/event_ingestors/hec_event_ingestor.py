@@ -15,7 +15,8 @@
 #
 import json
 
-from .base_event_ingestor import EventIngestor
+from .base_event_ingestor import EventIngestor, BATCH_EVENT_COUNT, BATCH_MAX_BYTES
+from .hec_backoff import HECBackoff
 import requests
 from time import time, mktime
 import concurrent.futures
@@ -38,7 +39,10 @@ class HECEventIngestor(EventIngestor):
             session_headers(dict):
             {
                 "Authorization": f"Splunk <hec-token>",
-            }
+            },
+            http_session(requests.Session): optional session shared between ingestors,
+            hec_batch_size(int): optional maximum number of events in a request,
+            hec_batch_max_bytes(int): optional maximum size of a request in bytes
         }
 
     Args:
@@ -49,6 +53,15 @@ class HECEventIngestor(EventIngestor):
     def __init__(self, required_configs):
         self.hec_uri = required_configs.get("splunk_hec_uri")
         self.session_headers = required_configs.get("session_headers")
+        # Without a shared session, fall back to the module level requests API
+        self.http_session = required_configs.get("http_session") or requests
+        self.batch_size = int(
+            required_configs.get("hec_batch_size") or BATCH_EVENT_COUNT
+        )
+        self.batch_max_bytes = int(
+            required_configs.get("hec_batch_max_bytes") or BATCH_MAX_BYTES
+        )
+        self.backoff = HECBackoff()
 
     def ingest(self, events, thread_count):
         """
@@ -82,6 +95,7 @@ class HECEventIngestor(EventIngestor):
 
         Args:
             events (list): List of events (SampleEvent) to be ingested
+            thread_count (int): Number of threads used to send the requests
 
         """
         data = list()
@@ -106,18 +120,20 @@ class HECEventIngestor(EventIngestor):
             if event.metadata.get("timestamp_type").lower() == "event":
                 if event.time_values:
                     event_dict["time"] = event.time_values[0]
-            data.append(event_dict)
+            data.append(json.dumps(event_dict))
 
-        batch_event_list = []
-        for i in range(0, len(data), 100):
-            batch_event_list.append(data[i : i + 100])
+        batch_event_list = list(
+            self.get_batches(data, self.batch_size, self.batch_max_bytes)
+        )
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(int(thread_count), 1)
+        ) as executor:
             _ = list(executor.map(self.__ingest, batch_event_list))
 
     def __ingest(self, data):
         try:
-            batch_data = "\n".join(json.dumps(obj) for obj in data)
+            batch_data = "\n".join(data)
             LOGGER.info(
                 "Making a HEC event request with the following params:\nhec_uri:{}\nheaders:{}".format(
                     str(self.hec_uri), str(self.session_headers)
@@ -128,7 +144,8 @@ class HECEventIngestor(EventIngestor):
                     str(batch_data)
                 )
             )
-            response = requests.post(  # nosemgrep: splunk.disabled-cert-validation
+            response = self.backoff.post(  # nosemgrep: splunk.disabled-cert-validation
+                self.http_session,
                 "{}/{}".format(self.hec_uri, "event"),
                 auth=None,
                 data=batch_data,
@@ -18,6 +18,7 @@ HEC Event Ingestor class for Metric data.
 Indextime tests of Metric data will be covered in upcoming versions of the plugin. It is not supported in current version.
 """
 from .base_event_ingestor import EventIngestor
+from .hec_backoff import HECBackoff
 import requests
 import time
 import logging
@@ -42,11 +43,15 @@ class HECMetricEventIngestor(EventIngestor):
                 hec_uri: {splunk_hec_scheme}://{splunk_host}:{hec_port}/services/collector,
                 session_headers(dict): {
                     "Authorization": f"Splunk <hec-token>",
-                }
+                },
+                http_session(requests.Session): optional session shared between ingestors
             }
         """
         self.hec_uri = required_configs.get("splunk_hec_uri")
         self.session_headers = required_configs.get("session_headers")
+        # Without a shared session, fall back to the module level requests API
+        self.http_session = required_configs.get("http_session") or requests
+        self.backoff = HECBackoff()
 
     def ingest(self, data, thread_count):
         """
@@ -105,7 +110,8 @@ class HECMetricEventIngestor(EventIngestor):
                     str(data)
                 )
             )
-            response = requests.post(  # nosemgrep: splunk.disabled-cert-validation
+            response = self.backoff.post(  # nosemgrep: splunk.disabled-cert-validation
+                self.http_session,
                 self.hec_uri,
                 auth=None,
                 json=data,
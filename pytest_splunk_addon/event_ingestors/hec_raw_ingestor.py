@@ -13,7 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from .base_event_ingestor import EventIngestor
+from .base_event_ingestor import EventIngestor, BATCH_EVENT_COUNT, BATCH_MAX_BYTES
+from .hec_backoff import HECBackoff
 from time import time
 import requests
 import concurrent.futures
@@ -24,6 +25,7 @@ import time
 requests.urllib3.disable_warnings()
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
+DEFAULT_SOURCETYPE = "pytest_splunk_addon"
 
 
 class HECRawEventIngestor(EventIngestor):
@@ -37,7 +39,11 @@ class HECRawEventIngestor(EventIngestor):
             session_headers(dict):
             {
                 "Authorization": f"Splunk <hec-token>",
-            }
+            },
+            http_session(requests.Session): optional session shared between ingestors,
+            hec_batch_size(int): optional maximum number of events in a request,
+            hec_batch_max_bytes(int): optional maximum size of a request in bytes,
+            batch_sourcetypes(set): optional sourcetypes of which every line is an event
         }
 
 
@@ -48,6 +54,16 @@ class HECRawEventIngestor(EventIngestor):
     def __init__(self, required_configs):
         self.hec_uri = required_configs["splunk_hec_uri"]
         self.session_headers = required_configs["session_headers"]
+        # Without a shared session, fall back to the module level requests API
+        self.http_session = required_configs.get("http_session") or requests
+        self.batch_size = int(
+            required_configs.get("hec_batch_size") or BATCH_EVENT_COUNT
+        )
+        self.batch_max_bytes = int(
+            required_configs.get("hec_batch_max_bytes") or BATCH_MAX_BYTES
+        )
+        self.batch_sourcetypes = set(required_configs.get("batch_sourcetypes") or ())
+        self.backoff = HECBackoff()
 
     def ingest(self, events, thread_count):
         """
@@ -77,16 +93,25 @@ class HECRawEventIngestor(EventIngestor):
                 "host": "sample_host",
             }
 
+        Events sharing the same sourcetype, source, host and index are sent together,
+        separated by newlines, in batches bounded by hec_batch_size events and
+        hec_batch_max_bytes bytes. Only the single-line events of batch_sourcetypes,
+        which Splunk breaks on every newline without merging lines, are batched. The
+        other events are sent one per request, as concatenating them may change how
+        Splunk breaks them.
+
         Args:
             events (list): List of events (SampleEvent) to be ingested
+            thread_count (int): Number of threads used to send the requests
             params (dict): dict with the info of the data to be ingested.
 
         """
         main_event = []
         param_list = []
+        grouped_events = dict()
         for event in events:
             event_dict = {
-                "sourcetype": event.metadata.get("sourcetype", "pytest_splunk_addon"),
+                "sourcetype": event.metadata.get("sourcetype", DEFAULT_SOURCETYPE),
                 "source": event.metadata.get("source", "pytest_splunk_addon:hec:raw"),
                 "index": event.metadata.get("index", "main"),
             }
@@ -94,12 +119,57 @@ class HECRawEventIngestor(EventIngestor):
             if event.metadata.get("host"):
                 event_dict["host"] = event.metadata.get("host")
 
-            param_list.append(event_dict)
+            if not self.is_batched(event):
+                param_list.append(event_dict)
+                main_event.append(event.event)
+            else:
+                grouped_events.setdefault(tuple(event_dict.items()), []).append(
+                    event.event
+                )
 
-            main_event.append(event.event)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        for params, raw_events in grouped_events.items():
+            for batch in self.get_batches(
+                raw_events, self.batch_size, self.batch_max_bytes
+            ):
+                param_list.append(dict(params))
+                main_event.append(self.join_events(batch))
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(int(thread_count), 1)
+        ) as executor:
             _ = list(executor.map(self.__ingest, main_event, param_list))
 
+    def is_batched(self, event):
+        """
+        Whether the event can be sent together with other events
+
+        Args:
+            event (SampleEvent): Event to be ingested
+        """
+        return (
+            event.metadata.get("sourcetype", DEFAULT_SOURCETYPE)
+            in self.batch_sourcetypes
+            and not event.metadata.get("breaker")
+            and not self.is_multiline(event.event)
+        )
+
+    @staticmethod
+    def is_multiline(raw_event):
+        """
+        Whether a raw event (str or bytes) spans several lines
+        """
+        return (b"\n" if isinstance(raw_event, bytes) else "\n") in raw_event
+
+    @staticmethod
+    def join_events(raw_events):
+        """
+        Joins the raw events with newline, keeping their type (str or bytes).
+
+        Args:
+            raw_events (list): List of raw events (str or bytes)
+        """
+        separator = b"\n" if isinstance(raw_events[0], bytes) else "\n"
+        return separator.join(raw_events)
+
     def __ingest(self, event, params):
         try:
             LOGGER.info(
@@ -112,7 +182,8 @@ class HECRawEventIngestor(EventIngestor):
                     str(event), str(params)
                 )
             )
-            response = requests.post(  # nosemgrep: splunk.disabled-cert-validation
+            response = self.backoff.post(  # nosemgrep: splunk.disabled-cert-validation
+                self.http_session,
                 "{}/{}".format(self.hec_uri, "raw"),
                 auth=None,
                 data=event,
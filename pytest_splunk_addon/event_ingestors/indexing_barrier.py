@@ -0,0 +1,113 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Waits for the ingested events to be searchable in Splunk.
+"""
+import logging
+from time import sleep, time
+
+from ..index_tests.test_generator import IndexTimeTestGenerator
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+
+class IndexingBarrier(object):
+    """
+    Polls Splunk until the expected number of events of each sample is searchable.
+
+    The expected counts are the ones tested by test_indextime_line_breaker,
+    i.e. expected_event_count * sample_count for each sample.
+
+    Args:
+        search_util (SearchUtil): Object that helps to search on Splunk
+        timeout (int): Maximum time in seconds to wait for the events
+        poll_interval (int): Time in seconds between two polls
+    """
+
+    def __init__(self, search_util, timeout, poll_interval):
+        self.search_util = search_util
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def get_query(self, params):
+        """
+        Returns the query counting the indexed events of a sample
+
+        Args:
+            params (dict): sourcetype, hosts and expected event count of the sample
+        """
+        index_list = (
+            "(index="
+            + " OR index=".join(self.search_util.search_index.split(","))
+            + ")"
+        )
+        host = '("' + '","'.join(sorted(params["host"])) + '")'
+        return "search {} sourcetype={} host IN {} | stats count".format(
+            index_list, params["sourcetype"], host
+        )
+
+    def get_indexed_count(self, params):
+        """
+        Returns the number of events of a sample searchable in Splunk
+
+        Args:
+            params (dict): sourcetype, hosts and expected event count of the sample
+        """
+        results = list(
+            self.search_util.getFieldValuesList(
+                self.get_query(params), interval=0, retries=0
+            )
+        )
+        return int(results[0].get("count", 0)) if results else 0
+
+    def wait(self, tokenized_events):
+        """
+        Blocks until the events of all the samples are searchable or the timeout is reached.
+
+        Args:
+            tokenized_events (list): list of ingested tokenized events
+
+        Returns:
+            bool: True if all the events are searchable, False on timeout
+        """
+        pending = IndexTimeTestGenerator().get_line_breaker_params(tokenized_events)
+        pending = {
+            sample_name: params
+            for sample_name, params in pending.items()
+            if params["host"]
+        }
+        deadline = time() + self.timeout
+        while True:
+            for sample_name, params in list(pending.items()):
+                indexed_count = self.get_indexed_count(params)
+                LOGGER.debug(
+                    "Indexed {} of {} events for sample {}".format(
+                        indexed_count, params["expected_event_count"], sample_name
+                    )
+                )
+                if indexed_count >= params["expected_event_count"]:
+                    del pending[sample_name]
+            if not pending:
+                LOGGER.info("All the ingested events are searchable")
+                return True
+            if time() + self.poll_interval > deadline:
+                LOGGER.warning(
+                    "Timed out after {} seconds waiting for the events of samples: {}".format(
+                        self.timeout, ", ".join(sorted(pending))
+                    )
+                )
+                return False
+            sleep(self.poll_interval)
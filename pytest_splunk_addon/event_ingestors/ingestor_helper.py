@@ -21,6 +21,10 @@ from . import (
     FileMonitorEventIngestor,
 )
 import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from ..addon_parser.props_parser import PropsParser
 from ..sample_generation import SampleXdistGenerator
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
@@ -58,6 +62,26 @@ class IngestorHelper(object):
         LOGGER.debug("Using the following HEC ingestor: {}".format(str(ingestor)))
         return ingestor
 
+    @classmethod
+    def get_http_session(cls, thread_count):
+        """
+        Creates a HTTP session shared by all the HEC ingestors of an ingestion run.
+        The connection pool is sized to the thread count, so each ingestion thread
+        can keep its connection alive instead of doing a new TCP+TLS handshake per request.
+
+        Args:
+            thread_count (int): number of threads used for ingestion
+
+        Returns:
+            requests.Session: session with pooled connections
+        """
+        pool_size = max(int(thread_count), 1)
+        http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        http_session.mount("https://", adapter)
+        http_session.mount("http://", adapter)
+        return http_session
+
     @classmethod
     def get_consolidated_events(cls, events):
         ingestor_dict = dict()
@@ -96,15 +120,96 @@ class IngestorHelper(object):
             config_path (str): Path to pytest-splunk-addon-data.conf
             thread_count (int): number of threads to use for ingestion
             store_events (bool): Boolean param for generating json files with tokenised events
+
+        Returns:
+            dict: dictionary with conf_name and the ingested tokenized events
         """
         splunk_ep = ingest_meta_data.get("splunk_ep", False)
         sample_generator = SampleXdistGenerator(addon_path, splunk_ep, config_path)
         store_sample = sample_generator.get_samples(store_events)
         tokenized_events = store_sample.get("tokenized_events")
         ingestor_dict = cls.get_consolidated_events(tokenized_events)
-        for input_type, events in ingestor_dict.items():
-            LOGGER.debug(
-                "Received the following input type for HEC event: {}".format(input_type)
+        with cls.get_http_session(thread_count) as http_session:
+            ingest_meta_data = dict(
+                ingest_meta_data,
+                http_session=http_session,
+                batch_sourcetypes=PropsParser(addon_path).get_single_line_sourcetypes(),
             )
-            event_ingestor = cls.get_event_ingestor(input_type, ingest_meta_data)
-            event_ingestor.ingest(events, thread_count)
+            cls.run_ingestors(ingestor_dict, ingest_meta_data, thread_count)
+        return store_sample
+
+    @classmethod
+    def run_ingestors(cls, ingestor_dict, ingest_meta_data, thread_count):
+        """
+        Runs the ingestors of all the input types concurrently.
+        The thread count is a global budget split between the input types, and the
+        errors of all the ingestors are reported together once every ingestor is done.
+
+        Args:
+            ingestor_dict (dict): Events grouped by their input_type
+            ingest_meta_data (dict): Dictionary of required meta_data.
+            thread_count (int): number of threads to use for ingestion
+        """
+        if not ingestor_dict:
+            return
+        thread_count = max(int(thread_count), 1)
+        ingestor_thread_count = max(thread_count // len(ingestor_dict), 1)
+        errors = dict()
+        with ThreadPoolExecutor(
+            max_workers=min(len(ingestor_dict), thread_count)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    cls.ingest_input_type,
+                    input_type,
+                    events,
+                    ingest_meta_data,
+                    ingestor_thread_count,
+                ): input_type
+                for input_type, events in ingestor_dict.items()
+            }
+            for future in as_completed(futures):
+                input_type = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    LOGGER.error(
+                        "Ingestion failed for input_type={}: {}".format(input_type, e)
+                    )
+                    errors[input_type] = e
+        cls.raise_ingestion_errors(errors)
+
+    @classmethod
+    def raise_ingestion_errors(cls, errors):
+        """
+        Raises a single exception listing the errors of all the failed ingestors.
+
+        Args:
+            errors (dict): Error of each failed input_type
+        """
+        if errors:
+            raise Exception(
+                "Ingestion failed for the following input types:\n{}".format(
+                    "\n".join(
+                        "{}: {}".format(input_type, error)
+                        for input_type, error in errors.items()
+                    )
+                )
+            )
+
+    @classmethod
+    def ingest_input_type(cls, input_type, events, ingest_meta_data, thread_count):
+        """
+        Ingests the events of a single input type with its ingestor.
+
+        Args:
+            input_type (str): input_type defined in pytest-splunk-addon-data.conf
+            events (list): List of events (SampleEvent) of the input type
+            ingest_meta_data (dict): Dictionary of required meta_data.
+            thread_count (int): number of threads the ingestor can use
+        """
+        LOGGER.debug(
+            "Received the following input type for HEC event: {}".format(input_type)
+        )
+        event_ingestor = cls.get_event_ingestor(input_type, ingest_meta_data)
+        event_ingestor.ingest(events, thread_count)
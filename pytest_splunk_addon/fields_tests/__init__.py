@@ -21,3 +21,5 @@ Test generation mechanism to verify the field extractions of an Add-on
 from .field_bank import FieldBank
 from .test_generator import FieldTestGenerator
 from .test_templates import FieldTestTemplates
+from .field_search_aggregator import FieldSearchAggregator
+from .offline_test_templates import OfflineFieldTestTemplates
@@ -0,0 +1,224 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Coalesces the searches of test_props_fields, one search per stanza.
+"""
+import logging
+from collections import OrderedDict
+from time import sleep
+
+from ..addon_parser import Field
+from .test_templates import COUNT_BY_SOURCE_TYPE_SEARCH_QUERY_PART
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+# Maximum number of conditions counted by one search, which has to complete
+# within the max_time of 60 seconds of getFieldValuesList
+MAX_CONDITIONS_PER_SEARCH = 25
+
+
+def get_fields_condition(fields_group):
+    """
+    Search condition of a test_props_fields test: every field has one of
+    its expected values and none of its negative values
+
+    Args:
+        fields_group (dict): Parameter of test_props_fields
+
+    Returns:
+        str: the condition, empty if the test has no fields
+    """
+    conditions = []
+    for field_dict in fields_group["fields"]:
+        field = Field(field_dict)
+        expected_values = ", ".join([f'"{each}"' for each in field.expected_values])
+        negative_values = ", ".join([f'"{each}"' for each in field.negative_values])
+        conditions.append(
+            f"({field} IN ({expected_values}) AND NOT {field} IN ({negative_values}))"
+        )
+    return " AND ".join(conditions)
+
+
+class FieldSearchAggregator(object):
+    """
+    Runs one search per stanza for all the test_props_fields tests of the
+    stanza, counting the events matching the condition of each test with
+    count(eval(...)). A test passes if the count of its condition is greater
+    than zero, the same as if its own search had found events.
+
+    The fields of the conditions are listed with the fields command, as the
+    fields only referenced in searchmatch are not extracted in fast mode.
+
+    The conditions which have no events are searched again, up to
+    search_retry times, with search_interval seconds between the searches.
+
+    The tests are grouped by stanza when the first test of the stanza runs,
+    so only the stanzas of the tests which run in this process are searched.
+
+    Args:
+        search_util (SearchUtil): Object that helps to search on Splunk
+        fields_groups (iterable): Parameters of the test_props_fields tests
+        max_conditions (int): Maximum number of conditions counted by one search
+    """
+
+    def __init__(
+        self, search_util, fields_groups, max_conditions=MAX_CONDITIONS_PER_SEARCH
+    ):
+        self.search_util = search_util
+        self.max_conditions = max_conditions
+        self._fields_groups = fields_groups
+        self._conditions = OrderedDict()
+        self._fields = {}
+        self._counts = {}
+        self._searches = {}
+
+    @staticmethod
+    def get_stanza_key(fields_group):
+        return fields_group["stanza_type"], fields_group["stanza"]
+
+    def add(self, fields_group):
+        """
+        Adds the condition of a test to the search of its stanza
+        """
+        stanza_key = self.get_stanza_key(fields_group)
+        conditions = self._conditions.setdefault(stanza_key, [])
+        condition = get_fields_condition(fields_group)
+        if condition not in conditions:
+            conditions.append(condition)
+        fields = self._fields.setdefault(stanza_key, [])
+        for field_dict in fields_group["fields"]:
+            field = str(Field(field_dict))
+            if field not in fields:
+                fields.append(field)
+
+    def get_index_list(self):
+        return (
+            "(index="
+            + " OR index=".join(self.search_util.search_index.split(","))
+            + ")"
+        )
+
+    def get_test_search(self, fields_group):
+        """
+        Returns the search of a single test, which finds the events of the
+        stanza matching its condition
+
+        Args:
+            fields_group (dict): Parameter of test_props_fields
+        """
+        search = (
+            f"search {self.get_index_list()}"
+            f" {fields_group['stanza_type']}=\""
+            f"{fields_group['stanza']}\""
+        )
+        condition = get_fields_condition(fields_group)
+        if condition:
+            search += f" AND {condition}"
+        return search + COUNT_BY_SOURCE_TYPE_SEARCH_QUERY_PART
+
+    def get_search(self, stanza_key, conditions):
+        """
+        Returns the search counting the events of a stanza matching each
+        condition, the count of the nth condition is condition_<n>.
+        The fields of the tests of the stanza are extracted explicitly.
+
+        Args:
+            stanza_key (tuple): stanza type and stanza
+            conditions (list): conditions of the tests of the stanza
+        """
+        stanza_type, stanza = stanza_key
+        counts = []
+        for index, condition in enumerate(conditions):
+            if condition:
+                escaped_condition = condition.replace("\\", "\\\\").replace('"', '\\"')
+                counts.append(
+                    f'count(eval(if(searchmatch("{escaped_condition}"), 1, null())))'
+                    f" AS condition_{index}"
+                )
+            else:
+                counts.append(f"count AS condition_{index}")
+        search = f'search {self.get_index_list()} {stanza_type}="{stanza}"'
+        fields = self._fields.get(stanza_key)
+        if fields:
+            search += f" | fields {', '.join(fields)}"
+        return search + f" | stats {', '.join(counts)}"
+
+    def search(self, stanza_key, conditions):
+        """
+        Counts the events of each condition of a stanza, max_conditions at a time
+        """
+        for start in range(0, len(conditions), self.max_conditions):
+            chunk = conditions[start : start + self.max_conditions]
+            search = self.get_search(stanza_key, chunk)
+            LOGGER.info(f"Executing the search query: {search}")
+            results = list(
+                self.search_util.getFieldValuesList(search, interval=0, retries=0)
+            )
+            result = results[0] if results else {}
+            for index, condition in enumerate(chunk):
+                self._counts[stanza_key, condition] = int(
+                    result.get(f"condition_{index}") or 0
+                )
+                self._searches[stanza_key, condition] = search
+
+    def add_stanza(self, stanza_key):
+        """
+        Adds the conditions of all the tests of a stanza to its search
+        """
+        for fields_group in self._fields_groups:
+            if self.get_stanza_key(fields_group) == stanza_key:
+                self.add(fields_group)
+
+    def get_count(self, fields_group):
+        """
+        Returns the number of events of the stanza matching the condition of a
+        test. The first test of a stanza searches the conditions of all its tests.
+
+        Args:
+            fields_group (dict): Parameter of test_props_fields
+        """
+        stanza_key = self.get_stanza_key(fields_group)
+        condition = get_fields_condition(fields_group)
+        if (stanza_key, condition) not in self._counts:
+            if stanza_key not in self._conditions:
+                self.add_stanza(stanza_key)
+            self.add(fields_group)
+            pending = [
+                each
+                for each in self._conditions[stanza_key]
+                if (stanza_key, each) not in self._counts
+            ]
+            for try_number in range(self.search_util.search_retry + 1):
+                if try_number:
+                    sleep(self.search_util.search_interval)
+                self.search(stanza_key, pending)
+                pending = [
+                    each for each in pending if not self._counts[stanza_key, each]
+                ]
+                if not pending:
+                    break
+        return self._counts[stanza_key, condition]
+
+    def get_last_search(self, fields_group):
+        """
+        Returns the last search which counted the condition of a test
+
+        Args:
+            fields_group (dict): Parameter of test_props_fields
+        """
+        return self._searches.get(
+            (self.get_stanza_key(fields_group), get_fields_condition(fields_group))
+        )
@@ -0,0 +1,108 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -*- coding: utf-8 -*-
+"""
+Includes the field test scenarios checked offline, on the fields extracted
+from the generated events without Splunk.
+"""
+import logging
+import pytest
+
+
+class OfflineFieldTestTemplates(object):
+    """
+    Test templates checking the field extractions of an App offline.
+    The tests have the same parameters as the ones of FieldTestTemplates,
+    a test which can not be checked offline is skipped.
+    """
+
+    logger = logging.getLogger("pytest-splunk-addon")
+
+    @pytest.mark.splunk_offline_fields
+    @pytest.mark.splunk_searchtime_fields_positive
+    def test_props_fields_offline(
+        self,
+        splunk_offline_field_checker,
+        splunk_searchtime_fields_positive,
+        record_property,
+    ):
+        """
+        This test case checks offline that a field value has the expected values.
+
+        Args:
+            splunk_offline_field_checker (OfflineFieldChecker): Checks the fields extracted offline.
+            splunk_searchtime_fields_positive (fixture): fields data of the event to be tested
+            record_property (fixture): Document facts of test cases to provide more info in the test failure reports.
+        """
+        record_property("stanza_name", splunk_searchtime_fields_positive["stanza"])
+        record_property("stanza_type", splunk_searchtime_fields_positive["stanza_type"])
+        record_property("fields", splunk_searchtime_fields_positive["fields"])
+        result = splunk_offline_field_checker.check_props_fields(
+            splunk_searchtime_fields_positive
+        )
+        if result.passed is None:
+            pytest.skip(result.message)
+        assert result.passed, result.message
+
+    @pytest.mark.splunk_offline_fields
+    @pytest.mark.splunk_searchtime_fields_negative
+    def test_props_fields_no_dash_not_empty_offline(
+        self,
+        splunk_offline_field_checker,
+        splunk_searchtime_fields_negative,
+        record_property,
+    ):
+        """
+        This test case checks offline the negative scenario for the field value.
+
+        Args:
+            splunk_offline_field_checker (OfflineFieldChecker): Checks the fields extracted offline.
+            splunk_searchtime_fields_negative (fixture): fields data of the event to be tested
+            record_property (fixture): Document facts of test cases to provide more info in the test failure reports.
+        """
+        record_property("stanza_name", splunk_searchtime_fields_negative["stanza"])
+        record_property("stanza_type", splunk_searchtime_fields_negative["stanza_type"])
+        record_property("fields", splunk_searchtime_fields_negative["fields"])
+        result = splunk_offline_field_checker.check_props_fields_negative(
+            splunk_searchtime_fields_negative
+        )
+        if result.passed is None:
+            pytest.skip(result.message)
+        assert result.passed, result.message
+
+    @pytest.mark.splunk_offline_fields
+    @pytest.mark.splunk_searchtime_fields_requirements
+    def test_requirements_fields_offline(
+        self,
+        splunk_offline_field_checker,
+        splunk_searchtime_fields_requirements,
+        record_property,
+    ):
+        """
+        This test case checks offline that the fields of an event have the expected values.
+
+        Args:
+            splunk_offline_field_checker (OfflineFieldChecker): Checks the fields extracted offline.
+            splunk_searchtime_fields_requirements (fixture): fields data of the event to be tested
+            record_property (fixture): Document facts of test cases to provide more info in the test failure reports.
+        """
+        record_property("fields", splunk_searchtime_fields_requirements["fields"])
+        result = splunk_offline_field_checker.check_requirements_fields(
+            splunk_searchtime_fields_requirements
+        )
+        if result.passed is None:
+            pytest.skip(result.message)
+        assert result.passed, result.message
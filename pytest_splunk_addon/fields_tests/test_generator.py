@@ -305,6 +305,7 @@ class FieldTestGenerator(object):
                     "escaped_event": escaped_event,
                     "fields": requirement_fields,
                     "modinput_params": modinput_params,
+                    "sample_name": event.sample_name,
                 }
 
                 if self.splunk_ep and getattr(event, "unique_identifier", None):
@@ -84,16 +84,19 @@ class FieldTestTemplates(object):
         splunk_ingest_data,
         splunk_setup,
         splunk_searchtime_fields_positive,
+        splunk_searchtime_fields_search_aggregator,
         record_property,
     ):
         """
         This test case checks that a field value has the expected values.
+        The tests of a stanza share one search, run by the first of them.
 
         Args:
             splunk_search_util (SearchUtil): Object that helps to search on Splunk.
             splunk_ingest_data (fixture): Ensure data was ingested before running test
             splunk_setup (fixture): Ensure that test environment was set up before running test
             splunk_searchtime_fields_positive (fixture): fields data of the event to be tested
+            splunk_searchtime_fields_search_aggregator (FieldSearchAggregator): Runs the searches of the stanzas.
             record_property (fixture): Document facts of test cases to provide more info in the test failure reports.
         """
 
@@ -102,36 +105,23 @@ class FieldTestTemplates(object):
         record_property("stanza_type", splunk_searchtime_fields_positive["stanza_type"])
         record_property("fields", splunk_searchtime_fields_positive["fields"])
 
-        index_list = (
-            "(index="
-            + " OR index=".join(splunk_search_util.search_index.split(","))
-            + ")"
+        search = splunk_searchtime_fields_search_aggregator.get_test_search(
+            splunk_searchtime_fields_positive
         )
-        search = (
-            f"search {index_list}"
-            f" {splunk_searchtime_fields_positive['stanza_type']}=\""
-            f"{splunk_searchtime_fields_positive['stanza']}\""
-        )
-        for field_dict in splunk_searchtime_fields_positive["fields"]:
-            field = Field(field_dict)
-            expected_values = ", ".join([f'"{each}"' for each in field.expected_values])
-            negative_values = ", ".join([f'"{each}"' for each in field.negative_values])
-
-            search = (
-                search + f" AND ({field} IN ({expected_values})"
-                f" AND NOT {field} IN ({negative_values}))"
-            )
-        search += COUNT_BY_SOURCE_TYPE_SEARCH_QUERY_PART
-
-        self.logger.info(f"Executing the search query: {search}")
 
         # run search
-        result = splunk_search_util.checkQueryCountIsGreaterThanZero(
-            search,
-            interval=splunk_search_util.search_interval,
-            retries=splunk_search_util.search_retry,
+        result = (
+            splunk_searchtime_fields_search_aggregator.get_count(
+                splunk_searchtime_fields_positive
+            )
+            > 0
+        )
+        record_property(
+            "search",
+            splunk_searchtime_fields_search_aggregator.get_last_search(
+                splunk_searchtime_fields_positive
+            ),
         )
-        record_property("search", search)
 
         assert result, (
             f"\nNo result found for the search."
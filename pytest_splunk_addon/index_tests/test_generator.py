@@ -116,7 +116,35 @@ class IndexTimeTestGenerator(object):
         Yields:
             pytest.params for the test templates
         """
+        line_breaker_params = self.get_line_breaker_params(tokenized_events)
 
+        for sample_name, params in line_breaker_params.items():
+            LOGGER.debug(
+                "Generating Line Breaker test with the following params:\nhost:{h}\nsourcetype:{s}\nexpected_event_count{e}".format(
+                    h=params["host"],
+                    s=params["sourcetype"],
+                    e=params["expected_event_count"],
+                )
+            )
+            yield pytest.param(
+                {
+                    "host": params["host"],
+                    "sourcetype": params["sourcetype"],
+                    "expected_event_count": params["expected_event_count"],
+                },
+                id="{}::{}".format(params["sourcetype"].replace(" ", "-"), sample_name),
+            )
+
+    def get_line_breaker_params(self, tokenized_events):
+        """
+        Returns the sourcetype, hosts and expected event count of each sample
+
+        Args:
+            tokenized_events (list): list of tokenized events
+
+        Returns:
+            dict: params of the line breaker test for each sample name
+        """
         line_breaker_params = {}
         sample_count = 1
         expected_count = 1
@@ -165,23 +193,7 @@ class IndexTimeTestGenerator(object):
             event_host = self.get_hosts(event)
             if event_host:
                 line_breaker_params[event.sample_name]["host"] |= set(event_host)
-
-        for sample_name, params in line_breaker_params.items():
-            LOGGER.debug(
-                "Generating Line Breaker test with the following params:\nhost:{h}\nsourcetype:{s}\nexpected_event_count{e}".format(
-                    h=params["host"],
-                    s=params["sourcetype"],
-                    e=params["expected_event_count"],
-                )
-            )
-            yield pytest.param(
-                {
-                    "host": params["host"],
-                    "sourcetype": params["sourcetype"],
-                    "expected_event_count": params["expected_event_count"],
-                },
-                id="{}::{}".format(params["sourcetype"].replace(" ", "-"), sample_name),
-            )
+        return line_breaker_params
 
     def get_hosts(self, tokenized_event):
         """
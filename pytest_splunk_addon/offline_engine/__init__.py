@@ -0,0 +1,25 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -*- coding: utf-8 -*-
+"""
+Offline evaluation of the search-time knowledge objects of an Add-on,
+applied to the generated events without Splunk.
+"""
+
+from .eval_expression import EvalExpression, UnsupportedExpression, UnknownValue
+from .field_engine import OfflineFieldEngine, ExtractedFields, convert_regex
+from .field_checker import OfflineFieldChecker, OfflineCheck
+from .regex_profiler import RegexProfiler, RegexProfile
@@ -0,0 +1,569 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Evaluates the simple EVAL- expressions of props.conf without Splunk.
+
+Supports literals, field references, the arithmetic, concatenation,
+comparison and boolean operators and the functions in EVAL_FUNCTIONS.
+Any other expression raises UnsupportedExpression when it is parsed.
+"""
+import hashlib
+import ipaddress
+import math
+import re
+from urllib.parse import unquote_plus
+
+
+class UnsupportedExpression(Exception):
+    """
+    The expression can not be evaluated offline
+    """
+
+
+class UnknownValue(Exception):
+    """
+    The expression uses a field whose value is unknown offline
+    """
+
+
+TOKEN_REGEX = re.compile(
+    r"""
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+        |"(?P<string>(?:\\.|[^"\\])*)"
+        |'(?P<field>(?:\\.|[^'\\])*)'
+        |(?P<name>[A-Za-z_][A-Za-z0-9_]*)
+        |(?P<operator>==|!=|<=|>=|[=<>+\-*/%.(),])
+    )""",
+    re.VERBOSE,
+)
+KEYWORDS = {"AND", "OR", "XOR", "NOT", "LIKE"}
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN_REGEX.match(expression, position)
+        if not match:
+            raise UnsupportedExpression(
+                "Can not parse '{}' at position {}".format(expression, position)
+            )
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value.upper() in KEYWORDS:
+            kind, value = "operator", value.upper()
+        elif kind in ("string", "field"):
+            # Only the quotes and backslashes are escaped, e.g. "\1" is kept
+            value = re.sub(r"\\([\\\"'])", r"\1", value)
+        tokens.append((kind, value))
+    return tokens
+
+
+def to_number(value):
+    """
+    Returns the value as int or float, or None if it is not a number
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            try:
+                return float(value.strip())
+            except ValueError:
+                return None
+    return None
+
+
+def to_string(value):
+    """
+    Returns the value as the string Splunk would display
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise UnsupportedExpression("Boolean values can not be used as strings")
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        # The precision Splunk formats the floats with is not emulated
+        raise UnsupportedExpression("Floating point results are not emulated")
+    return str(value)
+
+
+def _single(value):
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _like(value, pattern):
+    regex = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.match(regex + r"\Z", value, re.DOTALL) is not None
+
+
+def _compare(operator, left, right):
+    left, right = _single(left), _single(right)
+    if left is None or right is None:
+        return None
+    left_number, right_number = to_number(left), to_number(right)
+    if left_number is not None and right_number is not None:
+        left, right = left_number, right_number
+    else:
+        left, right = to_string(left), to_string(right)
+    if operator in ("=", "=="):
+        return left == right
+    if operator == "!=":
+        return left != right
+    if operator == "<":
+        return left < right
+    if operator == ">":
+        return left > right
+    if operator == "<=":
+        return left <= right
+    return left >= right
+
+
+def _arithmetic(operator, left, right):
+    left, right = _single(left), _single(right)
+    if left is None or right is None:
+        return None
+    if operator == ".":
+        return to_string(left) + to_string(right)
+    left_number, right_number = to_number(left), to_number(right)
+    if left_number is None or right_number is None:
+        if operator == "+" and isinstance(left, str) and isinstance(right, str):
+            return left + right
+        return None
+    if operator == "+":
+        return left_number + right_number
+    if operator == "-":
+        return left_number - right_number
+    if operator == "*":
+        return left_number * right_number
+    if right_number == 0:
+        return None
+    if operator == "%":
+        return left_number % right_number
+    result = left_number / right_number
+    return int(result) if result.is_integer() else result
+
+
+def _if(condition, true_value, false_value):
+    return true_value() if condition() else false_value()
+
+
+def _case(*arguments):
+    if len(arguments) % 2:
+        raise UnsupportedExpression("case() expects pairs of arguments")
+    for index in range(0, len(arguments), 2):
+        if arguments[index]():
+            return arguments[index + 1]()
+    return None
+
+
+def _coalesce(*arguments):
+    for argument in arguments:
+        value = argument()
+        if value is not None:
+            return value
+    return None
+
+
+def _validate(*arguments):
+    if len(arguments) % 2:
+        raise UnsupportedExpression("validate() expects pairs of arguments")
+    for index in range(0, len(arguments), 2):
+        if not arguments[index]():
+            return arguments[index + 1]()
+    return None
+
+
+def _null_safe(function):
+    def inner(*arguments):
+        values = [_single(argument()) for argument in arguments]
+        if values and values[0] is None:
+            return None
+        return function(*values)
+
+    return inner
+
+
+def _mv(function):
+    def inner(*arguments):
+        values = [argument() for argument in arguments]
+        if values and values[0] is None:
+            return None
+        first = values[0] if isinstance(values[0], list) else [values[0]]
+        return function(first, *values[1:])
+
+    return inner
+
+
+def _trim(function):
+    def inner(value, characters=None):
+        return function(to_string(value), characters)
+
+    return _null_safe(inner)
+
+
+def _substr(value, start, length=None):
+    value = to_string(value)
+    start = int(to_number(start))
+    start = start - 1 if start > 0 else len(value) + start
+    if length is None:
+        return value[start:]
+    return value[start : start + int(to_number(length))]
+
+
+def _replace(value, regex, replacement):
+    return re.sub(regex, re.sub(r"\\(\d)", r"\\g<\1>", replacement), to_string(value))
+
+
+def _tonumber(value, base=10):
+    if to_number(base) != 10:
+        try:
+            return int(to_string(value), int(to_number(base)))
+        except ValueError:
+            return None
+    return to_number(value)
+
+
+def _tostring(value, format_name=None):
+    if format_name is not None:
+        raise UnsupportedExpression("tostring() formats are not emulated")
+    return to_string(value)
+
+
+def _round(value, digits=0):
+    number = to_number(value)
+    if number is None:
+        return None
+    digits = int(to_number(digits))
+    result = math.floor(number * 10**digits + 0.5) / 10**digits
+    return int(result) if digits == 0 else result
+
+
+def _numeric(function):
+    def inner(value):
+        number = to_number(value)
+        return None if number is None else function(number)
+
+    return _null_safe(inner)
+
+
+def _cidrmatch(cidr, ip):
+    try:
+        return ipaddress.ip_address(to_string(ip)) in ipaddress.ip_network(
+            to_string(cidr), strict=False
+        )
+    except ValueError:
+        return False
+
+
+def _in(value, *arguments):
+    value = _single(value())
+    if value is None:
+        return None
+    return any(to_string(value) == to_string(argument()) for argument in arguments)
+
+
+def _mvindex(values, start, end=None):
+    start = int(to_number(start))
+    start = start if start >= 0 else len(values) + start
+    if end is None:
+        return values[start] if 0 <= start < len(values) else None
+    end = int(to_number(end))
+    end = end if end >= 0 else len(values) + end
+    result = values[start : end + 1]
+    return result if len(result) != 1 else result[0]
+
+
+def _mvappend(*arguments):
+    result = []
+    for argument in arguments:
+        value = argument()
+        if isinstance(value, list):
+            result.extend(value)
+        elif value is not None:
+            result.append(value)
+    return result if len(result) != 1 else result[0]
+
+
+def _minmax(function):
+    def inner(*arguments):
+        values = [_single(argument()) for argument in arguments]
+        values = [value for value in values if value is not None]
+        if not values:
+            return None
+        numbers = [to_number(value) for value in values]
+        if all(number is not None for number in numbers):
+            return function(numbers)
+        return function(to_string(value) for value in values)
+
+    return inner
+
+
+def _hash(name):
+    def inner(value):
+        return hashlib.new(name, to_string(value).encode("utf-8")).hexdigest()
+
+    return _null_safe(inner)
+
+
+# Functions whose arguments are evaluated lazily, as callables
+EVAL_FUNCTIONS = {
+    "if": _if,
+    "case": _case,
+    "coalesce": _coalesce,
+    "validate": _validate,
+    "null": lambda: None,
+    "true": lambda: True,
+    "false": lambda: False,
+    "isnull": lambda value: value() is None,
+    "isnotnull": lambda value: value() is not None,
+    "isnum": lambda value: to_number(_single(value())) is not None,
+    "isstr": lambda value: isinstance(_single(value()), str),
+    "isint": lambda value: isinstance(to_number(_single(value())), int),
+    "in": _in,
+    "lower": _null_safe(lambda value: to_string(value).lower()),
+    "upper": _null_safe(lambda value: to_string(value).upper()),
+    "len": _null_safe(lambda value: len(to_string(value))),
+    "trim": _trim(lambda value, characters: value.strip(characters)),
+    "ltrim": _trim(lambda value, characters: value.lstrip(characters)),
+    "rtrim": _trim(lambda value, characters: value.rstrip(characters)),
+    "substr": _null_safe(_substr),
+    "replace": _null_safe(_replace),
+    "match": _null_safe(
+        lambda value, regex: re.search(regex, to_string(value)) is not None
+    ),
+    "like": _null_safe(lambda value, pattern: _like(to_string(value), pattern)),
+    "split": _null_safe(
+        lambda value, delimiter: to_string(value).split(to_string(delimiter))
+    ),
+    "tonumber": _null_safe(_tonumber),
+    "tostring": _null_safe(_tostring),
+    "urldecode": _null_safe(lambda value: unquote_plus(to_string(value))),
+    "abs": _numeric(abs),
+    "floor": _numeric(math.floor),
+    "ceiling": _numeric(math.ceil),
+    "ceil": _numeric(math.ceil),
+    "round": _null_safe(_round),
+    "min": _minmax(min),
+    "max": _minmax(max),
+    "cidrmatch": _null_safe(_cidrmatch),
+    "md5": _hash("md5"),
+    "sha1": _hash("sha1"),
+    "sha256": _hash("sha256"),
+    "mvcount": _mv(lambda values: len(values)),
+    "mvindex": _mv(_mvindex),
+    "mvjoin": _mv(lambda values, delimiter: to_string(delimiter).join(values)),
+    "mvappend": _mvappend,
+}
+
+
+class EvalExpression(object):
+    """
+    Parsed EVAL- expression of props.conf
+
+    Args:
+        expression (str): The expression, e.g. if(isnull(action), "unknown", action)
+
+    Raises:
+        UnsupportedExpression: If the expression uses syntax or functions
+            which are not emulated
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.fields = set()
+        self._tokens = _tokenize(expression)
+        self._position = 0
+        self._evaluate = self._parse_or()
+        if self._position != len(self._tokens):
+            raise UnsupportedExpression(
+                "Unexpected '{}' in '{}'".format(
+                    self._tokens[self._position][1], expression
+                )
+            )
+
+    def evaluate(self, get_field):
+        """
+        Evaluates the expression
+
+        Args:
+            get_field (callable): Returns the value of a field, None if the field
+                is not in the event. Raises UnknownValue if it is not known offline.
+
+        Returns:
+            str, list or None: value of the field, None if the field is not set
+        """
+        value = self._evaluate(get_field)
+        if isinstance(value, list):
+            values = [to_string(each) for each in value]
+            return values if len(values) != 1 else values[0]
+        return to_string(value)
+
+    def _peek(self, *values):
+        if self._position < len(self._tokens):
+            kind, value = self._tokens[self._position]
+            if kind == "operator" and value in values:
+                return value
+        return None
+
+    def _expect(self, value):
+        if not self._peek(value):
+            raise UnsupportedExpression(
+                "Expected '{}' in '{}'".format(value, self.expression)
+            )
+        self._position += 1
+
+    def _binary(self, operators, parse_operand, combine):
+        left = parse_operand()
+        operator = self._peek(*operators)
+        while operator:
+            self._position += 1
+            right = parse_operand()
+            left = combine(operator, left, right)
+            operator = self._peek(*operators)
+        return left
+
+    def _parse_or(self):
+        def combine(operator, left, right):
+            if operator == "OR":
+                return lambda get: bool(left(get)) or bool(right(get))
+            return lambda get: bool(left(get)) != bool(right(get))
+
+        return self._binary(("OR", "XOR"), self._parse_and, combine)
+
+    def _parse_and(self):
+        return self._binary(
+            ("AND",),
+            self._parse_not,
+            lambda _, left, right: lambda get: bool(left(get)) and bool(right(get)),
+        )
+
+    def _parse_not(self):
+        if self._peek("NOT"):
+            self._position += 1
+            operand = self._parse_not()
+            return lambda get: not operand(get)
+        return self._parse_comparison()
+
+    def _parse_comparison(self):
+        def combine(operator, left, right):
+            if operator == "LIKE":
+                return lambda get: EVAL_FUNCTIONS["like"](
+                    lambda: left(get), lambda: right(get)
+                )
+            return lambda get: _compare(operator, left(get), right(get))
+
+        return self._binary(
+            ("=", "==", "!=", "<", ">", "<=", ">=", "LIKE"),
+            self._parse_additive,
+            combine,
+        )
+
+    def _parse_additive(self):
+        return self._binary(
+            ("+", "-", "."),
+            self._parse_multiplicative,
+            lambda operator, left, right: lambda get: _arithmetic(
+                operator, left(get), right(get)
+            ),
+        )
+
+    def _parse_multiplicative(self):
+        return self._binary(
+            ("*", "/", "%"),
+            self._parse_unary,
+            lambda operator, left, right: lambda get: _arithmetic(
+                operator, left(get), right(get)
+            ),
+        )
+
+    def _parse_unary(self):
+        if self._peek("-"):
+            self._position += 1
+            operand = self._parse_unary()
+            return lambda get: _arithmetic("-", 0, operand(get))
+        return self._parse_primary()
+
+    def _parse_primary(self):
+        if self._position >= len(self._tokens):
+            raise UnsupportedExpression(
+                "Unexpected end of '{}'".format(self.expression)
+            )
+        kind, value = self._tokens[self._position]
+        self._position += 1
+        if kind == "number":
+            number = to_number(value)
+            return lambda get: number
+        if kind == "string":
+            return lambda get: value
+        if kind == "field":
+            return self._field(value)
+        if kind == "name":
+            if self._peek("("):
+                return self._parse_function(value)
+            return self._field(value)
+        if value == "(":
+            inner = self._parse_or()
+            self._expect(")")
+            return inner
+        raise UnsupportedExpression(
+            "Unexpected '{}' in '{}'".format(value, self.expression)
+        )
+
+    def _field(self, name):
+        self.fields.add(name)
+        return lambda get: get(name)
+
+    def _parse_function(self, name):
+        function = EVAL_FUNCTIONS.get(name.lower())
+        if function is None:
+            raise UnsupportedExpression("{}() is not emulated".format(name))
+        self._expect("(")
+        arguments = []
+        if not self._peek(")"):
+            arguments.append(self._parse_or())
+            while self._peek(","):
+                self._position += 1
+                arguments.append(self._parse_or())
+        self._expect(")")
+
+        def call(get):
+            try:
+                return function(*[self._bind(argument, get) for argument in arguments])
+            except (TypeError, ValueError, re.error) as error:
+                raise UnsupportedExpression(
+                    "Can not evaluate {}(): {}".format(name, error)
+                )
+
+        return call
+
+    @staticmethod
+    def _bind(argument, get):
+        return lambda: argument(get)
@@ -0,0 +1,333 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Checks the parameters of the field tests against the fields extracted offline
+from the generated events, instead of searching the events in Splunk.
+
+A check passes or fails only when the fields it depends on are known
+offline, otherwise its result is None and the test has to run in Splunk.
+"""
+import logging
+import re
+from collections import namedtuple
+
+from ..addon_parser import Field
+from ..utilities import xml_event_parser
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+# passed is True, False or None if the check can not be done offline
+OfflineCheck = namedtuple("OfflineCheck", ["passed", "message"])
+
+
+def _wildcard_regex(pattern):
+    return re.compile(
+        ".*".join(re.escape(each) for each in pattern.split("*")) + r"\Z",
+        re.IGNORECASE | re.DOTALL,
+    )
+
+
+def matches_any(values, patterns):
+    """
+    Whether any of the values matches any of the patterns, the way the
+    search command compares a field with IN (...): case-insensitive and
+    with * matching any characters.
+
+    Args:
+        values (list): Values of a field
+        patterns (list): Values of the IN (...) of the search
+    """
+    regexes = [_wildcard_regex(str(pattern)) for pattern in patterns]
+    return any(regex.match(value) for value in values for regex in regexes)
+
+
+class OfflineFieldChecker(object):
+    """
+    Runs the assertions of test_props_fields, test_props_fields_no_dash_not_empty
+    and test_requirements_fields on the fields extracted by OfflineFieldEngine.
+
+    Args:
+        engine (OfflineFieldEngine): Engine extracting the fields of the events
+        tokenized_events (iterable): Generated events of the add-on, a list or IndexedEvents
+    """
+
+    def __init__(self, engine, tokenized_events):
+        self.engine = engine
+        self.tokenized_events = tokenized_events or []
+        self._extracted = {}
+        self._stanza_events = None
+        self._requirement_events = None
+
+    def extract(self, event):
+        """
+        Returns the fields extracted from a generated event, None if the
+        event indexed in Splunk is not known offline
+        """
+        metadata = event.metadata
+        if metadata.get("input_type", "").startswith("syslog"):
+            # The events sent to SC4S are parsed by it before they are indexed
+            return None
+        # The events read again from IndexedEvents are new objects
+        key = (
+            event.event,
+            self.get_sourcetype(event),
+            metadata.get("source"),
+            metadata.get("host"),
+            metadata.get("index", "main"),
+        )
+        if key not in self._extracted:
+            raw, sourcetype, source, host, index = key
+            self._extracted[key] = self.engine.extract(
+                raw, sourcetype, source=source, host=host, index=index
+            )
+        return self._extracted[key]
+
+    @staticmethod
+    def get_sourcetype(event):
+        return event.metadata.get("sourcetype_to_search") or event.metadata.get(
+            "sourcetype"
+        )
+
+    @classmethod
+    def select_stanza_events(cls, tokenized_events, stanza_type, match):
+        """
+        Yields the generated events whose sourcetype or source matches.
+        From IndexedEvents, only the chunks with such an event are read.
+
+        Args:
+            tokenized_events (iterable): Generated events, a list or IndexedEvents
+            stanza_type (str): sourcetype or source
+            match (callable): Whether a sourcetype or source matches
+        """
+        if stanza_type == "sourcetype":
+            keys, get_value = ("sourcetype_to_search", "sourcetype"), cls.get_sourcetype
+        else:
+            keys, get_value = ("source",), lambda event: event.metadata.get("source")
+        if hasattr(tokenized_events, "get_metadata_events"):
+            tokenized_events = tokenized_events.get_metadata_events(
+                keys, lambda value: match(value or "")
+            )
+        for event in tokenized_events:
+            if match(get_value(event) or ""):
+                yield event
+
+    def get_stanza_events(self, stanza_type, stanza):
+        """
+        Returns the generated events of a props.conf stanza. The events of the
+        last stanza are kept, for the other tests of the same stanza.
+
+        Args:
+            stanza_type (str): sourcetype or source
+            stanza (str): Name of the stanza, the sources may contain wildcards
+        """
+        stanza_key = stanza_type, stanza
+        if self._stanza_events is None or self._stanza_events[0] != stanza_key:
+            events = list(
+                self.select_stanza_events(
+                    self.tokenized_events, stanza_type, _wildcard_regex(stanza).match
+                )
+            )
+            self._stanza_events = stanza_key, events
+        return self._stanza_events[1]
+
+    def check_props_fields(self, fields_group):
+        """
+        At least one event of the stanza must have every field with one of
+        its expected values and none of its negative values.
+
+        Args:
+            fields_group (dict): Parameter of test_props_fields
+
+        Returns:
+            OfflineCheck: result of the check
+        """
+        fields = [Field(each) for each in fields_group["fields"]]
+        events = self.get_stanza_events(
+            fields_group["stanza_type"], fields_group["stanza"]
+        )
+        description = "{stanza_type}={stanza}".format(**fields_group)
+        if not events:
+            return OfflineCheck(None, "No generated event has {}".format(description))
+        reasons = []
+        failures = []
+        for event in events:
+            extracted = self.extract(event)
+            if extracted is None:
+                reasons.append("the events sent to SC4S are not known offline")
+                continue
+            unknown = False
+            for field in fields:
+                values = extracted.get(field.name)
+                if values is None:
+                    unknown = True
+                    reasons.append(extracted.get_reason(field.name))
+                elif not matches_any(values, field.expected_values) or matches_any(
+                    values, field.negative_values
+                ):
+                    failures.append((field.name, values))
+                    break
+            else:
+                if not unknown:
+                    return OfflineCheck(True, "")
+        if reasons:
+            return OfflineCheck(
+                None,
+                "The fields of {} can not be checked offline: {}".format(
+                    description, reasons[0]
+                ),
+            )
+        return OfflineCheck(
+            False,
+            "No generated event of {} has the expected values of {}."
+            " First values extracted offline: {}".format(
+                description,
+                ", ".join(field.name for field in fields),
+                ", ".join(
+                    "{}={}".format(name, values) for name, values in failures[:5]
+                ),
+            ),
+        )
+
+    def check_props_fields_negative(self, fields_group):
+        """
+        No event of the stanza may have a field with one of its negative values.
+
+        Args:
+            fields_group (dict): Parameter of test_props_fields_no_dash_not_empty
+
+        Returns:
+            OfflineCheck: result of the check
+        """
+        fields = [Field(each) for each in fields_group["fields"]]
+        events = self.get_stanza_events(
+            fields_group["stanza_type"], fields_group["stanza"]
+        )
+        reasons = []
+        for event in events:
+            extracted = self.extract(event)
+            if extracted is None:
+                reasons.append("the events sent to SC4S are not known offline")
+                continue
+            for field in fields:
+                values = extracted.get(field.name)
+                if values is None:
+                    reasons.append(extracted.get_reason(field.name))
+                elif matches_any(values, field.negative_values):
+                    return OfflineCheck(
+                        False,
+                        "A generated event of {}={} has {}={}, one of its"
+                        " negative values {}".format(
+                            fields_group["stanza_type"],
+                            fields_group["stanza"],
+                            field.name,
+                            values,
+                            field.negative_values,
+                        ),
+                    )
+        if reasons:
+            return OfflineCheck(
+                None,
+                "The fields of {stanza_type}={stanza} can not be checked"
+                " offline: {reason}".format(reason=reasons[0], **fields_group),
+            )
+        return OfflineCheck(True, "")
+
+    def get_requirement_event(self, requirements):
+        """
+        Returns the generated event of a test_requirements_fields parameter.
+        From IndexedEvents, only the events of the sample of the parameter are
+        read, and the events of the last sample are kept for its other tests.
+        """
+        sample_name = requirements.get("sample_name")
+        if not (sample_name and hasattr(self.tokenized_events, "get_sample_events")):
+            sample_name = None
+        if self._requirement_events is None or (
+            self._requirement_events[0] != sample_name
+        ):
+            events = (
+                self.tokenized_events.get_sample_events(sample_name)
+                if sample_name
+                else self.tokenized_events
+            )
+            requirement_events = {}
+            for event in events:
+                if not event.requirement_test_data:
+                    continue
+                identifier = getattr(event, "unique_identifier", None)
+                if identifier:
+                    requirement_events.setdefault(identifier, event)
+                stripped_event = event.event
+                if event.metadata.get("input_type", "").startswith("syslog"):
+                    stripped_event = xml_event_parser.strip_syslog_header(event.event)
+                if stripped_event is not None:
+                    requirement_events.setdefault(
+                        xml_event_parser.escape_char_event(stripped_event), event
+                    )
+            self._requirement_events = sample_name, requirement_events
+        requirement_events = self._requirement_events[1]
+        return requirement_events.get(
+            requirements.get("unique_identifier")
+        ) or requirement_events.get(requirements.get("escaped_event"))
+
+    def check_requirements_fields(self, requirements):
+        """
+        The event must have every field of the requirements with its value.
+
+        Args:
+            requirements (dict): Parameter of test_requirements_fields
+
+        Returns:
+            OfflineCheck: result of the check
+        """
+        event = self.get_requirement_event(requirements)
+        if event is None:
+            return OfflineCheck(None, "The event is not one of the generated events")
+        extracted = self.extract(event)
+        if extracted is None:
+            return OfflineCheck(
+                None, "The events sent to SC4S can not be checked offline"
+            )
+        wrong_values = {}
+        reasons = []
+        for field, expected in requirements["fields"].items():
+            values = extracted.get(field)
+            if values is None:
+                reasons.append(extracted.get_reason(field))
+            elif len(values) > 1:
+                reasons.append("{} is a multivalue field".format(field))
+            elif (values[0] if values else None) != expected:
+                wrong_values[field] = values[0] if values else None
+        if wrong_values:
+            return OfflineCheck(
+                False,
+                "Fields of sample {} with wrong values offline: {}".format(
+                    event.sample_name,
+                    ", ".join(
+                        "{}={!r}, expected {!r}".format(
+                            field, value, requirements["fields"][field]
+                        )
+                        for field, value in wrong_values.items()
+                    ),
+                ),
+            )
+        if reasons:
+            return OfflineCheck(
+                None,
+                "The fields of sample {} can not be checked offline: {}".format(
+                    event.sample_name, reasons[0]
+                ),
+            )
+        return OfflineCheck(True, "")
@@ -0,0 +1,786 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Applies the search-time field extractions of props.conf and transforms.conf
+to an event without Splunk.
+
+The extractions are applied in the order Splunk applies them: EXTRACT,
+REPORT, KV_MODE, FIELDALIAS, EVAL and LOOKUP, each sorted by class name.
+What can not be emulated (e.g. a regex Python can not compile, an EVAL
+function or an external lookup) makes the fields it sets unknown instead
+of guessing their values.
+"""
+import csv
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+
+from ..addon_parser import AddonParser
+from .eval_expression import EvalExpression, UnknownValue, UnsupportedExpression
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+# Order in which Splunk applies the search-time operations
+OPERATION_ORDER = ["EXTRACT", "REPORT", "FIELDALIAS", "EVAL", "LOOKUP"]
+# Fields Splunk adds to the events which are not emulated
+UNKNOWN_DEFAULT_FIELDS = {
+    "_time",
+    "_indextime",
+    "eventtype",
+    "linecount",
+    "punct",
+    "splunk_server",
+    "tag",
+    "timeendpos",
+    "timestartpos",
+}
+UNKNOWN_DEFAULT_FIELD_PREFIXES = ("date_", "tag::")
+NAMED_GROUP_REGEX = re.compile(r"\(\?(?:P?<(?![=!])([^>]+)>|'([^']+)')")
+EXTRACT_SOURCE_KEY_REGEX = re.compile(r"(?i)(?:\s+in\s+(\w+))\s*$")
+
+
+def convert_regex(regex):
+    """
+    Converts the named groups of a PCRE regex to Python's syntax,
+    (?<name>...) and (?'name'...) to (?P<name>...)
+
+    Args:
+        regex (str): regex of props.conf or transforms.conf
+
+    Returns:
+        str: regex for the re module
+    """
+    return NAMED_GROUP_REGEX.sub(
+        lambda match: "(?P<{}>".format(match.group(1) or match.group(2)), regex
+    )
+
+
+def clean_key(key):
+    """
+    Cleans a field name the way CLEAN_KEYS does, replacing the characters
+    other than letters, digits and underscores by underscores and removing
+    the leading underscores and digits.
+    """
+    return re.sub(r"^[_0-9]+", "", re.sub(r"[^A-Za-z0-9_]", "_", key))
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def get_source_regex(source_stanza):
+    """
+    Regex matching the sources of a source:: stanza, where ... matches
+    any characters, * any characters but a path separator and (a|b) either
+    """
+    pattern = ""
+    index = 0
+    while index < len(source_stanza):
+        if source_stanza.startswith("...", index):
+            pattern += ".*"
+            index += 3
+            continue
+        char = source_stanza[index]
+        if char == "*":
+            pattern += r"[^/\\]*"
+        elif char in "(|)":
+            pattern += char
+        else:
+            pattern += re.escape(char)
+        index += 1
+    return re.compile(pattern + r"\Z")
+
+
+class ExtractedFields(object):
+    """
+    Fields of an event extracted offline, each with its list of values
+
+    Args:
+        raw (str): Raw text of the event
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.values = OrderedDict()
+        self.unknown = set(UNKNOWN_DEFAULT_FIELDS)
+        # Set when the names of the fields an operation sets are not known,
+        # so that any field missing from the event may still be set in Splunk
+        self.open_ended = False
+        # Set with KV_MODE=auto, Splunk extracts the key=value pairs of _raw
+        self.auto_kv = False
+        self.reasons = OrderedDict()
+
+    def get(self, field):
+        """
+        Returns the values of a field, an empty list if the event does not
+        have the field or None if it can not be known offline
+        """
+        if self.is_unknown(field):
+            return None
+        return list(self.values.get(field, []))
+
+    def is_unknown(self, field):
+        if field in self.unknown or field.startswith(UNKNOWN_DEFAULT_FIELD_PREFIXES):
+            return True
+        if field in self.values:
+            return False
+        if self.open_ended:
+            return True
+        return self.auto_kv and bool(
+            re.search(r"(?<![\w.]){}\s*=".format(re.escape(field)), self.raw)
+        )
+
+    def set(self, field, values, overwrite=True, append=False):
+        """
+        Sets the values of a field
+
+        Args:
+            field (str): Name of the field
+            values (list): Values of the field, the field is removed if empty
+            overwrite (bool): Whether an existing field is overwritten
+            append (bool): Whether the values are appended to an existing field
+        """
+        if not field:
+            return
+        exists = field in self.values or field in self.unknown
+        if exists and append:
+            if field in self.values:
+                self.values[field].extend(values)
+        elif not exists or overwrite:
+            self.unknown.discard(field)
+            if values:
+                self.values[field] = list(values)
+            else:
+                self.values.pop(field, None)
+
+    def set_unknown(self, field, reason):
+        """
+        Marks a field as unknown offline
+
+        Args:
+            field (str): Name of the field
+            reason (str): Why the field is unknown
+        """
+        self.values.pop(field, None)
+        self.unknown.add(field)
+        self.reasons.setdefault(field, reason)
+
+    def set_open_ended(self, reason):
+        """
+        Marks the fields missing from the event as unknown, as an operation
+        which can not be emulated may set any field
+        """
+        self.open_ended = True
+        self.reasons.setdefault("*", reason)
+
+    def get_reason(self, field):
+        """
+        Returns why a field is unknown
+        """
+        if field in self.reasons:
+            return self.reasons[field]
+        if field in self.unknown or field.startswith(UNKNOWN_DEFAULT_FIELD_PREFIXES):
+            return "{} is set by Splunk".format(field)
+        if self.open_ended:
+            return self.reasons.get("*")
+        return "{} may be extracted by KV_MODE=auto".format(field)
+
+
+class OfflineFieldEngine(object):
+    """
+    Extracts the search-time fields of the events the way props.conf and
+    transforms.conf of an add-on would, without Splunk.
+
+    Args:
+        splunk_app_path (str): Path of the Splunk app
+        props (dict): Parsed props.conf, parsed from the app if not given
+        transforms (dict): Parsed transforms.conf, parsed from the app if not given
+    """
+
+    def __init__(self, splunk_app_path, props=None, transforms=None):
+        self.splunk_app_path = splunk_app_path
+        self._props = props
+        self._transforms = transforms
+        self._source_stanzas = None
+        self._plans = {}
+        self._regexes = {}
+        self._expressions = {}
+        self._lookup_tables = {}
+        self._addon_parser = None
+
+    @property
+    def props(self):
+        if self._props is None:
+            self._props = self._get_addon_parser().props_parser.props or {}
+        return self._props
+
+    @property
+    def transforms(self):
+        if self._transforms is None:
+            props_parser = self._get_addon_parser().props_parser
+            self._transforms = props_parser.transforms_parser.transforms or {}
+        return self._transforms
+
+    def _get_addon_parser(self):
+        if self._addon_parser is None:
+            self._addon_parser = AddonParser(self.splunk_app_path)
+        return self._addon_parser
+
+    def get_stanza_settings(self, sourcetype, source=None):
+        """
+        Merges the settings of the sourcetype stanza and of the source::
+        stanzas matching the source, the source stanzas taking precedence.
+
+        Args:
+            sourcetype (str): Sourcetype of the event
+            source (str): Source of the event
+
+        Returns:
+            dict: settings of props.conf applying to the event
+        """
+        if self._source_stanzas is None:
+            self._source_stanzas = [
+                (get_source_regex(stanza[len("source::") :]), values)
+                for stanza, values in self.props.items()
+                if stanza.startswith("source::")
+            ]
+        settings = dict(self.props.get(sourcetype) or {})
+        if source:
+            for source_regex, values in self._source_stanzas:
+                if source_regex.match(source):
+                    settings.update(values)
+        return settings
+
+    def extract(self, raw, sourcetype, source=None, host=None, index="main"):
+        """
+        Extracts the fields of an event
+
+        Args:
+            raw (str): Raw text of the event
+            sourcetype (str): Sourcetype of the event
+            source (str): Source of the event
+            host (str): Host of the event
+            index (str): Index of the event
+
+        Returns:
+            ExtractedFields: fields of the event
+        """
+        fields = ExtractedFields(raw)
+        for field, value in (
+            ("_raw", raw),
+            ("sourcetype", sourcetype),
+            ("source", source),
+            ("host", host),
+            ("index", index),
+        ):
+            if value is not None:
+                fields.set(field, [value])
+            else:
+                fields.set_unknown(field, "{} of the event is not known".format(field))
+        for operation, name, value in self._get_plan(sourcetype, source):
+            getattr(self, "_apply_{}".format(operation))(fields, name, value)
+        return fields
+
+    def _get_plan(self, sourcetype, source):
+        key = (sourcetype, source)
+        if key not in self._plans:
+            settings = self.get_stanza_settings(sourcetype, source)
+            operations = {operation: [] for operation in OPERATION_ORDER}
+            for name, value in settings.items():
+                for operation in OPERATION_ORDER:
+                    if name.upper().startswith(operation + "-"):
+                        operations[operation].append(
+                            (operation.lower(), name, value.strip())
+                        )
+            plan = []
+            for operation in OPERATION_ORDER:
+                if operation == "EVAL":
+                    # The EVALs are evaluated before any of their fields is set
+                    plan.append(
+                        (
+                            "evals",
+                            "EVAL",
+                            [
+                                (name, value)
+                                for _, name, value in sorted(operations[operation])
+                            ],
+                        )
+                    )
+                else:
+                    plan.extend(sorted(operations[operation]))
+                if operation == "REPORT":
+                    plan.append(("kv_mode", "KV_MODE", settings))
+            self._plans[key] = plan
+        return self._plans[key]
+
+    def _compile(self, regex):
+        if regex not in self._regexes:
+            try:
+                self._regexes[regex] = re.compile(convert_regex(regex))
+            except re.error as error:
+                self._regexes[regex] = error
+        return self._regexes[regex]
+
+    @staticmethod
+    def _get_sources(fields, source_key):
+        """
+        Returns the values the regex of an extraction is applied to,
+        None if they are unknown
+        """
+        source_key = source_key or "_raw"
+        if source_key.startswith("field:"):
+            source_key = source_key[len("field:") :]
+        return fields.get(source_key)
+
+    def _set_unknown_outputs(self, fields, names, reason, open_ended=False):
+        for each in names:
+            fields.set_unknown(each, reason)
+        if open_ended:
+            fields.set_open_ended(reason)
+
+    def _apply_regex(
+        self,
+        fields,
+        name,
+        regex,
+        source_key=None,
+        format_string=None,
+        mv_add=False,
+        clean_keys=True,
+    ):
+        """
+        Applies the regex of an EXTRACT or a REPORT to its source field.
+        Every match of the regex sets fields, the fields which already exist
+        are not overwritten, unless mv_add is set to append the new values.
+        """
+        group_names = [
+            group_name
+            for match in NAMED_GROUP_REGEX.finditer(regex)
+            for group_name in match.groups()
+            if group_name
+        ]
+        dynamic = any(
+            group_name.startswith(("_KEY_", "_VAL_")) for group_name in group_names
+        ) or bool(format_string and re.search(r"\$\d+\s*::", format_string))
+        output_names = [
+            group_name
+            for group_name in group_names
+            if not group_name.startswith(("_KEY_", "_VAL_"))
+        ]
+        format_pairs = None
+        if format_string:
+            format_pairs = re.findall(
+                r"(\S+?)::(\"[^\"]*\"|'[^']*'|\S*)", format_string
+            )
+            output_names = [key for key, _ in format_pairs if "$" not in key]
+        compiled = self._compile(regex)
+        sources = self._get_sources(fields, source_key)
+        if isinstance(compiled, re.error) or sources is None:
+            reason = (
+                "{} can not be emulated: {}".format(name, compiled)
+                if sources is not None
+                else "{} is extracted from {}, which is not known".format(
+                    name, source_key
+                )
+            )
+            self._set_unknown_outputs(fields, output_names, reason, open_ended=dynamic)
+            return
+        for source in sources:
+            for match in compiled.finditer(source):
+                for field, value in self._get_match_fields(
+                    match, format_pairs, clean_keys
+                ):
+                    fields.set(field, [value], overwrite=False, append=mv_add)
+
+    @staticmethod
+    def _get_match_fields(match, format_pairs, clean_keys):
+        """
+        Yields the fields set by a match, from the FORMAT of the transform,
+        from the _KEY_n and _VAL_n groups or from the named groups
+        """
+        if format_pairs is not None:
+
+            def get_group(group):
+                index = int(group.group(1))
+                return (match.group(index) or "") if index <= match.re.groups else ""
+
+            for key, value in format_pairs:
+                field = re.sub(r"\$(\d+)", get_group, _unquote(key))
+                if "$" in key and clean_keys:
+                    field = clean_key(field)
+                value = re.sub(r"\$(\d+)", get_group, _unquote(value))
+                if field and value:
+                    yield field, value
+            return
+        groups = match.groupdict()
+        for group_name, value in groups.items():
+            if group_name.startswith("_KEY_"):
+                key = value
+                value = groups.get("_VAL_" + group_name[len("_KEY_") :])
+                if key and value:
+                    yield (clean_key(key) if clean_keys else key), value
+            elif not group_name.startswith("_VAL_") and value:
+                yield group_name, value
+
+    def _apply_extract(self, fields, name, value):
+        source_key = None
+        source_key_match = EXTRACT_SOURCE_KEY_REGEX.search(value)
+        if source_key_match:
+            source_key = source_key_match.group(1)
+            value = value[: source_key_match.start()]
+        self._apply_regex(fields, name, value, source_key=source_key)
+
+    def _apply_report(self, fields, name, value):
+        for transform_name in (each.strip() for each in value.split(",")):
+            if not transform_name:
+                continue
+            transform = self.transforms.get(transform_name)
+            reason_name = "{}::{}".format(name, transform_name)
+            if transform is None:
+                LOGGER.warning(
+                    "Offline engine: transform %s of %s is not in transforms.conf",
+                    transform_name,
+                    name,
+                )
+                continue
+            mv_add = transform.get("MV_ADD", "false").strip().lower() in (
+                "true",
+                "1",
+                "t",
+            )
+            clean_keys = transform.get("CLEAN_KEYS", "true").strip().lower() not in (
+                "false",
+                "0",
+                "f",
+            )
+            if "DELIMS" in transform:
+                self._apply_delims(fields, reason_name, transform, mv_add, clean_keys)
+            elif "REGEX" in transform:
+                self._apply_regex(
+                    fields,
+                    reason_name,
+                    transform["REGEX"].strip(),
+                    source_key=transform.get("SOURCE_KEY", "").strip() or None,
+                    format_string=transform.get("FORMAT"),
+                    mv_add=mv_add,
+                    clean_keys=clean_keys,
+                )
+
+    def _apply_delims(self, fields, name, transform, mv_add, clean_keys):
+        delims = [
+            re.sub(
+                r"\\(.)",
+                lambda match: "\t" if match.group(1) == "t" else match.group(1),
+                each,
+            )
+            for each in re.findall(r"\"((?:\\.|[^\"\\])*)\"", transform["DELIMS"])
+        ] or [transform["DELIMS"].strip()]
+        field_names = [
+            _unquote(each)
+            for each in transform.get("FIELDS", "").split(",")
+            if each.strip()
+        ]
+        source_key = transform.get("SOURCE_KEY", "").strip() or None
+        sources = self._get_sources(fields, source_key)
+        if sources is None:
+            self._set_unknown_outputs(
+                fields,
+                field_names,
+                "{} is extracted from {}, which is not known".format(name, source_key),
+                open_ended=not field_names or mv_add,
+            )
+            return
+
+        def split(text, characters):
+            return re.split("[{}]".format(re.escape(characters)), text)
+
+        for source in sources:
+            if field_names:
+                pairs = zip(field_names, split(source, delims[0]))
+            elif len(delims) > 1:
+                pairs = []
+                for pair in split(source, delims[0]):
+                    key_value = split(pair, delims[1])
+                    if len(key_value) > 1:
+                        key = key_value[0].strip()
+                        pairs.append(
+                            (clean_key(key) if clean_keys else key, key_value[1])
+                        )
+            else:
+                continue
+            for field, value in pairs:
+                if value:
+                    fields.set(field, [value], overwrite=False, append=mv_add)
+
+    def _apply_kv_mode(self, fields, name, settings):
+        kv_mode = settings.get("KV_MODE", "auto").strip().lower() or "auto"
+        indexed_extractions = settings.get("INDEXED_EXTRACTIONS", "").strip().lower()
+        auto_kv_json = settings.get("AUTO_KV_JSON", "true").strip().lower() not in (
+            "false",
+            "0",
+            "f",
+        )
+        if (
+            kv_mode == "json"
+            or indexed_extractions == "json"
+            or (kv_mode in ("auto", "auto_escaped") and auto_kv_json)
+        ):
+            self._apply_json(fields)
+        if kv_mode in ("auto", "auto_escaped"):
+            fields.auto_kv = True
+        elif kv_mode not in ("none", "json"):
+            fields.set_open_ended("KV_MODE={} is not emulated".format(kv_mode))
+        if indexed_extractions and indexed_extractions != "json":
+            fields.set_open_ended(
+                "INDEXED_EXTRACTIONS={} is not emulated".format(indexed_extractions)
+            )
+
+    @staticmethod
+    def _apply_json(fields):
+        try:
+            document = json.loads(fields.raw)
+        except ValueError:
+            return
+        if not isinstance(document, dict):
+            return
+
+        def flatten(prefix, value):
+            if isinstance(value, dict):
+                for key, each in value.items():
+                    yield from flatten(
+                        "{}.{}".format(prefix, key) if prefix else key, each
+                    )
+            elif isinstance(value, list):
+                for each in value:
+                    yield from flatten(prefix + "{}", each)
+            elif isinstance(value, bool):
+                yield prefix, "true" if value else "false"
+            elif value is None:
+                yield prefix, "null"
+            else:
+                yield prefix, str(value)
+
+        values = OrderedDict()
+        for key, value in flatten("", document):
+            values.setdefault(key, []).append(value)
+        for key, each in values.items():
+            fields.set(key, each, overwrite=False)
+
+    def _apply_fieldalias(self, fields, name, value):
+        aliases = re.findall(
+            r"(\"(?:\\\"|[^\"])*\"|'(?:\\'|[^'])*'|[^\s,]+)\s+(as(?:new)?)\s+"
+            r"(\"(?:\\\"|[^\"])*\"|'(?:\\'|[^'])*'|[^\s,]+)",
+            value,
+            re.IGNORECASE,
+        )
+        for source, keyword, destination in aliases:
+            source, destination = _unquote(source), _unquote(destination)
+            values = fields.get(source)
+            if values is None:
+                fields.set_unknown(
+                    destination,
+                    "{} aliases {}, which is not known".format(name, source),
+                )
+            elif values:
+                is_new = keyword.lower() == "asnew"
+                if is_new and fields.is_unknown(destination):
+                    fields.set_unknown(
+                        destination,
+                        "{} aliases {} if {} is not set, which is not known".format(
+                            name, source, destination
+                        ),
+                    )
+                else:
+                    fields.set(destination, values, overwrite=not is_new)
+
+    def _apply_evals(self, fields, name, evals):
+        """
+        Evaluates the EVALs of the event, all of them from the fields set
+        before the EVALs, and then sets their fields
+        """
+
+        def get_field(field):
+            values = fields.get(field)
+            if values is None:
+                raise UnknownValue(field)
+            if not values:
+                return None
+            return values[0] if len(values) == 1 else values
+
+        results = []
+        for eval_name, value in evals:
+            field = eval_name.split("-", 1)[1].strip()
+            try:
+                result = self._get_expression(value).evaluate(get_field)
+            except UnknownValue as error:
+                reason = "{} uses {}, which is not known".format(eval_name, error)
+                results.append((field, None, reason))
+                continue
+            except UnsupportedExpression as error:
+                reason = "{} can not be emulated: {}".format(eval_name, error)
+                results.append((field, None, reason))
+                continue
+            if result is None:
+                result = []
+            results.append(
+                (field, result if isinstance(result, list) else [result], None)
+            )
+        for field, result, reason in results:
+            if reason:
+                fields.set_unknown(field, reason)
+            else:
+                fields.set(field, result)
+
+    def _get_expression(self, expression):
+        """
+        Returns the parsed EVAL expression
+
+        Raises:
+            UnsupportedExpression: If the expression can not be evaluated offline
+        """
+        if expression not in self._expressions:
+            try:
+                self._expressions[expression] = EvalExpression(expression)
+            except UnsupportedExpression as error:
+                self._expressions[expression] = error
+        parsed = self._expressions[expression]
+        if isinstance(parsed, UnsupportedExpression):
+            raise parsed
+        return parsed
+
+    def _apply_lookup(self, fields, name, value):
+        """
+        Applies an automatic lookup with a csv file,
+        LOOKUP-<class> = <lookup> <field> [AS <field>] ... [OUTPUT|OUTPUTNEW <field> [AS <field>] ...]
+        """
+        tokens = re.findall(r"\"[^\"]*\"|'[^']*'|[^\s,]+", value)
+        if not tokens:
+            return
+        lookup_name, tokens = tokens[0], tokens[1:]
+        inputs, outputs, output_new = [], [], False
+        current = inputs
+        for token in tokens:
+            if token.upper() in ("OUTPUT", "OUTPUTNEW"):
+                current = outputs
+                output_new = token.upper() == "OUTPUTNEW"
+            elif token.upper() == "AS" and current:
+                current[-1] = (current[-1][0], None)
+            elif current and current[-1][1] is None:
+                current[-1] = (current[-1][0], _unquote(token))
+            else:
+                current.append((_unquote(token), _unquote(token)))
+        table = self._get_lookup_table(lookup_name)
+        if isinstance(table, str):
+            reason = "{} can not be emulated: {}".format(name, table)
+            self._set_unknown_outputs(
+                fields, [each for _, each in outputs], reason, open_ended=not outputs
+            )
+            return
+        header, rows, transform = table
+        if not outputs:
+            input_columns = {column for column, _ in inputs}
+            outputs = [
+                (column, column) for column in header if column not in input_columns
+            ]
+        input_values = []
+        for column, field in inputs:
+            values = fields.get(field)
+            if values is None:
+                self._set_unknown_outputs(
+                    fields,
+                    [each for _, each in outputs],
+                    "{} uses {}, which is not known".format(name, field),
+                )
+                return
+            input_values.append((column, values))
+        case_sensitive = transform.get(
+            "case_sensitive_match", "true"
+        ).strip().lower() not in (
+            "false",
+            "0",
+            "f",
+        )
+        max_matches = int(transform.get("max_matches", "100").strip() or 100)
+        normalize = (
+            (lambda text: text) if case_sensitive else (lambda text: text.lower())
+        )
+        matches = []
+        for row in rows:
+            if (
+                all(
+                    any(
+                        normalize(row.get(column) or "") == normalize(each)
+                        for each in values
+                    )
+                    for column, values in input_values
+                )
+                and input_values
+            ):
+                matches.append(row)
+                if len(matches) >= max_matches:
+                    break
+        min_matches = int(transform.get("min_matches", "0").strip() or 0)
+        default_match = transform.get("default_match")
+        for column, field in outputs:
+            if output_new and (field in fields.values or fields.is_unknown(field)):
+                # OUTPUTNEW does not overwrite the fields
+                continue
+            values = [row.get(column) for row in matches if row.get(column)]
+            if not matches and min_matches > 0 and default_match is not None:
+                values = [default_match.strip()]
+            if matches or values:
+                fields.set(field, values)
+
+    def _get_lookup_table(self, lookup_name):
+        """
+        Returns the header, rows and settings of a lookup, or why it can not be read
+        """
+        if lookup_name not in self._lookup_tables:
+            transform = self.transforms.get(lookup_name)
+            if transform is None:
+                table = "{} is not in transforms.conf".format(lookup_name)
+            elif "filename" not in transform:
+                table = "only the lookups with a filename are emulated"
+            elif any(
+                setting in transform
+                for setting in ("match_type", "time_field", "external_cmd")
+            ):
+                table = "match_type, time_field and external_cmd are not emulated"
+            else:
+                lookup_path = os.path.join(
+                    self.splunk_app_path, "lookups", transform["filename"].strip()
+                )
+                try:
+                    with open(lookup_path, newline="") as lookup_file:
+                        reader = csv.DictReader(lookup_file)
+                        rows = [
+                            {
+                                (key or "").strip(): (value or "").strip()
+                                for key, value in row.items()
+                            }
+                            for row in reader
+                        ]
+                        header = [each.strip() for each in reader.fieldnames or []]
+                    table = (header, rows, transform)
+                except (IOError, csv.Error) as error:
+                    table = "can not read {}: {}".format(lookup_path, error)
+            self._lookup_tables[lookup_name] = table
+        return self._lookup_tables[lookup_name]
@@ -0,0 +1,478 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Profiles the regexes of the EXTRACT and REPORT extractions of an add-on on
+the generated events, without Splunk.
+
+Every regex is timed on the events of its stanza, then on the event it is
+the slowest on made up to GROWTH_FACTORS[-1] times longer, once by repeating
+the event and once by repeating each of its characters, which makes every
+run of similar characters longer. The regexes whose time grows faster than
+the length of the event, e.g. with catastrophic backtracking, are flagged. As such a regex may never return,
+it is timed in a child process which is stopped after a timeout.
+"""
+import logging
+import math
+import multiprocessing
+import re
+import time
+from collections import deque
+
+from .field_checker import OfflineFieldChecker
+from .field_engine import (
+    EXTRACT_SOURCE_KEY_REGEX,
+    OfflineFieldEngine,
+    convert_regex,
+    get_source_regex,
+)
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+# Times the slowest event is made longer to measure the growth of a regex
+GROWTH_FACTORS = (1, 2, 4, 8, 16)
+# Ways of making an event longer
+GROWTH_STRATEGIES = {
+    "repeated": lambda text, factor: text * factor,
+    "stretched": lambda text, factor: "".join(char * factor for char in text),
+}
+# Growth exponent above which the time of a regex is considered super-linear
+SUPER_LINEAR_EXPONENT = 1.5
+# Minimum seconds of a timing, a fast regex is run in a loop to reach it
+MIN_TIMING = 1e-4
+# The timings longer than this are not repeated
+MAX_REPEATED_TIMING = 0.1
+MAX_PROFILED_EVENTS = 200
+REGEX_PROFILE_TIMEOUT = 10
+
+
+def percentile(values, percent):
+    """
+    Nearest-rank percentile of the values, None without values
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(int(math.ceil(percent / 100.0 * len(values))), 1)
+    return values[rank - 1]
+
+
+def growth_exponent(points):
+    """
+    Exponent k of time ~ length ** k fitted on (length, seconds) points,
+    1 for a linear regex, 2 for a quadratic one
+
+    Args:
+        points (list): (length, seconds) measurements
+
+    Returns:
+        float: the exponent, None with less than 2 distinct lengths
+    """
+    points = [
+        (math.log(length), math.log(seconds))
+        for length, seconds in points
+        if length > 0 and seconds > 0
+    ]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum(
+        (x - mean_x) ** 2 for x, _ in points
+    )
+
+
+def time_regex(compiled, text, repeat=3):
+    """
+    Seconds finding all the matches of a regex in a text takes, the best
+    of repeat timings
+
+    Args:
+        compiled (re.Pattern): regex to time
+        text (str): text to find the matches in
+        repeat (int): number of timings
+    """
+    best = None
+    for _ in range(repeat):
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                deque(compiled.finditer(text), maxlen=0)
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_TIMING:
+                break
+            number *= 10
+        best = min(best, elapsed / number) if best is not None else elapsed / number
+        if elapsed > MAX_REPEATED_TIMING:
+            break
+    return best
+
+
+def profile_regex(send, regex, texts, repeat=3):
+    """
+    Times a regex on every text, then on the text it is the slowest on
+    made GROWTH_FACTORS times longer with every GROWTH_STRATEGIES. Every
+    timing is sent as soon as it is measured, so the timings done before
+    a timeout are kept.
+
+    Args:
+        send (callable): called with ("event", None, length, seconds) or
+            ("growth", strategy, length, seconds) for each timing and with
+            ("done",) at the end
+        regex (str): regex with Python's syntax
+        texts (list): texts to time the regex on
+        repeat (int): number of timings of each text
+    """
+    compiled = re.compile(regex)
+    slowest, slowest_rate = None, -1
+    for text in texts:
+        seconds = time_regex(compiled, text, repeat)
+        send(("event", None, len(text), seconds))
+        rate = seconds / max(len(text), 1)
+        if rate > slowest_rate:
+            slowest, slowest_rate = text, rate
+    if slowest:
+        for strategy, grow in sorted(GROWTH_STRATEGIES.items()):
+            for factor in GROWTH_FACTORS:
+                grown = grow(slowest, factor)
+                send(
+                    (
+                        "growth",
+                        strategy,
+                        len(grown),
+                        time_regex(compiled, grown, repeat),
+                    )
+                )
+    send(("done",))
+
+
+def _profile_regex_process(connection, regex, texts, repeat):
+    try:
+        profile_regex(connection.send, regex, texts, repeat)
+    finally:
+        connection.close()
+
+
+class RegexProfile(object):
+    """
+    Timings of the regex of an extraction
+
+    Args:
+        stanza (str): props.conf stanza of the extraction
+        name (str): EXTRACT-<class> or REPORT-<class>::<transform>
+        regex (str): regex of the extraction
+    """
+
+    def __init__(self, stanza, name, regex):
+        self.stanza = stanza
+        self.name = name
+        self.regex = regex
+        self.timings = []
+        self.growth = {}
+        self.timed_out = False
+        self.error = None
+
+    def add(self, message):
+        kind, strategy, length, seconds = message
+        if kind == "event":
+            self.timings.append((length, seconds))
+        else:
+            self.growth.setdefault(strategy, []).append((length, seconds))
+
+    @property
+    def p50(self):
+        return percentile([seconds for _, seconds in self.timings], 50)
+
+    @property
+    def p99(self):
+        return percentile([seconds for _, seconds in self.timings], 99)
+
+    @property
+    def exponent(self):
+        """
+        Highest growth exponent of the strategies, measured on the longest
+        lengths as the overhead of a search hides the growth on the shortest
+        """
+        exponents = [
+            exponent
+            for exponent in (
+                growth_exponent(points[-3:]) for points in self.growth.values()
+            )
+            if exponent is not None
+        ]
+        return max(exponents) if exponents else None
+
+    @property
+    def super_linear(self):
+        exponent = self.exponent
+        return self.timed_out or (
+            exponent is not None and exponent > SUPER_LINEAR_EXPONENT
+        )
+
+    def get_flag(self, timeout=REGEX_PROFILE_TIMEOUT):
+        if self.error:
+            return "error: {}".format(self.error)
+        if self.timed_out:
+            return "catastrophic: not done in {}s".format(timeout)
+        if self.super_linear:
+            return "super-linear"
+        if not self.timings:
+            return "no events"
+        return ""
+
+    def sort_key(self):
+        """
+        The timed out regexes first, then the super-linear ones by growth
+        and the others by p99, the regexes without timings last
+        """
+        if self.timed_out:
+            return (0, 0)
+        if self.super_linear:
+            return (1, -self.exponent)
+        if self.timings:
+            return (2, -self.p99)
+        return (3, 0)
+
+
+class RegexProfiler(object):
+    """
+    Times the EXTRACT and REPORT regexes of an add-on on its generated events
+
+    Args:
+        engine (OfflineFieldEngine): Engine with the props.conf and
+            transforms.conf of the add-on, used to extract the source
+            fields of the regexes which are not applied to _raw
+        tokenized_events (iterable): Generated events of the add-on, a list or IndexedEvents
+        timeout (int): Seconds after which the profiling of a regex is stopped
+        repeat (int): Number of timings of each event
+        max_events (int): Maximum number of events a regex is timed on
+    """
+
+    def __init__(
+        self,
+        engine,
+        tokenized_events,
+        timeout=REGEX_PROFILE_TIMEOUT,
+        repeat=3,
+        max_events=MAX_PROFILED_EVENTS,
+    ):
+        self.engine = engine
+        self.tokenized_events = tokenized_events or []
+        self._stanza_events = None
+        self.timeout = timeout
+        self.repeat = repeat
+        self.max_events = max_events
+
+    def get_regexes(self):
+        """
+        Yields the stanza, name, regex and source key of every EXTRACT
+        and of every REPORT transform with a REGEX
+        """
+        for stanza, settings in self.engine.props.items():
+            if stanza.startswith("host::"):
+                continue
+            for name, value in sorted(settings.items()):
+                if name.upper().startswith("EXTRACT-"):
+                    value = value.strip()
+                    source_key = None
+                    source_key_match = EXTRACT_SOURCE_KEY_REGEX.search(value)
+                    if source_key_match:
+                        source_key = source_key_match.group(1)
+                        value = value[: source_key_match.start()]
+                    yield stanza, name, value, source_key
+                elif name.upper().startswith("REPORT-"):
+                    for transform_name in (each.strip() for each in value.split(",")):
+                        transform = self.engine.transforms.get(transform_name) or {}
+                        if "REGEX" in transform and "DELIMS" not in transform:
+                            yield (
+                                stanza,
+                                "{}::{}".format(name, transform_name),
+                                transform["REGEX"].strip(),
+                                transform.get("SOURCE_KEY", "").strip() or None,
+                            )
+
+    def get_stanza_events(self, stanza):
+        """
+        Returns the generated events of a props.conf stanza, the events of the
+        last stanza are kept for its other regexes
+        """
+        if self._stanza_events is None or self._stanza_events[0] != stanza:
+            if stanza.startswith("source::"):
+                stanza_type = "source"
+                match = get_source_regex(stanza[len("source::") :]).match
+            else:
+                stanza_type, match = "sourcetype", stanza.__eq__
+            events = list(
+                OfflineFieldChecker.select_stanza_events(
+                    self.tokenized_events, stanza_type, match
+                )
+            )
+            self._stanza_events = stanza, events
+        return self._stanza_events[1]
+
+    def get_texts(self, stanza, source_key):
+        """
+        Returns the distinct texts a regex is applied to in the events of
+        its stanza, at most max_events of them from the shortest to the longest
+        """
+        texts = set()
+        for event in self.get_stanza_events(stanza):
+            if not source_key or source_key == "_raw":
+                texts.add(event.event)
+                continue
+            fields = self.engine.extract(
+                event.event,
+                OfflineFieldChecker.get_sourcetype(event),
+                source=event.metadata.get("source"),
+                host=event.metadata.get("host"),
+                index=event.metadata.get("index", "main"),
+            )
+            texts.update(OfflineFieldEngine._get_sources(fields, source_key) or [])
+        texts = sorted(texts, key=lambda text: (len(text), text))
+        if len(texts) > self.max_events > 1:
+            step = (len(texts) - 1) / (self.max_events - 1)
+            texts = [
+                texts[int(round(index * step))] for index in range(self.max_events)
+            ]
+        return texts
+
+    def profile(self):
+        """
+        Times every regex of the add-on
+
+        Returns:
+            list: RegexProfile of every regex, ranked from the worst
+        """
+        profiles = []
+        for stanza, name, regex, source_key in self.get_regexes():
+            profile = RegexProfile(stanza, name, regex)
+            profiles.append(profile)
+            try:
+                converted = convert_regex(regex)
+                re.compile(converted)
+            except re.error as error:
+                profile.error = str(error)
+                continue
+            texts = self.get_texts(stanza, source_key)
+            if texts:
+                LOGGER.info("Profiling %s of %s", name, stanza)
+                self.run(profile, converted, texts)
+        profiles.sort(key=RegexProfile.sort_key)
+        return profiles
+
+    def run(self, profile, regex, texts):
+        """
+        Times a regex in a child process, stopped after the timeout.
+        Without the fork start method, the regex is timed in this process.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            messages = []
+            profile_regex(messages.append, regex, texts, self.repeat)
+            for message in messages[:-1]:
+                profile.add(message)
+            return
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_profile_regex_process,
+            args=(sender, regex, texts, self.repeat),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not receiver.poll(remaining):
+                    profile.timed_out = True
+                    LOGGER.warning(
+                        "%s of %s was not profiled in %ss",
+                        profile.name,
+                        profile.stanza,
+                        self.timeout,
+                    )
+                    break
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    profile.error = "the profiling process exited"
+                    break
+                if message[0] == "done":
+                    break
+                profile.add(message)
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            receiver.close()
+
+    def write_report(self, profiles, file_path):
+        """
+        Writes the ranked profiles in a markdown file
+
+        Args:
+            profiles (list): RegexProfile ranked by profile()
+            file_path (str): Path of the report
+        """
+
+        def micro_seconds(seconds):
+            return "{:.1f}".format(seconds * 1e6) if seconds is not None else "-"
+
+        lines = [
+            "# Regex profile",
+            "",
+            "Timings in microseconds on the generated events. The growth exponent k"
+            " is measured on the slowest event made up to {} times longer, time ~"
+            " length ** k; above {} the regex is flagged as super-linear.".format(
+                GROWTH_FACTORS[-1], SUPER_LINEAR_EXPONENT
+            ),
+            "",
+            "| Rank | Stanza | Extraction | Events | p50 | p99 | Max | Growth exponent | Flag | Regex |",
+            "| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |",
+        ]
+        for rank, profile in enumerate(profiles, 1):
+            exponent = profile.exponent
+            lines.append(
+                "| {} | {} | {} | {} | {} | {} | {} | {} | {} | `` {} `` |".format(
+                    rank,
+                    profile.stanza,
+                    profile.name,
+                    len(profile.timings),
+                    micro_seconds(profile.p50),
+                    micro_seconds(profile.p99),
+                    micro_seconds(percentile([s for _, s in profile.timings], 100)),
+                    "{:.2f}".format(exponent) if exponent is not None else "-",
+                    profile.get_flag(self.timeout),
+                    profile.regex.replace("|", "\\|"),
+                )
+            )
+        with open(file_path, "w") as report_file:
+            report_file.write("\n".join(lines) + "\n")
+        flagged = [profile for profile in profiles if profile.super_linear]
+        for profile in flagged:
+            LOGGER.warning(
+                "%s of %s is %s",
+                profile.name,
+                profile.stanza,
+                profile.get_flag(self.timeout),
+            )
+        LOGGER.info(
+            "Profiled %d regexes, %d flagged, report written in %s",
+            len(profiles),
+            len(flagged),
+            file_path,
+        )
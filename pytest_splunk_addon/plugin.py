@@ -19,14 +19,17 @@ import pytest
 
 from .app_test_generator import AppTestGenerator
 from .sample_generation.sample_xdist_generator import SampleXdistGenerator
+from .offline_engine import OfflineFieldEngine, RegexProfiler
 import traceback
 from .cim_compliance import CIMReportPlugin
 from filelock import FileLock
-from .addon_parser.parser_cache import ParserCache
+from .addon_parser.parser_cache import ParserCache, get_addon_content_hash
 
 LOG_FILE = "pytest_splunk_addon.log"
 
 test_generator = None
+# Events file generated by the pytest-xdist controller for all the workers
+controller_events_file = None
 
 
 def pytest_configure(config):
@@ -92,6 +95,10 @@ def pytest_configure(config):
         "markers",
         "splunk_searchtime_requirements: Test an requirement test only  is mapped with only one data models",
     )
+    config.addinivalue_line(
+        "markers",
+        "splunk_offline_fields: Test search time fields offline, without Splunk",
+    )
     config.addinivalue_line(
         "markers",
         "splunk_requirements_unit: Test checking if all fields for datamodel are defined in cim_fields and missing_recommended_fields",
@@ -113,15 +120,64 @@ def pytest_unconfigure(config):
     if markdown:
         del config._markdown
         config.pluginmanager.unregister(markdown)
+    if controller_events_file and os.path.exists(controller_events_file):
+        os.remove(controller_events_file)
 
 
-def pytest_sessionstart(session):
-    global test_generator
-    SampleXdistGenerator.event_path = session.config.getoption("event_path")
+def configure_sample_generation(config):
+    """
+    Set the options of the sample generation on SampleXdistGenerator
+    """
+    SampleXdistGenerator.event_path = config.getoption("event_path")
     SampleXdistGenerator.event_stored = False
-    SampleXdistGenerator.tokenized_event_source = session.config.getoption(
+    SampleXdistGenerator.tokenized_event_source = config.getoption(
         "tokenized_event_source"
     ).lower()
+    SampleXdistGenerator.generation_seed = config.getoption("generation_seed", None)
+    SampleXdistGenerator.event_store_dir = config.getoption(
+        "event_store_dir", ".event_store"
+    )
+    SampleXdistGenerator.event_log_format = config.getoption("event_log_format", "json")
+    SampleXdistGenerator.event_log_compress = config.getoption(
+        "event_log_compress", False
+    )
+    SampleXdistGenerator.event_log_changed_only = config.getoption(
+        "event_log_changed_only", False
+    )
+    SampleXdistGenerator.events_file = getattr(config, "workerinput", {}).get(
+        "psa_events_file"
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    With pytest-xdist, generate the tokenized events once in the controller
+    and send the path of the events file to the workers, instead of the first
+    worker generating them while the other workers wait for it.
+    """
+    global controller_events_file
+    config = node.config
+    if not config.getoption("splunk_app", None):
+        return
+    if controller_events_file is None:
+        configure_sample_generation(config)
+        file_path = os.path.abspath(
+            "{}_controller_events".format(node.workerinput["testrunuid"])
+        )
+        sample_generator = SampleXdistGenerator(
+            config.getoption("splunk_app"),
+            config.getoption("splunk_ep"),
+            config.getoption("splunk_data_generator"),
+        )
+        sample_generator.write_events_file(file_path, config.getoption("store_events"))
+        controller_events_file = file_path
+    node.workerinput["psa_events_file"] = controller_events_file
+
+
+def pytest_sessionstart(session):
+    global test_generator
+    configure_sample_generation(session.config)
     if (
         SampleXdistGenerator.tokenized_event_source == "store_new"
         and session.config.getoption("ingest_events").lower()
@@ -134,10 +190,76 @@ def pytest_sessionstart(session):
         store_events = session.config.getoption("store_events")
         sample_generator = SampleXdistGenerator(app_path, config_path)
         sample_generator.get_samples(store_events)
+    if (
+        session.config.getoption("regex_profile", None)
+        and session.config.getoption("splunk_app", None)
+        and not hasattr(session.config, "workerinput")
+    ):
+        profile_regexes(session.config)
+    if session.config.getoption("parser_cache_dir", None):
+        enable_persistent_parser_cache(session.config)
     if session.config.getoption("splunk_app", None):
         test_generator = AppTestGenerator(session.config)
 
 
+def profile_regexes(config):
+    """
+    Time the EXTRACT and REPORT regexes of the add-on on the generated events
+    and write the ranked report in --regex-profile, without Splunk
+    """
+    app_path = config.getoption("splunk_app")
+    sample_generator = SampleXdistGenerator(
+        app_path,
+        config.getoption("splunk_ep"),
+        config.getoption("splunk_data_generator"),
+    )
+    store_sample = sample_generator.get_samples(config.getoption("store_events"))
+    regex_profiler = RegexProfiler(
+        OfflineFieldEngine(app_path),
+        store_sample.get("tokenized_events"),
+        timeout=config.getoption("regex_profile_timeout"),
+    )
+    regex_profiler.write_report(
+        regex_profiler.profile(), config.getoption("regex_profile")
+    )
+
+
+def enable_persistent_parser_cache(config):
+    """
+    Keep the parsed configuration in --parser-cache-dir across sessions.
+    The tests generated from the tokenized events are only kept when the events
+    are pregenerated, as newly generated events differ in every session.
+    """
+    pregenerated = SampleXdistGenerator.tokenized_event_source == "pregenerated"
+    extra_dirs = []
+    if pregenerated:
+        # The CIM tests are generated from the data models
+        data_model_path = config.getoption("splunk_dm_path")
+        if not data_model_path:
+            from splunk_cim_models import DATA_MODELS_PATH
+
+            data_model_path = DATA_MODELS_PATH
+        extra_dirs.append(data_model_path)
+    content_hash = get_addon_content_hash(
+        config.getoption("splunk_app"),
+        config.getoption("splunk_data_generator"),
+        extra_files=[SampleXdistGenerator.event_path] if pregenerated else [],
+        extra_values=[
+            SampleXdistGenerator.tokenized_event_source,
+            config.getoption("splunk_ep"),
+            config.getoption("splunk_dm_path"),
+            config.getoption("field_bank", False),
+            config.getoption("store_events"),
+        ],
+        extra_dirs=extra_dirs,
+    )
+    ParserCache.enable_persistent_cache(
+        config.getoption("parser_cache_dir"),
+        content_hash,
+        persist_event_keys=pregenerated,
+    )
+
+
 def pytest_generate_tests(metafunc):
     """
     Parse the fixture dynamically.
@@ -0,0 +1,273 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Writes the tokenized events stored with --store-events, one file per sample.
+
+The events of a sample are serialized one at a time and streamed to the file,
+the samples are written in parallel. The formats are:
+
+* json: ``{"<sample_name>": {"metadata": {...}, "events": [{...}, ...]}}``
+* jsonl: a first line ``{"sample_name": ..., "metadata": {...}}`` followed by
+  one line per event
+
+A manifest in the directory keeps a hash of the content of every file, so the
+files of the samples which did not change can be left as they are.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+EVENT_LOG_FORMATS = ("json", "jsonl")
+MANIFEST_FILE = ".manifest.json"
+EVENT_LOG_WRITER_THREADS = 4
+
+
+class EventLogWriter:
+    """
+    Streams the tokenized events of each sample to its own file
+
+    Args:
+        directory (str): Directory to write the files in
+        splunk_ep (bool): Whether the unique identifier of the events is written
+        event_format (str): One of EVENT_LOG_FORMATS
+        compress (bool): Whether the files are compressed with gzip
+        changed_only (bool): Whether only the files whose content changed are written
+        max_workers (int): Number of files written at the same time
+    """
+
+    def __init__(
+        self,
+        directory,
+        splunk_ep=False,
+        event_format="json",
+        compress=False,
+        changed_only=False,
+        max_workers=EVENT_LOG_WRITER_THREADS,
+    ):
+        if event_format not in EVENT_LOG_FORMATS:
+            raise Exception(
+                "Invalid event log format '{}', expected one of {}".format(
+                    event_format, ", ".join(EVENT_LOG_FORMATS)
+                )
+            )
+        self.directory = directory
+        self.splunk_ep = splunk_ep
+        self.event_format = event_format
+        self.compress = compress
+        self.changed_only = changed_only
+        self.max_workers = max_workers
+
+    def write(self, tokenized_events):
+        """
+        Write the events of every sample to its file
+
+        Args:
+            tokenized_events (iterable): tokenized events, a list or IndexedEvents
+
+        Returns:
+            list: names of the files written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = self._read_manifest()
+        samples = self.get_sample_events(tokenized_events)
+        written = []
+        if samples:
+            with ThreadPoolExecutor(
+                max_workers=max(min(self.max_workers, len(samples)), 1)
+            ) as executor:
+                results = executor.map(
+                    lambda sample: self.write_sample(
+                        sample[0],
+                        sample[1],
+                        manifest.get(self.get_file_name(sample[0])),
+                    ),
+                    samples.items(),
+                )
+                for file_name, digest, changed in results:
+                    manifest[file_name] = digest
+                    if changed:
+                        written.append(file_name)
+        self._write_manifest(manifest)
+        LOGGER.info(
+            "Stored the events of %d samples in %s, %d files written",
+            len(samples),
+            self.directory,
+            len(written),
+        )
+        return written
+
+    @staticmethod
+    def get_sample_events(tokenized_events):
+        """
+        Group the events by sample, in the order of the first event of each sample.
+        The events of an indexed events file are only read when their sample is written.
+
+        Returns:
+            OrderedDict: sample name to a function returning its events
+        """
+        if hasattr(tokenized_events, "get_sample_events"):
+            return OrderedDict(
+                (sample_name, partial(tokenized_events.get_sample_events, sample_name))
+                for sample_name in tokenized_events.sample_names
+            )
+        samples = OrderedDict()
+        for event in tokenized_events:
+            samples.setdefault(event.sample_name, []).append(event)
+        return OrderedDict(
+            (sample_name, partial(list, events))
+            for sample_name, events in samples.items()
+        )
+
+    def get_file_name(self, sample_name):
+        """
+        Name of the file of a sample
+        """
+        return "{}.{}{}".format(
+            sample_name, self.event_format, ".gz" if self.compress else ""
+        )
+
+    def write_sample(self, sample_name, get_events, previous_digest=None):
+        """
+        Write the events of one sample, unless changed_only is set and the
+        content is the one the file was last written with.
+
+        Args:
+            sample_name (str): Name of the sample
+            get_events (callable): Returns the events of the sample
+            previous_digest (str): Hash of the content the file was last written with
+
+        Returns:
+            tuple: file name, hash of the content and whether the file was written
+        """
+        file_name = self.get_file_name(sample_name)
+        file_path = os.path.join(self.directory, file_name)
+        events = get_events()
+        if self.changed_only and previous_digest and os.path.exists(file_path):
+            digest = hashlib.sha256()
+            for chunk in self.iter_chunks(sample_name, events):
+                digest.update(chunk.encode("utf-8"))
+            if digest.hexdigest() == previous_digest:
+                return file_name, previous_digest, False
+
+        digest = hashlib.sha256()
+        temp_path = "{}.{}.tmp".format(file_path, os.getpid())
+        try:
+            with open(temp_path, "wb") as raw_file:
+                # mtime=0 keeps the compressed file the same for the same events
+                file_obj = (
+                    gzip.GzipFile(fileobj=raw_file, mode="wb", mtime=0)
+                    if self.compress
+                    else raw_file
+                )
+                with file_obj:
+                    for chunk in self.iter_chunks(sample_name, events):
+                        data = chunk.encode("utf-8")
+                        digest.update(data)
+                        file_obj.write(data)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return file_name, digest.hexdigest(), True
+
+    def iter_chunks(self, sample_name, events):
+        """
+        Yields the content of the file of a sample, one event at a time
+
+        Args:
+            sample_name (str): Name of the sample
+            events (list): tokenized events of the sample
+        """
+        dumps = partial(json.dumps, separators=(",", ":"))
+        metadata = self.get_metadata(events[0]) if events else {}
+        if self.event_format == "jsonl":
+            yield dumps({"sample_name": sample_name, "metadata": metadata}) + "\n"
+            for event in events:
+                yield dumps(self.get_event(event)) + "\n"
+            return
+        yield '{{{}:{{"metadata":{},"events":['.format(
+            dumps(sample_name), dumps(metadata)
+        )
+        for index, event in enumerate(events):
+            yield ("," if index else "") + dumps(self.get_event(event))
+        yield "]}}"
+
+    @staticmethod
+    def get_metadata(event):
+        """
+        Metadata of a sample, from its first event
+
+        Args:
+            event (SampleEvent): first event of the sample
+        """
+        if event.metadata.get("input_type") not in [
+            "modinput",
+            "windows_input",
+        ]:
+            sample_multiplication = int(event.metadata.get("sample_count") or 1)
+            expected_count = (
+                int(event.metadata.get("expected_event_count")) * sample_multiplication
+            )
+        else:
+            expected_count = event.metadata.get("expected_event_count")
+        return {
+            "host": event.metadata.get("host"),
+            "source": event.metadata.get("source"),
+            "sourcetype": event.metadata.get("sourcetype"),
+            "timestamp_type": event.metadata.get("timestamp_type"),
+            "input_type": event.metadata.get("input_type"),
+            "expected_event_count": expected_count,
+            "index": event.metadata.get("index", "main"),
+        }
+
+    def get_event(self, event):
+        """
+        Stored fields of an event, with its unique identifier with splunk_ep
+
+        Args:
+            event (SampleEvent): tokenized event
+        """
+        sample_event = {
+            "event": event.event,
+            "key_fields": event.key_fields,
+            "time_values": event.time_values,
+            "requirement_test_data": event.requirement_test_data,
+        }
+        if self.splunk_ep:
+            sample_event["unique_identifier"] = event.unique_identifier
+        return sample_event
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE)) as file_obj:
+                return json.load(file_obj)
+        except (IOError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        temp_path = "{}.{}.tmp".format(manifest_path, os.getpid())
+        with open(temp_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=1, sort_keys=True)
+        os.replace(temp_path, manifest_path)
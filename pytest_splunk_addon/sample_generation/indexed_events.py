@@ -0,0 +1,199 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Chunked and indexed on-disk format for the tokenized events shared between
+the pytest-xdist workers.
+
+The events are pickled in chunks of consecutive events of the same sample,
+followed by an index with the conf name and the chunks (sample name, byte
+offset, length, event count and the sourcetypes and sources of the events)
+and the offset of that index. Workers
+memory-map the file and unpickle one chunk at a time, so they do not each
+hold a copy of all events.
+
+Layout::
+
+    MAGIC | chunk | chunk | ... | pickled index | index offset (8 bytes)
+"""
+import logging
+import mmap
+import os
+import pickle
+import struct
+from typing import Iterator, List
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+MAGIC = b"PSAEVENTS2\n"
+FOOTER = struct.Struct(">Q")
+EVENTS_CHUNK_SIZE = 500
+# Metadata of the events listed for each chunk in the index
+INDEXED_METADATA = ("sourcetype", "sourcetype_to_search", "source")
+
+
+class IndexedEvents:
+    """
+    Lazy view of the tokenized events written by IndexedEvents.write.
+    Only the index is loaded, the events are read from the file on iteration.
+
+    Args:
+        file_path (str): Path to the indexed events file
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "rb") as file_obj:
+            if file_obj.read(len(MAGIC)) != MAGIC:
+                raise Exception("{} is not an indexed events file".format(file_path))
+            file_obj.seek(-FOOTER.size, os.SEEK_END)
+            index_end = file_obj.tell()
+            (index_offset,) = FOOTER.unpack(file_obj.read(FOOTER.size))
+            file_obj.seek(index_offset)
+            index = pickle.loads(file_obj.read(index_end - index_offset))
+        self.conf_name = index["conf_name"]
+        self.chunks = index["chunks"]
+
+    @classmethod
+    def write(
+        cls,
+        file_path: str,
+        conf_name: str,
+        tokenized_events,
+        chunk_size: int = EVENTS_CHUNK_SIZE,
+    ) -> "IndexedEvents":
+        """
+        Write the tokenized events to an indexed events file.
+        The file is written next to its destination and then moved in place,
+        so a partially written file is never read.
+
+        Args:
+            file_path (str): Path to the indexed events file
+            conf_name (str): Name of the conf the events were generated from
+            tokenized_events (iterable): tokenized events in the order to read them back
+            chunk_size (int): maximum number of events in one chunk
+
+        Returns:
+            IndexedEvents: view of the written file
+        """
+        chunks = []
+        temp_path = "{}.{}.tmp".format(file_path, os.getpid())
+
+        def write_chunk(file_obj, sample_name, events):
+            data = pickle.dumps(events, protocol=pickle.HIGHEST_PROTOCOL)
+            metadata = {
+                key: {event.metadata.get(key) for event in events}
+                for key in INDEXED_METADATA
+            }
+            chunks.append(
+                (sample_name, file_obj.tell(), len(data), len(events), metadata)
+            )
+            file_obj.write(data)
+
+        try:
+            with open(temp_path, "wb") as file_obj:
+                file_obj.write(MAGIC)
+                sample_name, events = None, []
+                for event in tokenized_events:
+                    if events and (
+                        event.sample_name != sample_name or len(events) >= chunk_size
+                    ):
+                        write_chunk(file_obj, sample_name, events)
+                        events = []
+                    sample_name = event.sample_name
+                    events.append(event)
+                if events:
+                    write_chunk(file_obj, sample_name, events)
+                index_offset = file_obj.tell()
+                pickle.dump(
+                    {"conf_name": conf_name, "chunks": chunks},
+                    file_obj,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+                file_obj.write(FOOTER.pack(index_offset))
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        LOGGER.info(
+            "Stored %d tokenized events in %d chunks at %s",
+            sum(chunk[3] for chunk in chunks),
+            len(chunks),
+            file_path,
+        )
+        return cls(file_path)
+
+    @property
+    def sample_names(self) -> List[str]:
+        """
+        Names of the samples in the file, in the order of their first event
+        """
+        return list(dict.fromkeys(chunk[0] for chunk in self.chunks))
+
+    def get_sample_events(self, sample_name: str) -> List:
+        """
+        Read only the events of one sample
+
+        Args:
+            sample_name (str): Name of the sample
+
+        Returns:
+            list: tokenized events of the sample
+        """
+        return list(
+            self._read_chunks(
+                [chunk for chunk in self.chunks if chunk[0] == sample_name]
+            )
+        )
+
+    def get_metadata_events(self, keys, match) -> Iterator:
+        """
+        Read only the chunks with an event whose value of one of the metadata
+        keys matches. The other events of these chunks are read as well.
+
+        Args:
+            keys (tuple): Metadata keys, among INDEXED_METADATA
+            match (callable): Whether a metadata value, possibly None, matches
+
+        Returns:
+            iterator: tokenized events of the matching chunks
+        """
+        return self._read_chunks(
+            [
+                chunk
+                for chunk in self.chunks
+                if any(match(value) for key in keys for value in chunk[4][key])
+            ]
+        )
+
+    def _read_chunks(self, chunks) -> Iterator:
+        if not chunks:
+            return
+        with open(self.file_path, "rb") as file_obj, mmap.mmap(
+            file_obj.fileno(), 0, access=mmap.ACCESS_READ
+        ) as events_map:
+            for _, offset, length, _, _ in chunks:
+                yield from pickle.loads(events_map[offset : offset + length])
+
+    def __iter__(self) -> Iterator:
+        return self._read_chunks(self.chunks)
+
+    def __len__(self) -> int:
+        return sum(chunk[3] for chunk in self.chunks)
+
+    def __reduce__(self):
+        # Pickled as the plain list, e.g. when saved for --tokenized-event-source=store_new
+        return list, (list(self),)
@@ -0,0 +1,187 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Process-wide cache of the replacement files used by the file, mvfile and
+lookup tokens, so that a file is read and split once instead of once per
+event and token.
+"""
+import logging
+import os
+from collections import OrderedDict
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+# Size of the replacement files kept in memory, evicted least recently used
+REPLACEMENT_FILE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ReplacementFile(object):
+    """
+    Content of a replacement file, split lazily into the forms the rules use.
+
+    Args:
+        text (str): Content of the file
+    """
+
+    def __init__(self, text):
+        self._raw_lines = text.split("\n")
+        self._values = None
+        self._lines = None
+        self._rows = None
+        self._data_lines = None
+        self._data_rows = None
+        self._header_index = None
+
+    @property
+    def values(self):
+        """
+        Stripped lines of the file, used as values of file tokens
+        """
+        if self._values is None:
+            self._values = [each.strip() for each in self._raw_lines if each]
+        return self._values
+
+    @property
+    def lines(self):
+        """
+        Non-empty stripped lines of the file
+        """
+        if self._lines is None:
+            self._lines = [each.strip() for each in self._raw_lines if each.strip()]
+        return self._lines
+
+    @property
+    def rows(self):
+        """
+        Columns of the non-empty lines of the file
+        """
+        if self._rows is None:
+            self._rows = [line.split(",") for line in self.lines]
+        return self._rows
+
+    @property
+    def header(self):
+        """
+        First line of a lookup file
+        """
+        if len(self._raw_lines) > 1:
+            return self._raw_lines[0] + "\n"
+        return self._raw_lines[0]
+
+    @property
+    def data_lines(self):
+        """
+        Non-empty stripped lines of a lookup file, after its header
+        """
+        if self._data_lines is None:
+            self._data_lines = [
+                each.strip() for each in self._raw_lines[1:] if each.strip()
+            ]
+        return self._data_lines
+
+    @property
+    def data_rows(self):
+        """
+        Columns of the non-empty lines of a lookup file, after its header
+        """
+        if self._data_rows is None:
+            self._data_rows = [line.split(",") for line in self.data_lines]
+        return self._data_rows
+
+    def column_index(self, column):
+        """
+        Returns the index of a column of a lookup file
+
+        Args:
+            column (str): Name of the column in the header
+
+        Raises:
+            ValueError: If the column is not in the header
+        """
+        if self._header_index is None:
+            self._header_index = {}
+            for index, name in enumerate(self.header.strip().split(",")):
+                self._header_index.setdefault(name, index)
+        try:
+            return self._header_index[column]
+        except (KeyError, TypeError):
+            raise ValueError("'{}' is not in the header".format(column))
+
+
+class ReplacementFileCache(object):
+    """
+    LRU cache of the replacement files, keyed by path. A file is read again
+    when its modification time or size changed.
+
+    Args:
+        max_bytes (int): Total size of the files kept in memory
+    """
+
+    def __init__(self, max_bytes=REPLACEMENT_FILE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+        self._files = OrderedDict()
+
+    def get(self, file_path):
+        """
+        Returns the parsed replacement file, reading it only if it changed.
+
+        Args:
+            file_path (str): Path of the replacement file
+
+        Raises:
+            IOError: If the file can not be read
+        """
+        signature = self._get_signature(file_path)
+        cached = self._files.get(file_path)
+        if cached and cached[0] == signature:
+            self._files.move_to_end(file_path)
+            return cached[1]
+        if cached:
+            # The file changed since it was cached
+            del self._files[file_path]
+            self.cached_bytes -= cached[0][1]
+        with open(file_path, "r") as _file:
+            replacement_file = ReplacementFile(_file.read())
+        size = signature[1]
+        if size <= self.max_bytes:
+            self._files[file_path] = (signature, replacement_file)
+            self.cached_bytes += size
+            while self.cached_bytes > self.max_bytes:
+                _, ((_, size), _) = self._files.popitem(last=False)
+                self.cached_bytes -= size
+        else:
+            LOGGER.info(
+                "Replacement file %s is too large to be cached, size=%d",
+                file_path,
+                size,
+            )
+        return replacement_file
+
+    @staticmethod
+    def _get_signature(file_path):
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def clear(self):
+        """
+        Removes all the cached files
+        """
+        self._files.clear()
+        self.cached_bytes = 0
+
+
+replacement_files = ReplacementFileCache()
@@ -18,14 +18,26 @@ Provides Rules for all possible replacements for tokens.
 """
 import re
 import string
-import uuid
 
 from collections import namedtuple
-from datetime import datetime, timezone
-from faker import Faker
-from random import uniform, randint, choice
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from random import randint, choice
 from time import mktime
 from .time_parser import time_parse
+from .replacement_file import replacement_files
+from .value_pool import (
+    ValuePool,
+    get_faker,
+    random_choices,
+    random_floats,
+    random_guids,
+    random_hex,
+    random_ints,
+    random_ipv4s,
+    random_ipv6s,
+    random_macs,
+)
 import os
 import random
 
@@ -70,6 +82,8 @@ class Rule:
     user_header = ["name", "email", "domain_user", "distinquised_name"]
     src_header = ["host", "ipv4", "ipv6", "fqdn"]
     token_value = namedtuple("token_value", ["key", "value"])
+    # Whether the rule takes its values from the global host, ip and user counters
+    uses_counters = False
 
     def __init__(self, token, psa_data_params=None, sample_path=None):
         self.token = token["token"]
@@ -78,8 +92,31 @@ class Rule:
         self.field = token.get("field", self.token.strip("#"))
         self.psa_data_params = psa_data_params
         self.sample_path = sample_path
-        self.fake = Faker()
+        self.fake = get_faker()
         self.file_count = 0
+        self.value_pool = None
+
+    def __getstate__(self):
+        # The shared Faker instance is not sent to the worker processes
+        state = self.__dict__.copy()
+        state.pop("fake", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.fake = get_faker()
+
+    def draw_values(self, generate_batch, count):
+        """
+        Yields random values from the pool of the rule, which is generated in batches.
+
+        Args:
+            generate_batch (callable): Function returning a list of the given number of values
+            count (int): Number of values
+        """
+        if self.value_pool is None:
+            self.value_pool = ValuePool(generate_batch)
+        return self.value_pool.take(count)
 
     @classmethod
     def parse_rule(cls, token, psa_data_params, sample_path):
@@ -296,10 +333,11 @@ class IntRule(Rule):
         if limits_match:
             lower_limit, upper_limit = limits_match.groups()
             if self.replacement_type == "random":
-                for _ in range(token_count):
-                    yield self.token_value(
-                        *([randint(int(lower_limit), int(upper_limit))] * 2)
-                    )
+                for value in self.draw_values(
+                    partial(random_ints, int(lower_limit), int(upper_limit)),
+                    token_count,
+                ):
+                    yield self.token_value(*([value] * 2))
             else:
                 for each_int in range(int(lower_limit), int(upper_limit)):
                     yield self.token_value(*([str(each_int)] * 2))
@@ -330,18 +368,11 @@ class FloatRule(Rule):
             precision = re.search(r"\[-?\d+\.?(\d*):", self.replacement).group(1)
             if not precision:
                 precision = str(1)
-            for _ in range(token_count):
-                yield self.token_value(
-                    *(
-                        [
-                            round(
-                                uniform(float(lower_limit), float(upper_limit)),
-                                len(precision),
-                            )
-                        ]
-                        * 2
-                    )
-                )
+            for value in self.draw_values(
+                partial(random_floats, float(lower_limit), float(upper_limit)),
+                token_count,
+            ):
+                yield self.token_value(*([round(value, len(precision))] * 2))
         else:
             raise_warning(
                 "Non-supported format: '{}' in stanza '{}'.\n i.e float[0.00:70.00]".format(
@@ -369,8 +400,10 @@ class ListRule(Rule):
             value_list = eval(value_list_str)
 
             if self.replacement_type == "random":
-                for _ in range(token_count):
-                    yield self.token_value(*([str(choice(value_list))] * 2))
+                for value in self.draw_values(
+                    partial(random_choices, value_list), token_count
+                ):
+                    yield self.token_value(*([str(value)] * 2))
             else:
                 for each_value in value_list:
                     yield self.token_value(*([str(each_value)] * 2))
@@ -432,18 +465,13 @@ class FileRule(Rule):
 
         else:
             try:
-                with open(relative_file_path) as f:
-                    txt = f.read()
-                    lines = [each.strip() for each in txt.split("\n") if each]
-                    if (
-                        self.replacement_type == "random"
-                        or self.replacement_type == "file"
-                    ):
-                        for _ in range(token_count):
-                            yield self.token_value(*([choice(lines)] * 2))
-                    elif self.replacement_type == "all":
-                        for each_value in lines:
-                            yield self.token_value(*([each_value] * 2))
+                lines = replacement_files.get(relative_file_path).values
+                if self.replacement_type == "random" or self.replacement_type == "file":
+                    for _ in range(token_count):
+                        yield self.token_value(*([choice(lines)] * 2))
+                elif self.replacement_type == "all":
+                    for each_value in lines:
+                        yield self.token_value(*([each_value] * 2))
             except IOError:
                 LOGGER.warning("File not found : {}".format(relative_file_path))
 
@@ -502,56 +530,51 @@ class FileRule(Rule):
             index (int): index value mentioned in file_path i.e. <file_path>:<index>
             token_count (int): No. of token in sample event where rule is applicable
         """
-        all_data = []
         try:
-            with open(file_path, "r") as _file:
-                selected_sample_lines = _file.readlines()
-                for i in selected_sample_lines:
-                    if i.strip() != "":
-                        all_data.append(i.strip())
+            replacement_file = replacement_files.get(file_path)
+            all_data = replacement_file.lines
 
-                if (
-                    hasattr(sample, "replacement_map")
-                    and file_path in sample.replacement_map
-                ):
-                    index = int(index)
-                    file_values = sample.replacement_map[file_path]["data"][
-                        self.file_count
-                    ].split(",")
-                    if sample.replacement_map[file_path].get("find_all"):
-                        # if condition to increase the line no. of sample data
-                        # when the replacement_type = all provided in token for indexed file
-                        if self.file_count == len(all_data) - 1:
-                            # reset the file count when count reaches to pick value corresponding to
-                            # length of the sample data
-                            self.file_count = 0
-                        else:
-                            self.file_count += 1
-                    for _ in range(token_count):
+            if (
+                hasattr(sample, "replacement_map")
+                and file_path in sample.replacement_map
+            ):
+                index = int(index)
+                file_values = sample.replacement_map[file_path]["data"][
+                    self.file_count
+                ].split(",")
+                if sample.replacement_map[file_path].get("find_all"):
+                    # if condition to increase the line no. of sample data
+                    # when the replacement_type = all provided in token for indexed file
+                    if self.file_count == len(all_data) - 1:
+                        # reset the file count when count reaches to pick value corresponding to
+                        # length of the sample data
+                        self.file_count = 0
+                    else:
+                        self.file_count += 1
+                for _ in range(token_count):
+                    yield file_values[index - 1]
+            else:
+                if self.replacement_type == "all":
+                    sample.__setattr__(
+                        "replacement_map",
+                        {file_path: {"data": all_data, "find_all": True}},
+                    )
+                    for file_values in replacement_file.rows:
                         yield file_values[index - 1]
                 else:
-                    if self.replacement_type == "all":
+                    random_line = random.randint(0, len(all_data) - 1)
+                    if hasattr(sample, "replacement_map"):
+                        sample.replacement_map.update(
+                            {file_path: {"data": [all_data[random_line]]}}
+                        )
+                    else:
                         sample.__setattr__(
                             "replacement_map",
-                            {file_path: {"data": all_data, "find_all": True}},
+                            {file_path: {"data": [all_data[random_line]]}},
                         )
-                        for i in all_data:
-                            file_values = i.split(",")
-                            yield file_values[index - 1]
-                    else:
-                        random_line = random.randint(0, len(all_data) - 1)
-                        if hasattr(sample, "replacement_map"):
-                            sample.replacement_map.update(
-                                {file_path: {"data": [all_data[random_line]]}}
-                            )
-                        else:
-                            sample.__setattr__(
-                                "replacement_map",
-                                {file_path: {"data": [all_data[random_line]]}},
-                            )
-                        file_values = all_data[random_line].split(",")
-                        for _ in range(token_count):
-                            yield file_values[index - 1]
+                    file_values = replacement_file.rows[random_line]
+                    for _ in range(token_count):
+                        yield file_values[index - 1]
         except IndexError:
             LOGGER.error(
                 f"Index for column {index} in replacement"
@@ -570,25 +593,17 @@ class FileRule(Rule):
             index (int): index value mentioned in file_path i.e. <file_path>:<index>
             token_count (int): No. of token in sample event where rule is applicable
         """
-        all_data = []
-        header = ""
         try:
-            with open(file_path, "r") as _file:
-                header = next(_file)
-                for line in _file:
-                    if line.strip() != "":
-                        all_data.append(line.strip())
+            replacement_file = replacement_files.get(file_path)
+            header = replacement_file.header
+            all_data = replacement_file.data_lines
             for _ in range(token_count):
                 if (
                     hasattr(sample, "replacement_map")
                     and file_path in sample.replacement_map
                 ):
-                    index = (
-                        sample.replacement_map[file_path][0]
-                        .strip()
-                        .split(",")
-                        .index(index)
-                    )
+                    # The header stored in the replacement_map is the one of file_path
+                    index = replacement_file.column_index(index)
                     file_values = sample.replacement_map[file_path][1].split(",")
                     for _ in range(token_count):
                         yield file_values[index]
@@ -608,8 +623,8 @@ class FileRule(Rule):
                                 "replacement_map",
                                 {file_path: [header, all_data[self.file_count]]},
                             )
-                            index = header.strip().split(",").index(index)
-                            file_values = all_data[self.file_count].split(",")
+                            index = replacement_file.column_index(index)
+                            file_values = replacement_file.data_rows[self.file_count]
                             for _ in range(token_count):
                                 yield file_values[index]
                         else:
@@ -625,89 +640,156 @@ class FileRule(Rule):
             LOGGER.warning("File not found : {}".format(file_path))
 
 
-class TimeRule(Rule):
-    def replace(self, sample, token_count):
+class TimeSampler:
+    """
+    Time window, timezone and format of a timestamp token, resolved once for
+    the stanza so that only the random epochs are computed for each token.
+
+    Args:
+        earliest (float): Earliest epoch of the window
+        latest (float): Latest epoch of the window
+        timezone_time (str): timezone parameter of the stanza
+        replacement (str): strftime format of the token, or %s for epochs
+        invert_timezone (callable): Returns the timezone converting back to UTC
+    """
+
+    # Reference time to get the offsets the timezones are applied with
+    reference_time = datetime(2000, 1, 1)
+
+    def __init__(self, earliest, latest, timezone_time, replacement, invert_timezone):
+        self.earliest = int(earliest)
+        self.latest = int(latest)
+        self.timezone_time = timezone_time
+        self.time_parser = time_parse()
+        self.time_delta = datetime.now().timestamp() - datetime.utcnow().timestamp()
+        self.is_local = timezone_time in ["local", '"local"', "'local'"]
+        self.timezone_offset = None
+        if (
+            not self.is_local
+            and timezone_time
+            and timezone_time.strip("'").strip('"') != r"0000"
+        ):
+            self.timezone_offset = self.get_offset(timezone_time)
+        self.is_epoch = r"%s" == replacement.strip("'").strip('"')
+        self.replacement = replacement
+        self.time_format = replacement.replace(r"%e", r"%d")
+        self.invert_timezone = invert_timezone
+        self._inverted_offset = None
+
+    def get_offset(self, timezone_time):
         """
-        Returns time according to the parameters specified in the input.
+        Returns the timedelta time_parse.get_timezone_time shifts a time with
 
         Args:
-            sample (SampleEvent): Instance containing event info
-            token_count (int): No. of token in sample event where rule is applicable
+            timezone_time (str): timezone time string
         """
-        earliest = self.psa_data_params.get("earliest")
-        latest = self.psa_data_params.get("latest")
-        timezone_time = self.psa_data_params.get("timezone", "0000")
-        random_time = datetime.utcnow()
-        time_parser = time_parse()
-        time_delta = datetime.now().timestamp() - datetime.utcnow().timestamp()
-
-        if earliest != "now" and earliest is not None:
+        return (
+            self.time_parser.get_timezone_time(self.reference_time, timezone_time)
+            - self.reference_time
+        )
 
-            earliest_match = re.match(r"([+-])(\d{1,})(.*)", earliest)
-            if earliest_match:
-                sign, num, unit = earliest_match.groups()
-                earliest = time_parser.convert_to_time(sign, num, unit)
-            else:
-                raise_warning(
-                    "Invalid value found in earliest: '{}' for stanza '{}'. using earliest = now".format(
-                        earliest, sample.sample_name
-                    )
+    @property
+    def inverted_offset(self):
+        """
+        Offset converting the time of the token back to UTC
+        """
+        if self._inverted_offset is None:
+            if self.timezone_time not in (None, "0000"):
+                self._inverted_offset = self.get_offset(
+                    self.invert_timezone(self.timezone_time)
                 )
-                earliest = datetime.utcnow()
-        else:
-            earliest = datetime.utcnow()
+            else:
+                self._inverted_offset = timedelta()
+        return self._inverted_offset
 
-        if latest != "now" and latest is not None:
+    def get_time(self, epoch):
+        """
+        Returns the key and value of the token for a random epoch of the window
 
-            latest_match = re.match(r"([+-])(\d{1,})(.*)", latest)
-            if latest_match:
-                sign, num, unit = latest_match.groups()
-                latest = time_parser.convert_to_time(sign, num, unit)
-            else:
-                raise_warning(
-                    "Invalid value found in latest: '{}' for stanza '{}'. using latest = now".format(
-                        latest, sample.sample_name
-                    )
-                )
-                latest = datetime.utcnow()
-        else:
-            latest = datetime.utcnow()
+        Args:
+            epoch (int): Epoch drawn from the window
+        """
+        random_time = datetime.fromtimestamp(epoch)
+        if self.is_local:
+            random_time = random_time.replace(tzinfo=timezone.utc).astimezone(tz=None)
+        elif self.timezone_offset is not None:
+            random_time = random_time + self.timezone_offset
+
+        if self.is_epoch:
+            time_in_sec = self.replacement.replace(
+                r"%s", str(int(mktime(random_time.timetuple())))
+            )
+            return float(time_in_sec), time_in_sec
+        modified_random_time = random_time + self.inverted_offset
+        return (
+            float(mktime(modified_random_time.timetuple())) + self.time_delta,
+            random_time.strftime(self.time_format),
+        )
 
-        earliest_in_epoch = mktime(earliest.timetuple())
-        latest_in_epoch = mktime(latest.timetuple())
 
-        if earliest_in_epoch > latest_in_epoch:
+class TimeRule(Rule):
+    def __init__(self, token, psa_data_params=None, sample_path=None):
+        super().__init__(token, psa_data_params, sample_path)
+        self.time_sampler = None
+
+    def replace(self, sample, token_count):
+        """
+        Returns time according to the parameters specified in the input.
+
+        Args:
+            sample (SampleEvent): Instance containing event info
+            token_count (int): No. of token in sample event where rule is applicable
+        """
+        if self.time_sampler is None:
+            self.time_sampler = self.get_time_sampler(sample)
+        time_sampler = self.time_sampler
+
+        if time_sampler.earliest > time_sampler.latest:
             LOGGER.info("Latest time is earlier than earliest time.")
             yield self.token
-        for _ in range(token_count):
-            random_time = datetime.fromtimestamp(
-                randint(int(earliest_in_epoch), int(latest_in_epoch))
-            )
-            if timezone_time in ["local", '"local"', "'local'"]:
-                random_time = random_time.replace(tzinfo=timezone.utc).astimezone(
-                    tz=None
-                )
-
-            elif timezone_time and timezone_time.strip("'").strip('"') != r"0000":
-                random_time = time_parser.get_timezone_time(random_time, timezone_time)
+            return
+        for epoch in self.draw_values(
+            partial(random_ints, time_sampler.earliest, time_sampler.latest),
+            token_count,
+        ):
+            yield self.token_value(*time_sampler.get_time(epoch))
+
+    def get_time_sampler(self, sample):
+        """
+        Resolves the time window and timezone of the stanza.
 
-            if r"%s" == self.replacement.strip("'").strip('"'):
-                time_in_sec = self.replacement.replace(
-                    r"%s", str(int(mktime(random_time.timetuple())))
-                )
-                yield self.token_value(float(time_in_sec), time_in_sec)
+        Args:
+            sample (SampleEvent): Instance containing event info
 
-            else:
-                if timezone_time not in (None, "0000"):
-                    modified_random_time = time_parser.get_timezone_time(
-                        random_time, self.invert_timezone(timezone_time)
-                    )
+        Returns:
+            TimeSampler: sampler of the timestamps of the token
+        """
+        time_parser = time_parse()
+        window = []
+        for param in ("earliest", "latest"):
+            value = self.psa_data_params.get(param)
+            if value != "now" and value is not None:
+                time_match = re.match(r"([+-])(\d{1,})(.*)", value)
+                if time_match:
+                    sign, num, unit = time_match.groups()
+                    value = time_parser.convert_to_time(sign, num, unit)
                 else:
-                    modified_random_time = random_time
-                yield self.token_value(
-                    float(mktime(modified_random_time.timetuple())) + time_delta,
-                    random_time.strftime(self.replacement.replace(r"%e", r"%d")),
-                )
+                    raise_warning(
+                        "Invalid value found in {0}: '{1}' for stanza '{2}'. using {0} = now".format(
+                            param, value, sample.sample_name
+                        )
+                    )
+                    value = datetime.utcnow()
+            else:
+                value = datetime.utcnow()
+            window.append(mktime(value.timetuple()))
+
+        return TimeSampler(
+            *window,
+            self.psa_data_params.get("timezone", "0000"),
+            self.replacement,
+            self.invert_timezone,
+        )
 
     def invert_timezone(self, timezone_time):
         if timezone_time == "0000":
@@ -733,8 +815,8 @@ class Ipv4Rule(Rule):
             sample (SampleEvent): Instance containing event info
             token_count (int): No. of token in sample event where rule is applicable
         """
-        for _ in range(token_count):
-            yield self.token_value(*([self.fake.ipv4()] * 2))
+        for value in self.draw_values(random_ipv4s, token_count):
+            yield self.token_value(*([value] * 2))
 
 
 class Ipv6Rule(Rule):
@@ -750,8 +832,8 @@ class Ipv6Rule(Rule):
             sample (SampleEvent): Instance containing event info
             token_count (int): No. of token in sample event where rule is applicable
         """
-        for _ in range(token_count):
-            yield self.token_value(*([self.fake.ipv6()] * 2))
+        for value in self.draw_values(random_ipv6s, token_count):
+            yield self.token_value(*([value] * 2))
 
 
 class MacRule(Rule):
@@ -767,8 +849,8 @@ class MacRule(Rule):
             sample (SampleEvent): Instance containing event info
             token_count (int): No. of token in sample event where rule is applicable
         """
-        for _ in range(token_count):
-            yield self.token_value(*([self.fake.mac_address()] * 2))
+        for value in self.draw_values(random_macs, token_count):
+            yield self.token_value(*([value] * 2))
 
 
 class GuidRule(Rule):
@@ -784,8 +866,8 @@ class GuidRule(Rule):
             sample (SampleEvent): Instance containing event info
             token_count (int): No. of token in sample event where rule is applicable
         """
-        for _ in range(token_count):
-            yield self.token_value(*([str(uuid.uuid4())] * 2))
+        for value in self.draw_values(random_guids, token_count):
+            yield self.token_value(*([value] * 2))
 
 
 class UserRule(Rule):
@@ -793,6 +875,8 @@ class UserRule(Rule):
     UserRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random user replacement value from the list of values mentioned in token.
@@ -848,6 +932,8 @@ class EmailRule(Rule):
     EmailRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random email from lookups\\user_email.csv file.
@@ -884,6 +970,8 @@ class UrlRule(Rule):
     UrlRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random url replacement value from the list
@@ -982,6 +1070,8 @@ class DestRule(Rule):
     DestRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random dest replacement value from the list
@@ -1030,8 +1120,8 @@ class SrcPortRule(Rule):
             sample (SampleEvent): Instance containing event info
             token_count (int): No. of token in sample event where rule is applicable
         """
-        for _ in range(token_count):
-            yield self.token_value(*([randint(4000, 5000)] * 2))
+        for value in self.draw_values(partial(random_ints, 4000, 5000), token_count):
+            yield self.token_value(*([value] * 2))
 
 
 class DvcRule(Rule):
@@ -1039,6 +1129,8 @@ class DvcRule(Rule):
     DvcRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random dvc replacement value from the list
@@ -1078,6 +1170,8 @@ class SrcRule(Rule):
     SrcRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random src replacement value from the list
@@ -1126,8 +1220,8 @@ class DestPortRule(Rule):
             token_count (int): No. of token in sample event where rule is applicable
         """
         DEST_PORT = [80, 443, 25, 22, 21]
-        for _ in range(token_count):
-            yield self.token_value(*([choice(DEST_PORT)] * 2))
+        for value in self.draw_values(partial(random_choices, DEST_PORT), token_count):
+            yield self.token_value(*([value] * 2))
 
 
 class HostRule(Rule):
@@ -1135,6 +1229,8 @@ class HostRule(Rule):
     HostRule
     """
 
+    uses_counters = True
+
     def replace(self, sample, token_count):
         """
         Yields a random host replacement value from the list
@@ -1200,29 +1296,9 @@ class HexRule(Rule):
         if hex_match:
             hex_range = hex_match.group(1)
             if hex_range.isnumeric():
-                hex_digits = [
-                    "0",
-                    "1",
-                    "2",
-                    "3",
-                    "4",
-                    "5",
-                    "6",
-                    "7",
-                    "8",
-                    "9",
-                    "a",
-                    "b",
-                    "c",
-                    "d",
-                    "e",
-                    "f",
-                ]
-                hex_array = []
-                for _ in range(token_count):
-                    for i in range(int(hex_range)):
-                        hex_array.append(hex_digits[randint(0, 15)])
-                    hex_value = "".join(hex_array)
+                for hex_value in self.draw_values(
+                    partial(random_hex, int(hex_range)), token_count
+                ):
                     yield self.token_value(*([hex_value] * 2))
             else:
                 raise_warning(
@@ -16,8 +16,8 @@
 import re
 import logging
 from ..index_tests import key_fields
-from faker import Faker
-from copy import deepcopy
+from .value_pool import get_faker
+from functools import lru_cache
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
 host_ipv4, dvc_ipv4 = 51, 0
@@ -50,6 +50,40 @@ ip_rules = {
     },
 }
 
+# Parts of requirement_test_data updated during tokenization, the rest is
+# only read after the sample file is parsed and can be shared between events
+UPDATABLE_REQUIREMENT_FIELDS = ("cim_fields", "other_fields")
+
+
+def copy_requirement_test_data(requirement_test_data):
+    """
+    Returns a copy of the requirement test data which can be tokenized
+    without updating the original.
+
+    Args:
+        requirement_test_data (dict): Requirement test data of an event
+    """
+    if requirement_test_data is None:
+        return None
+    requirement_test_data = requirement_test_data.copy()
+    for key in UPDATABLE_REQUIREMENT_FIELDS:
+        if key in requirement_test_data:
+            requirement_test_data[key] = requirement_test_data[key].copy()
+    return requirement_test_data
+
+
+@lru_cache(maxsize=None)
+def get_token_pattern(token, flags=0):
+    """
+    Returns the compiled regex of the token, so that each token of the
+    pytest-splunk-addon-data.conf is only compiled once.
+
+    Args:
+        token (str): Token name
+        flags (int): Regex flags
+    """
+    return re.compile(token, flags)
+
 
 class SampleEvent(object):
     """
@@ -59,9 +93,32 @@ class SampleEvent(object):
         event_string (str): Event content
         metadata (dict): Contains metadata for the event
         sample_name (str): Name of the file containing this event
+        requirement_test_data (dict): Requirement test data of the event
+        stanza_metadata (dict): Metadata of the stanza the event was generated from
     """
 
-    def __init__(self, event_string, metadata, sample_name, requirement_test_data=None):
+    # replacement_map and unique_identifier are only set during tokenization
+    __slots__ = (
+        "event",
+        "key_fields",
+        "time_values",
+        "metadata",
+        "sample_name",
+        "host_count",
+        "requirement_test_data",
+        "stanza_metadata",
+        "replacement_map",
+        "unique_identifier",
+    )
+
+    def __init__(
+        self,
+        event_string,
+        metadata,
+        sample_name,
+        requirement_test_data=None,
+        stanza_metadata=None,
+    ):
         self.event = event_string
         self.key_fields = dict()
         self.time_values = list()
@@ -69,6 +126,46 @@ class SampleEvent(object):
         self.sample_name = sample_name
         self.host_count = 0
         self.requirement_test_data = requirement_test_data
+        self.stanza_metadata = stanza_metadata
+
+    def __getstate__(self):
+        """
+        Returns the attributes to pickle. The metadata is reduced to the fields
+        which differ from the stanza metadata, which is shared by reference and
+        hence pickled only once for all the events of the stanza.
+        """
+        state = {
+            attr: getattr(self, attr) for attr in self.__slots__ if hasattr(self, attr)
+        }
+        if (
+            self.stanza_metadata is not None
+            and self.metadata is not self.stanza_metadata
+        ):
+            state["metadata"] = (
+                {
+                    key: value
+                    for key, value in self.metadata.items()
+                    if self.stanza_metadata.get(key) is not value
+                },
+                [key for key in self.stanza_metadata if key not in self.metadata],
+            )
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the pickled attributes and rebuilds the metadata from the stanza metadata.
+
+        Args:
+            state (dict): Pickled attributes
+        """
+        if isinstance(state.get("metadata"), tuple):
+            overrides, removed_keys = state["metadata"]
+            metadata = {**state["stanza_metadata"], **overrides}
+            for key in removed_keys:
+                del metadata[key]
+            state = dict(state, metadata=metadata)
+        for attr, value in state.items():
+            setattr(self, attr, value)
 
     def update(self, new_event):
         """
@@ -226,7 +323,7 @@ class SampleEvent(object):
                 [ip_rules.get(rule)["ip_host"], str(addr[0]), ".", str(addr[1])]
             )
         else:
-            temp_ipv4 = Faker().ipv4()
+            temp_ipv4 = get_faker().ipv4()
             LOGGER.debug("Creating ipv4 field with value: {}".format(temp_ipv4))
             return temp_ipv4
 
@@ -255,7 +352,7 @@ class SampleEvent(object):
             ipv6 = dest_ipv6 % (int("ffffffffffffffff", 16))
             dest_ipv6 += 1
         else:
-            temp_ipv4 = Faker().ipv6()
+            temp_ipv4 = get_faker().ipv6()
             LOGGER.debug("Creating ipv6 field with value: {}".format(temp_ipv4))
             return temp_ipv4
 
@@ -280,7 +377,7 @@ class SampleEvent(object):
         Args:
             token (str): Token name
         """
-        return len(re.findall(token, self.event, flags=re.MULTILINE))
+        return len(get_token_pattern(token, re.MULTILINE).findall(self.event))
 
     def get_token_extractions_count(self, token):
         """
@@ -298,12 +395,13 @@ class SampleEvent(object):
                 *self.requirement_test_data.get("cim_fields", {}).values(),
                 *self.requirement_test_data.get("other_fields", {}).values(),
             ]
+            token_pattern = get_token_pattern(token)
             for extracted_field in field_values:
                 if isinstance(extracted_field, str):
-                    tokens_in_extractions += len(re.findall(token, extracted_field))
+                    tokens_in_extractions += len(token_pattern.findall(extracted_field))
                 elif isinstance(extracted_field, list):
                     for each_filed in extracted_field:
-                        tokens_in_extractions += len(re.findall(token, each_filed))
+                        tokens_in_extractions += len(token_pattern.findall(each_filed))
         return 1 if tokens_in_extractions > 0 else 0
 
     def replace_token(self, token, token_values):
@@ -315,32 +413,24 @@ class SampleEvent(object):
             token_values (list/str): Value(s) to be replaced in the token
         """
         # TODO: How to handle dependent Values with list of token_values
+        token_pattern = get_token_pattern(token, re.MULTILINE)
         if isinstance(token_values, list):
-            sample_tokens = re.finditer(token, self.event, flags=re.MULTILINE)
-
-            for _, token_value in enumerate(token_values):
-                try:
-                    token_value = token_value.value
-                    match_object = next(sample_tokens)
-                    match_str = (
-                        match_object.group(0)
-                        if len(match_object.groups()) == 0
-                        else match_object.group(1)
-                    )
-                    match_str = re.escape(match_str)
-                    self.event = re.sub(
-                        match_str,
-                        lambda x: str(token_value),
-                        self.event,
-                        1,
-                        flags=re.MULTILINE,
-                    )
-                except StopIteration:
-                    break
+            # Replace the matches in a single pass using their offsets
+            event_parts = []
+            position = 0
+            for match_object, token_value in zip(
+                token_pattern.finditer(self.event), token_values
+            ):
+                start, end = match_object.span(
+                    1 if token_pattern.groups and match_object.start(1) != -1 else 0
+                )
+                event_parts.append(self.event[position:start])
+                event_parts.append(str(token_value.value))
+                position = end
+            event_parts.append(self.event[position:])
+            self.event = "".join(event_parts)
         else:
-            self.event = re.sub(
-                token, lambda x: str(token_values), self.event, flags=re.MULTILINE
-            )
+            self.event = token_pattern.sub(lambda x: str(token_values), self.event)
 
     def register_field_value(self, field, token_values):
         """
@@ -376,8 +466,7 @@ class SampleEvent(object):
                 "cim_fields" in self.requirement_test_data.keys()
                 or "other_fields" in self.requirement_test_data.keys()
             ):
-                fields_key = ["cim_fields", "other_fields"]
-                for key in fields_key:
+                for key in UPDATABLE_REQUIREMENT_FIELDS:
                     for field_name, value in self.requirement_test_data.get(
                         key, {}
                     ).items():
@@ -413,12 +502,17 @@ class SampleEvent(object):
         Returns:
             Copy of the SampleEvent object
         """
-        new_event = cls("", {}, "")
-        new_event.__dict__ = event.__dict__.copy()
+        new_event = cls.__new__(cls)
+        for attr in cls.__slots__:
+            if hasattr(event, attr):
+                setattr(new_event, attr, getattr(event, attr))
         new_event.key_fields = event.key_fields.copy()
         new_event.time_values = event.time_values[:]
-        new_event.metadata = deepcopy(event.metadata)
-        new_event.requirement_test_data = deepcopy(event.requirement_test_data)
+        # metadata only holds scalar values
+        new_event.metadata = event.metadata.copy()
+        new_event.requirement_test_data = copy_requirement_test_data(
+            event.requirement_test_data
+        )
         return new_event
 
     def update_metadata(self, event, metadata, key_fields):
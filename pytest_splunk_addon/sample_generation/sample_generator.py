@@ -13,11 +13,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 
 from . import PytestSplunkAddonDataParser
-from . import SampleStanza
-from itertools import cycle
+from .value_pool import seed_random
+
+
+def tokenize_stanza(stanza, conf_name, stanza_index, seed=None):
+    """
+    Tokenizes the stanza, in a worker process when tokenizing in parallel.
+    With a seed, the random values of the stanza are seeded with the seed
+    and the position of the stanza so they do not depend on the process used.
+
+    Args:
+        stanza (SampleStanza): Stanza to tokenize
+        conf_name (str): Name of the conf file, "psa-data-gen"
+        stanza_index (int): Position of the stanza in the conf file
+        seed (int): Seed of the generated values
+
+    Returns:
+        SampleStanza: The tokenized stanza
+    """
+    if seed is not None:
+        seed_random("{}-{}".format(seed, stanza_index))
+    stanza.tokenize(conf_name)
+    return stanza
 
 
 class SampleGenerator(object):
@@ -28,16 +51,25 @@ class SampleGenerator(object):
         addon_path (str): path to the addon
         config_path (str): Path to the pytest-splunk-addon-data.conf
         process_count (num): generate {no} process for execution
+        seed (int): Seed making the generated events the same in every session
     """
 
     sample_stanzas = []
     conf_name = " "
 
-    def __init__(self, addon_path, config_path=None, splunk_ep=False, process_count=4):
+    def __init__(
+        self,
+        addon_path,
+        config_path=None,
+        splunk_ep=False,
+        process_count=4,
+        seed=None,
+    ):
         self.addon_path = addon_path
         self.process_count = process_count
         self.config_path = config_path
         self.splunk_ep = splunk_ep
+        self.seed = seed
 
     def get_samples(self):
         """
@@ -54,19 +86,56 @@ class SampleGenerator(object):
             for stanza in sample_stanzas:
                 stanza.metadata["splunk_ep"] = self.splunk_ep
 
-            with ThreadPoolExecutor(min(20, max(len(sample_stanzas), 1))) as t:
-                t.map(SampleStanza.get_raw_events, sample_stanzas)
-            _ = list(
-                map(
-                    SampleStanza.tokenize,
-                    sample_stanzas,
-                    cycle([SampleGenerator.conf_name]),
-                )
-            )
+            with self.get_executor(len(sample_stanzas)) as p:
+                # The stanzas using the global host, ip and user counters are
+                # tokenized here in order, so the counters stay sequential
+                futures = {
+                    index: p.submit(
+                        tokenize_stanza,
+                        stanza,
+                        SampleGenerator.conf_name,
+                        index,
+                        self.seed,
+                    )
+                    for index, stanza in enumerate(sample_stanzas)
+                    if p and not stanza.uses_counters()
+                }
+                sample_stanzas = [
+                    futures[index].result()
+                    if index in futures
+                    else tokenize_stanza(
+                        stanza, SampleGenerator.conf_name, index, self.seed
+                    )
+                    for index, stanza in enumerate(sample_stanzas)
+                ]
             SampleGenerator.sample_stanzas = sample_stanzas
         for each_sample in SampleGenerator.sample_stanzas:
             yield from each_sample.get_tokenized_events()
 
+    def get_executor(self, stanza_count):
+        """
+        Returns the process pool tokenizing the stanzas in parallel, or a
+        context without executor when the stanzas are tokenized here.
+        The worker processes are forked, as they rely on the modules already
+        imported here, so the pool is not used while other threads run,
+        e.g. the execnet threads of the pytest-xdist controller.
+
+        Args:
+            stanza_count (int): Number of stanzas to tokenize
+        """
+        if (
+            self.process_count > 1
+            and stanza_count > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+            and threading.active_count() == 1
+        ):
+            return ProcessPoolExecutor(
+                min(self.process_count, stanza_count),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=seed_random,
+            )
+        return nullcontext()
+
     @classmethod
     def clean_samples(cls):
         cls.sample_stanzas = list()
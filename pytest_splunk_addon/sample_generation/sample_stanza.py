@@ -15,11 +15,11 @@
 #
 import os
 import re
-import copy
 import uuid
 from . import Rule
 from . import raise_warning
 from . import SampleEvent
+from .sample_event import copy_requirement_test_data
 import logging
 import xmltodict
 from collections import namedtuple
@@ -30,6 +30,9 @@ TIMEZONE_REX = r"((\+1[0-2])|(-1[0-4])|[+|-][0][0-9])([0-5][0-9])"
 BULK_EVENT_COUNT = 250
 
 token_value = namedtuple("token_value", ["key", "value"])
+event_template = namedtuple(
+    "event_template", ["event", "requirement_test_data", "host", "source"]
+)
 
 
 class SampleStanza(object):
@@ -55,6 +58,7 @@ class SampleStanza(object):
         self.sample_rules = list(self._parse_rules(psa_data_params, self.sample_path))
         self.input_type = self.metadata.get("input_type", "default")
         self.host_count = 0
+        self._event_templates = None
 
     def get_raw_events(self):
         """
@@ -73,6 +77,17 @@ class SampleStanza(object):
             )
             yield event
 
+    def uses_counters(self):
+        """
+        Returns whether the tokenization takes values from the global host,
+        ip and user counters, i.e. depends on the stanzas tokenized before.
+        The event hosts of replacement_type=all also come from a counter.
+        """
+        return any(
+            each_rule.uses_counters or each_rule.replacement_type == "all"
+            for each_rule in self.sample_rules
+        )
+
     def tokenize(self, conf_name):
         """
         Tokenizes the raw events by replacing all the tokens in it.
@@ -111,6 +126,8 @@ class SampleStanza(object):
                 event.update_requirement_test_field("host", "##host##", host)
             bulk_event.extend(raw_event[event_counter])
             event_counter = event_counter + 1
+        # The templates are only needed while tokenizing
+        self._event_templates = None
 
         if self.metadata.get("breaker") is not None:
             self.metadata.update(sample_count=1)
@@ -269,26 +286,27 @@ class SampleStanza(object):
         """
         self.host_count += 1
         event_host = self.metadata.get("host") + "_" + str(self.host_count)
-        event_metadata = copy.deepcopy(self.metadata)
-        event_metadata.update(host=event_host)
-        LOGGER.info("event metadata: {}".format(event_metadata))
+        # The stanza metadata only holds scalar values
+        event_metadata = dict(self.metadata, host=event_host)
+        LOGGER.info("event metadata: %s", event_metadata)
         return event_metadata
 
-    def _get_raw_sample(self):
+    def _get_event_templates(self):
         """
-        Converts a sample file into raw events based on the input type and breaker.
-        Input: Name of the sample file for which events have to be generated.
-        Output: Yields object of SampleEvent.
+        Reads the sample file and breaks or parses it into event templates.
+        The file is only read once per stanza, the templates are reused for
+        every copy of the sample generated while tokenizing.
 
-        If the input type is in ["modinput", "windows_input"], a new event will be generated for each line in the file.
-        If the input type is in below categories, a single event will be generated for the entire file.
-            [
-                "file_monitor",
-                "scripted_input",
-                "syslog_tcp",
-                "syslog_udp",
-                "default"
-            ]
+        Returns:
+            list: event_template of each event in the sample file
+        """
+        if self._event_templates is None:
+            self._event_templates = list(self._parse_event_templates())
+        return self._event_templates
+
+    def _parse_event_templates(self):
+        """
+        Yields the event templates of the sample file based on the input type and breaker.
         """
         with open(self.sample_path, "r", encoding="utf-8") as sample_file:
             sample_raw = sample_file.read()
@@ -303,29 +321,24 @@ class SampleStanza(object):
             if self.metadata.get("sample_count") is None:
                 self.metadata.update(sample_count="1")
             for each_event in events:
-                event = each_event["raw"].strip()
-                event_metadata = self.get_eventmetadata()
-                requirement_test_data = self.populate_requirement_test_data(each_event)
+                static_host = static_source = None
                 if "transport" in each_event.keys():
                     static_host = each_event["transport"].get("@host")
-                    if static_host:
-                        event_metadata.update(host=static_host)
                     static_source = each_event["transport"].get("@source")
-                    if static_source:
-                        event_metadata.update(source=static_source)
-                yield SampleEvent(
-                    event, event_metadata, self.sample_name, requirement_test_data
+                yield event_template(
+                    each_event["raw"].strip(),
+                    self.populate_requirement_test_data(each_event),
+                    static_host,
+                    static_source,
                 )
         elif self.metadata.get("breaker"):
             for each_event in self.break_events(sample_raw):
                 if each_event:
-                    event_metadata = self.get_eventmetadata()
-                    yield SampleEvent(each_event, event_metadata, self.sample_name)
+                    yield event_template(each_event, None, None, None)
         elif self.input_type in ["modinput", "windows_input"]:
             for each_line in sample_raw.split("\n"):
                 if each_line:
-                    event_metadata = self.get_eventmetadata()
-                    yield SampleEvent(each_line, event_metadata, self.sample_name)
+                    yield event_template(each_line, None, None, None)
         elif self.input_type in [
             "file_monitor",
             "uf_file_monitor",
@@ -338,7 +351,60 @@ class SampleStanza(object):
             if not event:
                 raise_warning("sample file: '{}' is empty".format(self.sample_path))
             else:
-                yield SampleEvent(event, self.metadata, self.sample_name)
+                yield event_template(event, None, None, None)
+
+    def _get_raw_sample(self):
+        """
+        Converts a sample file into raw events based on the input type and breaker.
+        Input: Name of the sample file for which events have to be generated.
+        Output: Yields object of SampleEvent.
+
+        If the input type is in ["modinput", "windows_input"], a new event will be generated for each line in the file.
+        If the input type is in below categories, a single event will be generated for the entire file.
+            [
+                "file_monitor",
+                "scripted_input",
+                "syslog_tcp",
+                "syslog_udp",
+                "default"
+            ]
+        """
+        event_templates = self._get_event_templates()
+
+        if self.metadata.get("requirement_test_sample"):
+            for template in event_templates:
+                event_metadata = self.get_eventmetadata()
+                if template.host:
+                    event_metadata.update(host=template.host)
+                if template.source:
+                    event_metadata.update(source=template.source)
+                yield SampleEvent(
+                    template.event,
+                    event_metadata,
+                    self.sample_name,
+                    copy_requirement_test_data(template.requirement_test_data),
+                    stanza_metadata=self.metadata,
+                )
+        elif self.metadata.get("breaker") or self.input_type in [
+            "modinput",
+            "windows_input",
+        ]:
+            for template in event_templates:
+                event_metadata = self.get_eventmetadata()
+                yield SampleEvent(
+                    template.event,
+                    event_metadata,
+                    self.sample_name,
+                    stanza_metadata=self.metadata,
+                )
+        else:
+            for template in event_templates:
+                yield SampleEvent(
+                    template.event,
+                    self.metadata,
+                    self.sample_name,
+                    stanza_metadata=self.metadata,
+                )
         if not self.input_type:
             # TODO: input_type not found scenario
             pass
@@ -14,13 +14,19 @@
 # limitations under the License.
 #
 from . import SampleGenerator
+from .indexed_events import IndexedEvents
+from .event_log_writer import EventLogWriter
+import logging
 import os
 import pickle
+import shutil
 from filelock import FileLock
-import json
 import pytest
 
 from pytest_splunk_addon import utils
+from ..addon_parser.parser_cache import get_addon_content_hash
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
 
 
 class SampleXdistGenerator:
@@ -33,6 +39,18 @@ class SampleXdistGenerator:
         process_count (num): generate {no} process for execution
     """
 
+    # Set from --generation-seed and --event-store-dir
+    generation_seed = None
+    event_store_dir = ".event_store"
+    # Set from --event-log-format, --event-log-compress and --event-log-changed-only
+    event_log_format = "json"
+    event_log_compress = False
+    event_log_changed_only = False
+    # Events file written by the pytest-xdist controller, set from workerinput
+    events_file = None
+    # Samples already loaded in this process, by add-on, config and splunk_ep
+    loaded_samples = {}
+
     def __init__(self, addon_path, splunk_ep: bool, config_path=None, process_count=4):
         self.addon_path = addon_path
         self.process_count = process_count
@@ -41,7 +59,30 @@ class SampleXdistGenerator:
 
     def get_samples(self, store_events):
         """
-        Function to generate samples
+        Function to generate samples.
+        The samples are loaded once per process, later calls return the same
+        dictionary.
+
+        Args:
+            store_events (bool): variable to define if events should be stored
+
+        Returns:
+            dict: dictionary with conf_name and tokenized events
+        """
+        if self.memo_key not in SampleXdistGenerator.loaded_samples:
+            SampleXdistGenerator.loaded_samples[self.memo_key] = self.load_samples(
+                store_events
+            )
+        return SampleXdistGenerator.loaded_samples[self.memo_key]
+
+    @property
+    def memo_key(self):
+        return self.addon_path, self.config_path, self.splunk_ep
+
+    def load_samples(self, store_events):
+        """
+        Function to load the samples, from the events file of the pytest-xdist
+        controller, the pregenerated events or by generating them
 
         Args:
             store_events (bool): variable to define if events should be stored
@@ -49,6 +90,14 @@ class SampleXdistGenerator:
         Returns:
             dict: dictionary with conf_name and tokenized events
         """
+        if self.events_file:
+            # Stored and saved by the controller already
+            indexed_events = IndexedEvents(self.events_file)
+            return {
+                "conf_name": indexed_events.conf_name,
+                "tokenized_events": indexed_events,
+            }
+
         if self.tokenized_event_source == "pregenerated":
             with open(self.event_path, "rb") as file_obj:
                 store_sample = pickle.load(file_obj)
@@ -63,98 +112,149 @@ class SampleXdistGenerator:
         if "PYTEST_XDIST_WORKER" in os.environ:
             file_path = os.environ.get("PYTEST_XDIST_TESTRUNUID") + "_events"
             with FileLock(str(file_path) + ".lock"):
-                if os.path.exists(file_path):
-                    with open(file_path, "rb") as file_obj:
-                        store_sample = pickle.load(file_obj)
-                else:
-                    sample_generator = SampleGenerator(
-                        self.addon_path, self.config_path, self.splunk_ep
-                    )
-                    tokenized_events = list(sample_generator.get_samples())
-                    store_sample = {
-                        "conf_name": SampleGenerator.conf_name,
-                        "tokenized_events": tokenized_events,
-                    }
-                    if store_events:
-                        self.store_events(tokenized_events)
-                    with open(file_path, "wb") as file_obj:
-                        pickle.dump(store_sample, file_obj)
+                if not os.path.exists(file_path):
+                    self.write_events_file(file_path, store_events)
+                # The events are read lazily, chunk by chunk, when iterated
+                indexed_events = IndexedEvents(file_path)
+                store_sample = {
+                    "conf_name": indexed_events.conf_name,
+                    "tokenized_events": indexed_events,
+                }
         else:
-            sample_generator = SampleGenerator(
-                self.addon_path, self.config_path, self.splunk_ep
-            )
-            tokenized_events = list(sample_generator.get_samples())
+            conf_name, tokenized_events = self.generate_events()
             store_sample = {
-                "conf_name": SampleGenerator.conf_name,
+                "conf_name": conf_name,
                 "tokenized_events": tokenized_events,
             }
             if store_events:
                 self.store_events(tokenized_events)
-        if self.tokenized_event_source == "store_new" and not self.event_stored:
-            with open(self.event_path, "wb") as file_obj:
-                pickle.dump(store_sample, file_obj)
-            self.event_stored = True
+        self.save_samples(store_sample)
         return store_sample
 
-    def store_events(self, tokenized_events):
+    def get_event_store_path(self):
         """
-        Function to store tokenized events in json file
+        Path of the events generated with --generation-seed for the current
+        content of the add-on, pytest-splunk-addon-data.conf and the samples.
+        The events of --splunk-ep carry an identifier unique to the session,
+        so they are not stored.
+
+        Returns:
+            str: path of the stored events, None when the events are not stored
+        """
+        if self.generation_seed is None or self.splunk_ep:
+            return None
+        if not hasattr(self, "_event_store_path"):
+            content_hash = get_addon_content_hash(
+                self.addon_path,
+                self.config_path,
+                extra_values=[self.generation_seed],
+            )
+            self._event_store_path = os.path.join(
+                self.event_store_dir,
+                "{}_{}.events".format(self.generation_seed, content_hash[:32]),
+            )
+        return self._event_store_path
+
+    def generate_events(self):
+        """
+        Generate the tokenized events. With --generation-seed, the events
+        stored for the same seed and add-on content are read instead, and
+        newly generated events are stored for the next sessions.
+
+        Returns:
+            tuple: conf_name and tokenized events
+        """
+        event_store_path = self.get_event_store_path()
+        if event_store_path and os.path.exists(event_store_path):
+            LOGGER.info("Reading the generated events from %s", event_store_path)
+            indexed_events = IndexedEvents(event_store_path)
+            return indexed_events.conf_name, indexed_events
+        sample_generator = SampleGenerator(
+            self.addon_path,
+            self.config_path,
+            self.splunk_ep,
+            seed=self.generation_seed,
+        )
+        tokenized_events = list(sample_generator.get_samples())
+        if event_store_path:
+            self.write_event_store(event_store_path, tokenized_events)
+        return SampleGenerator.conf_name, tokenized_events
+
+    def write_event_store(self, event_store_path, tokenized_events):
+        """
+        Store the events generated with --generation-seed
 
         Args:
+            event_store_path (str): path returned by get_event_store_path
             tokenized_events (list): list of tokenized events
         """
-        if not os.path.exists(os.path.join(os.getcwd(), ".tokenized_events")):
-            os.makedirs(os.path.join(os.getcwd(), ".tokenized_events"))
-        tokenized_samples_dict = {}
-        for each_event in tokenized_events:
-            if each_event.sample_name not in tokenized_samples_dict:
-                if each_event.metadata.get("input_type") not in [
-                    "modinput",
-                    "windows_input",
-                ]:
-                    sample_multiplication = int(
-                        each_event.metadata.get("sample_count") or 1
-                    )
-                    expected_count = (
-                        int(each_event.metadata.get("expected_event_count"))
-                        * sample_multiplication
-                    )
-                else:
-                    expected_count = each_event.metadata.get("expected_event_count")
-                tokenized_samples_dict[each_event.sample_name] = {
-                    "metadata": {
-                        "host": each_event.metadata.get("host"),
-                        "source": each_event.metadata.get("source"),
-                        "sourcetype": each_event.metadata.get("sourcetype"),
-                        "timestamp_type": each_event.metadata.get("timestamp_type"),
-                        "input_type": each_event.metadata.get("input_type"),
-                        "expected_event_count": expected_count,
-                        "index": each_event.metadata.get("index", "main"),
-                    },
-                    "events": [],
-                }
+        os.makedirs(os.path.dirname(event_store_path) or ".", exist_ok=True)
+        IndexedEvents.write(
+            event_store_path, SampleGenerator.conf_name, tokenized_events
+        )
 
-            # Create event dict with optional UUID
-            sample_event = {
-                "event": each_event.event,
-                "key_fields": each_event.key_fields,
-                "time_values": each_event.time_values,
-                "requirement_test_data": each_event.requirement_test_data,
-            }
-            if self.splunk_ep:
-                sample_event["unique_identifier"] = each_event.unique_identifier
+    def write_events_file(self, file_path, store_events):
+        """
+        Write the tokenized events to an indexed events file, in the pytest-xdist
+        controller, for the workers to read them instead of generating them.
+        The events are stored and saved here, once for all the workers, unless
+        they were already loaded, and hence stored and saved, by get_samples.
 
-            tokenized_samples_dict[each_event.sample_name]["events"].append(
-                sample_event
+        Args:
+            file_path (str): Path to the events file
+            store_events (bool): variable to define if events should be stored
+        """
+        loaded = self.memo_key in SampleXdistGenerator.loaded_samples
+        if loaded:
+            store_sample = SampleXdistGenerator.loaded_samples[self.memo_key]
+            conf_name = store_sample.get("conf_name")
+            tokenized_events = store_sample.get("tokenized_events")
+        elif self.tokenized_event_source == "pregenerated":
+            with open(self.event_path, "rb") as file_obj:
+                store_sample = pickle.load(file_obj)
+            conf_name = store_sample.get("conf_name")
+            tokenized_events = store_sample.get("tokenized_events")
+        else:
+            conf_name, tokenized_events = self.generate_events()
+        if store_events and not loaded:
+            self.store_events(tokenized_events)
+        if isinstance(tokenized_events, list):
+            IndexedEvents.write(file_path, conf_name, tokenized_events)
+        else:
+            # Events read from the event store are already indexed
+            shutil.copyfile(tokenized_events.file_path, file_path)
+        if not loaded and self.tokenized_event_source != "pregenerated":
+            self.save_samples(
+                {"conf_name": conf_name, "tokenized_events": tokenized_events}
             )
 
-        for sample_name, tokenized_sample in tokenized_samples_dict.items():
-            with open(
-                "{}.json".format(
-                    os.path.join(os.getcwd(), ".tokenized_events", sample_name)
-                ),
-                "w",
-            ) as eventfile:
-                eventfile.write(
-                    json.dumps({sample_name: tokenized_sample}, indent="\t")
-                )
+    @classmethod
+    def clean_samples(cls):
+        cls.loaded_samples = {}
+
+    def save_samples(self, store_sample):
+        """
+        Function to save the samples for later sessions when tokenized_event_source is store_new
+
+        Args:
+            store_sample (dict): dictionary with conf_name and tokenized events
+        """
+        if self.tokenized_event_source == "store_new" and not self.event_stored:
+            with open(self.event_path, "wb") as file_obj:
+                pickle.dump(store_sample, file_obj)
+            self.event_stored = True
+
+    def store_events(self, tokenized_events):
+        """
+        Function to store tokenized events in one file per sample
+
+        Args:
+            tokenized_events (list): list of tokenized events
+        """
+        EventLogWriter(
+            os.path.join(os.getcwd(), ".tokenized_events"),
+            splunk_ep=self.splunk_ep,
+            event_format=self.event_log_format,
+            compress=self.event_log_compress,
+            changed_only=self.event_log_changed_only,
+        ).write(tokenized_events)
@@ -0,0 +1,216 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Pools of random values for the replacement rules, generated in batches
+instead of one call per token, and the Faker instance shared by the rules.
+
+The values are drawn from the random generator shared by all the Faker
+instances, so seeding Faker (Faker.seed) seeds the pools as well.
+"""
+import ipaddress
+import random
+import uuid
+from typing import Callable, Iterator, List, Optional, Union
+
+from faker import Faker
+from faker.generator import random as shared_random
+
+# Largest number of values generated at once for a pool
+POOL_BATCH_SIZE = 1024
+# First and last addresses of the reserved networks excluded by Faker's ipv4
+EXCLUDED_IPV4_RANGES = [
+    (int(network.network_address), int(network.broadcast_address))
+    for network in map(
+        ipaddress.IPv4Network,
+        [
+            "0.0.0.0/8",
+            "100.64.0.0/10",
+            "127.0.0.0/8",
+            "169.254.0.0/16",
+            "192.0.0.0/24",
+            "192.0.2.0/24",
+            "192.31.196.0/24",
+            "192.52.193.0/24",
+            "192.88.99.0/24",
+            "192.175.48.0/24",
+            "198.18.0.0/15",
+            "198.51.100.0/24",
+            "203.0.113.0/24",
+            "224.0.0.0/3",
+        ],
+    )
+]
+
+_faker = None
+
+
+def get_faker() -> Faker:
+    """
+    Returns the Faker instance shared by the rules and sample events.
+    Creating a Faker loads all its providers, so it is created only once.
+    """
+    global _faker
+    if _faker is None:
+        _faker = Faker()
+    return _faker
+
+
+def seed_random(seed: Optional[Union[int, str]] = None) -> None:
+    """
+    Seeds the generator shared with Faker and the random module, which the
+    rules without a value pool use. Without a seed, they are seeded from
+    the system, e.g. in each process tokenizing stanzas.
+
+    Args:
+        seed (int|str): Seed of the generated values
+    """
+    Faker.seed(seed)
+    random.seed(seed)
+
+
+def random_ints(lower_limit: int, upper_limit: int, count: int) -> List[int]:
+    """
+    Returns random integers between the limits, both included
+    """
+    return shared_random.choices(range(lower_limit, upper_limit + 1), k=count)
+
+
+def random_floats(lower_limit: float, upper_limit: float, count: int) -> List[float]:
+    """
+    Returns random floats between the limits
+    """
+    _random = shared_random.random
+    difference = upper_limit - lower_limit
+    return [lower_limit + difference * _random() for _ in range(count)]
+
+
+def random_choices(values: List, count: int) -> List:
+    """
+    Returns values picked randomly from the list
+    """
+    return shared_random.choices(values, k=count)
+
+
+def random_hex(length: int, count: int) -> List[str]:
+    """
+    Returns random lowercase hex strings of the given length
+    """
+    bits = 4 * length
+    hex_format = "0{}x".format(length)
+    getrandbits = shared_random.getrandbits
+    return [format(getrandbits(bits), hex_format) if bits else "" for _ in range(count)]
+
+
+def random_macs(count: int) -> List[str]:
+    """
+    Returns random unicast mac addresses, formatted as Faker's mac_address
+    """
+    macs = []
+    for _ in range(count):
+        # Clear the multicast bit of the first octet
+        value = format(shared_random.getrandbits(48) & ~(1 << 40), "012x")
+        macs.append(":".join(value[i : i + 2] for i in range(0, 12, 2)))
+    return macs
+
+
+def random_guids(count: int) -> List[str]:
+    """
+    Returns random version 4 guids
+    """
+    return [
+        str(uuid.UUID(int=shared_random.getrandbits(128), version=4))
+        for _ in range(count)
+    ]
+
+
+def random_ipv4s(count: int) -> List[str]:
+    """
+    Returns random public or private ipv4 addresses, outside of the reserved
+    networks Faker's ipv4 excludes, e.g. loopback, link-local or multicast
+    """
+    getrandbits = shared_random.getrandbits
+    ipv4s = []
+    while len(ipv4s) < count:
+        value = getrandbits(32)
+        if any(start <= value <= end for start, end in EXCLUDED_IPV4_RANGES):
+            continue
+        ipv4s.append(
+            "{}.{}.{}.{}".format(
+                value >> 24, (value >> 16) & 255, (value >> 8) & 255, value & 255
+            )
+        )
+    return ipv4s
+
+
+def random_ipv6s(count: int) -> List[str]:
+    """
+    Returns random ipv6 addresses above the ipv4 range, as Faker's ipv6
+    """
+    getrandbits = shared_random.getrandbits
+    ipv6s = []
+    while len(ipv6s) < count:
+        value = getrandbits(128)
+        if value >= 1 << 32:
+            ipv6s.append(str(ipaddress.IPv6Address(value)))
+    return ipv6s
+
+
+class ValuePool:
+    """
+    Values generated in batches and handed out one at a time.
+
+    The first batch is as large as the first request and the next batches
+    double in size up to POOL_BATCH_SIZE, so a rule used for a few tokens
+    does not generate values it never uses.
+
+    Args:
+        generate_batch (callable): Function returning a list of the given number of values
+    """
+
+    def __init__(self, generate_batch: Callable[[int], List]):
+        self.generate_batch = generate_batch
+        self.batch_size = 0
+        self._values = []
+        self._index = 0
+
+    def take(self, count: int) -> Iterator:
+        """
+        Yields the given number of values
+
+        Args:
+            count (int): Number of values
+        """
+        while count > 0:
+            if self._index >= len(self._values):
+                self.batch_size = min(
+                    max(count, self.batch_size * 2), max(count, POOL_BATCH_SIZE)
+                )
+                self._values = self.generate_batch(self.batch_size)
+                self._index = 0
+                if not self._values:
+                    return
+            end = min(self._index + count, len(self._values))
+            yield from self._values[self._index : end]
+            count -= end - self._index
+            self._index = end
+
+    def __getstate__(self):
+        # The values left are not pickled, so that the processes the rules are
+        # sent to do not hand out the same values
+        return {"generate_batch": self.generate_batch}
+
+    def __setstate__(self, state):
+        self.__init__(state["generate_batch"])
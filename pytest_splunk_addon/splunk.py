@@ -26,18 +26,29 @@ import splunklib.client as client
 from splunksplwrapper.manager.jobs import Jobs
 from splunksplwrapper.splunk.cloud import CloudSplunk
 from splunksplwrapper.SearchUtil import SearchUtil
-from .event_ingestors import IngestorHelper
+from .event_ingestors import IngestorHelper, IndexingBarrier
 from .docker_class import Services
 from splunk_cim_models import datamodels
 import configparser
 from filelock import FileLock
 
 from pytest_splunk_addon import utils
+from .worker_barrier import WorkerBarrier
+from .offline_engine import OfflineFieldEngine, OfflineFieldChecker
+from .sample_generation import SampleXdistGenerator
+from .fields_tests import FieldSearchAggregator
 
 RESPONSIVE_SPLUNK_TIMEOUT = 300  # seconds
+INGESTION_WAIT_TIME = 50  # seconds
+INGESTION_BARRIER_TIMEOUT = 3600  # seconds, on top of the indexing timeout
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
 PYTEST_XDIST_TESTRUNUID = ""
+# Tasks run by the first xdist worker which the other workers wait for
+WORKER_BARRIER_NAMES = ("ingestion",)
+WORKER_BARRIERS = {}
+# Set in the xdist controller, which removes the barrier files at the end
+CONTROLLER_TESTRUNUID = ""
 
 
 def pytest_addoption(parser):
@@ -230,6 +241,38 @@ def pytest_addoption(parser):
         dest="thread_count",
         help=("Thread count for Data ingestion"),
     )
+    group.addoption(
+        "--hec-batch-size",
+        action="store",
+        dest="hec_batch_size",
+        default=100,
+        type=int,
+        help="Maximum number of events sent in a single HEC request. default is 100.",
+    )
+    group.addoption(
+        "--hec-batch-max-bytes",
+        action="store",
+        dest="hec_batch_max_bytes",
+        default=1000000,
+        type=int,
+        help="Maximum size in bytes of a single HEC request. default is 1000000.",
+    )
+    group.addoption(
+        "--indexing-timeout",
+        action="store",
+        dest="indexing_timeout",
+        default=300,
+        type=int,
+        help="Maximum time in seconds to wait for the ingested events to be searchable. default is 300.",
+    )
+    group.addoption(
+        "--indexing-poll-interval",
+        action="store",
+        dest="indexing_poll_interval",
+        default=5,
+        type=int,
+        help="Time interval in seconds between two checks of the ingested events. default is 5.",
+    )
     group.addoption(
         "--search-index",
         action="store",
@@ -265,6 +308,28 @@ def pytest_addoption(parser):
         dest="store_events",
         help="Avoids generation of the json files with the tokenised events in the working directory.",
     )
+    group.addoption(
+        "--event-log-format",
+        action="store",
+        dest="event_log_format",
+        default="json",
+        choices=["json", "jsonl"],
+        help="Format of the files with the tokenised events: one json document per sample or json lines. Default is json.",
+    )
+    group.addoption(
+        "--event-log-compress",
+        action="store_true",
+        dest="event_log_compress",
+        default=False,
+        help="Compress the files with the tokenised events with gzip.",
+    )
+    group.addoption(
+        "--event-log-changed-only",
+        action="store_true",
+        dest="event_log_changed_only",
+        default=False,
+        help="Only write the files with the tokenised events of the samples whose events changed since the last run.",
+    )
 
     group.addoption(
         "--splunk-cleanup",
@@ -319,6 +384,34 @@ def pytest_addoption(parser):
         help="Path to tokenised event directory",
         default="events.pickle",
     )
+    group.addoption(
+        "--parser-cache-dir",
+        action="store",
+        dest="parser_cache_dir",
+        default=None,
+        help=(
+            "Directory to keep the parsed configuration and generated tests in across sessions. "
+            "The cache is reused as long as the add-on, the samples and the plugin are unchanged."
+        ),
+    )
+    group.addoption(
+        "--generation-seed",
+        action="store",
+        dest="generation_seed",
+        type=int,
+        default=None,
+        help=(
+            "Seed the generation of the tokenized events, so the same add-on generates the same events. "
+            "The events are stored in --event-store-dir and reused while the add-on and samples are unchanged."
+        ),
+    )
+    group.addoption(
+        "--event-store-dir",
+        action="store",
+        dest="event_store_dir",
+        default=".event_store",
+        help="Directory to store the events generated with --generation-seed in",
+    )
     group.addoption(
         "--tokenized-event-source",
         action="store",
@@ -340,6 +433,24 @@ def pytest_addoption(parser):
         help="Should execute test or not (True|False)",
         default="True",
     )
+    group.addoption(
+        "--regex-profile",
+        action="store",
+        dest="regex_profile",
+        default=None,
+        help=(
+            "Time the EXTRACT and REPORT regexes of the add-on on the generated events, without Splunk, "
+            "and write the ranked report in this markdown file."
+        ),
+    )
+    group.addoption(
+        "--regex-profile-timeout",
+        action="store",
+        dest="regex_profile_timeout",
+        type=int,
+        default=10,
+        help="Seconds after which the profiling of a regex is stopped and the regex flagged as catastrophic",
+    )
     group.addoption(
         "--keepalive",
         "-K",
@@ -403,6 +514,22 @@ def splunk_search_util(splunk, request):
     return search_util
 
 
+@pytest.fixture(scope="session")
+def splunk_searchtime_fields_search_aggregator(request, splunk_search_util):
+    """
+    Runs one search per stanza for the test_props_fields tests of the session,
+    each test then checks the count of its own condition. A stanza is only
+    searched by the worker running one of its tests, when the test runs.
+    """
+    fields_groups = [
+        item.callspec.params["splunk_searchtime_fields_positive"]
+        for item in request.session.items
+        if "splunk_searchtime_fields_positive"
+        in getattr(getattr(item, "callspec", None), "params", {})
+    ]
+    return FieldSearchAggregator(splunk_search_util, fields_groups)
+
+
 @pytest.fixture(scope="session")
 def ignore_internal_errors(request):
     """
@@ -714,7 +841,9 @@ def splunk_web_uri(request, splunk):
 
 
 @pytest.fixture(scope="session")
-def splunk_ingest_data(request, splunk_hec_uri, sc4s, uf, splunk_events_cleanup):
+def splunk_ingest_data(
+    request, splunk_hec_uri, sc4s, uf, splunk_search_util, splunk_events_cleanup
+):
     """
     Generates events for the add-on and ingests into Splunk.
     The ingestion can be done using the following methods:
@@ -726,6 +855,7 @@ def splunk_ingest_data(request, splunk_hec_uri, sc4s, uf, splunk_events_cleanup)
     Args:
         splunk_hec_uri(tuple): Details for hec uri and session headers
         sc4s(tuple): Details for sc4s server and TCP port
+        splunk_search_util(SearchUtil): Used to wait until the ingested events are searchable
         splunk_clear_eventdata: Unused but required to ensure fixture deleting all events will be run before ingesting new events
 
     TODO:
@@ -734,7 +864,8 @@ def splunk_ingest_data(request, splunk_hec_uri, sc4s, uf, splunk_events_cleanup)
     if request.config.getoption("ingest_events").lower() in ["n", "no", "false", "f"]:
         return
     global PYTEST_XDIST_TESTRUNUID
-    if utils.check_first_worker():
+
+    def ingest_data():
         addon_path = request.config.getoption("splunk_app")
         config_path = request.config.getoption("splunk_data_generator")
         ingest_meta_data = {
@@ -747,27 +878,36 @@ def splunk_ingest_data(request, splunk_hec_uri, sc4s, uf, splunk_events_cleanup)
             "sc4s_host": sc4s[0],  # for sc4s
             "sc4s_port": sc4s[1][514],  # for sc4s
             "splunk_ep": request.config.getoption("splunk_ep"),
+            "hec_batch_size": request.config.getoption("hec_batch_size"),
+            "hec_batch_max_bytes": request.config.getoption("hec_batch_max_bytes"),
         }
         thread_count = int(request.config.getoption("thread_count"))
         store_events = request.config.getoption("store_events")
-        try:
-            IngestorHelper.ingest_events(
-                ingest_meta_data,
-                addon_path,
-                config_path,
-                thread_count,
-                store_events,
-            )
-            sleep(50)
-        except Exception as e:
-            raise e
-        finally:
-            if "PYTEST_XDIST_WORKER" in os.environ:
-                with open(os.environ.get("PYTEST_XDIST_TESTRUNUID") + "_wait", "w+"):
-                    PYTEST_XDIST_TESTRUNUID = os.environ.get("PYTEST_XDIST_TESTRUNUID")
-    else:
-        while not os.path.exists(os.environ.get("PYTEST_XDIST_TESTRUNUID") + "_wait"):
-            sleep(1)
+        store_sample = IngestorHelper.ingest_events(
+            ingest_meta_data,
+            addon_path,
+            config_path,
+            thread_count,
+            store_events,
+        )
+        if store_sample.get("conf_name") == "psa-data-gen":
+            IndexingBarrier(
+                splunk_search_util,
+                request.config.getoption("indexing_timeout"),
+                request.config.getoption("indexing_poll_interval"),
+            ).wait(store_sample.get("tokenized_events"))
+        else:
+            # Expected event counts are only known for pytest-splunk-addon-data.conf
+            sleep(INGESTION_WAIT_TIME)
+
+    if utils.check_first_worker() and "PYTEST_XDIST_WORKER" in os.environ:
+        PYTEST_XDIST_TESTRUNUID = os.environ.get("PYTEST_XDIST_TESTRUNUID")
+    run_on_first_worker(
+        "ingestion",
+        ingest_data,
+        timeout=INGESTION_BARRIER_TIMEOUT
+        + request.config.getoption("indexing_timeout"),
+    )
 
 
 @pytest.fixture(scope="session")
@@ -836,6 +976,27 @@ def splunk_dm_recommended_fields():
     return update_recommended_fields
 
 
+@pytest.fixture(scope="session")
+def splunk_offline_field_checker(request):
+    """
+    Checks the field tests offline, on the fields the props.conf and
+    transforms.conf of the add-on extract from the generated events.
+    Does not need a Splunk instance.
+    """
+    app_path = request.config.getoption("splunk_app")
+    sample_generator = SampleXdistGenerator(
+        app_path,
+        request.config.getoption("splunk_ep"),
+        request.config.getoption("splunk_data_generator"),
+    )
+    store_sample = sample_generator.get_samples(
+        request.config.getoption("store_events")
+    )
+    return OfflineFieldChecker(
+        OfflineFieldEngine(app_path), store_sample.get("tokenized_events")
+    )
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item):
     """
@@ -896,6 +1057,26 @@ def docker_services(
         services.shutdown()
 
 
+def run_on_first_worker(name, task, *args, timeout=None):
+    """
+    Runs the task only on the first xdist worker, the other workers wait for it
+    and fail as soon as the task failed on the first worker.
+
+    Args:
+        name (str): Name of the barrier created in pytest_configure
+        task (callable): Task to run
+        *args: Arguments for the task
+        timeout (int): Maximum time in seconds the other workers wait for the task
+    """
+    barrier = WORKER_BARRIERS.get(name)
+    if barrier is None:
+        task(*args)
+    elif utils.check_first_worker():
+        barrier.run(task, *args)
+    elif not barrier.wait(timeout):
+        raise Exception("The first worker finished without running {}".format(name))
+
+
 def is_responsive_uf(uf):
     """
     Verify if the management port of Universal Forwarder is responsive or not
@@ -1048,10 +1229,35 @@ def is_valid_hec(request, splunk):
         pytest.exit("Exiting pytest due to invalid HEC token value.")
 
 
+def pytest_configure(config):
+    """
+    Creates the barriers used to synchronize the xdist workers. The first worker
+    claims them right away so that the other workers block until it is done.
+    """
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        return
+    testrunuid = os.environ.get("PYTEST_XDIST_TESTRUNUID")
+    for name in WORKER_BARRIER_NAMES:
+        WORKER_BARRIERS[name] = WorkerBarrier(name, testrunuid)
+        if utils.check_first_worker():
+            WORKER_BARRIERS[name].claim()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    global CONTROLLER_TESTRUNUID
+    CONTROLLER_TESTRUNUID = node.workerinput["testrunuid"]
+
+
 def pytest_unconfigure(config):
+    for barrier in WORKER_BARRIERS.values():
+        barrier.release()
+    if CONTROLLER_TESTRUNUID:
+        # The outcomes are kept until all the workers are done, so that
+        # a worker reaching the barrier late still finds them
+        for name in WORKER_BARRIER_NAMES:
+            WorkerBarrier(name, CONTROLLER_TESTRUNUID).cleanup()
     if PYTEST_XDIST_TESTRUNUID:
-        if os.path.exists(PYTEST_XDIST_TESTRUNUID + "_wait"):
-            os.remove(PYTEST_XDIST_TESTRUNUID + "_wait")
         if os.path.exists(PYTEST_XDIST_TESTRUNUID + "_events"):
             os.remove(PYTEST_XDIST_TESTRUNUID + "_events")
         if os.path.exists(PYTEST_XDIST_TESTRUNUID + "_events.lock"):
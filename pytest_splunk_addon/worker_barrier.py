@@ -0,0 +1,169 @@
+#
+# Copyright 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Synchronizes pytest-xdist workers on a task which only the first worker runs,
+e.g. ingesting the generated events.
+
+The first worker claims a FileLock when it is configured and keeps it until the
+task is finished. The outcome of the task is then written next to the lock, so
+the other workers block on the lock instead of polling and fail fast when the
+task raised on the first worker.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+from time import sleep, time
+from typing import Callable, Optional, TypeVar
+
+from filelock import FileLock, Timeout
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+T = TypeVar("T")
+
+# Only used while the first worker has not claimed the barrier yet
+CLAIM_POLL_INTERVAL = 0.1
+
+OUTCOME_PASSED = "passed"
+OUTCOME_FAILED = "failed"
+OUTCOME_NOT_RUN = "not_run"
+
+
+class WorkerBarrier:
+    """
+    Barrier between the first xdist worker, which runs a task, and the other
+    workers, which wait for its outcome.
+
+    Args:
+        name (str): Name of the task, unique within the test run
+        testrunuid (str): Unique id of the xdist test run
+    """
+
+    def __init__(self, name: str, testrunuid: str):
+        self.name = name
+        safe_testrunuid = re.sub(r"[^A-Za-z0-9_.-]", "_", testrunuid or "xdist")
+        barrier_dir = os.path.join(tempfile.gettempdir(), "pytest-splunk-addon")
+        os.makedirs(barrier_dir, exist_ok=True)
+        self.outcome_file = os.path.join(
+            barrier_dir, f"{safe_testrunuid}_{name}_barrier"
+        )
+        self.lock = FileLock(f"{self.outcome_file}.lock")
+        self.completed = False
+
+    def claim(self):
+        """
+        Acquire the barrier so the other workers block until the task is finished.
+        Should only be called by the first worker.
+        """
+        self.lock.acquire()
+
+    def run(self, task: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run the task and publish its outcome to the waiting workers.
+
+        Args:
+            task (callable): Task to run on the first worker
+            *args, **kwargs: Arguments for the task
+
+        Returns:
+            Return value of the task
+        """
+        self.lock.acquire()
+        try:
+            result = task(*args, **kwargs)
+            self._write_outcome(OUTCOME_PASSED)
+            return result
+        except BaseException as e:
+            # pytest.fail and pytest.exit are not subclasses of Exception
+            self._write_outcome(OUTCOME_FAILED, "{}: {}".format(type(e).__name__, e))
+            raise
+        finally:
+            self.completed = True
+            self.lock.release(force=True)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the first worker released the barrier.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait, no limit if None
+
+        Returns:
+            bool: True if the task passed, False if the first worker finished without running it
+
+        Raises:
+            Exception: If the task failed on the first worker or the timeout expired
+        """
+        deadline = None if timeout is None else time() + timeout
+        while True:
+            remaining = -1 if deadline is None else max(deadline - time(), 0)
+            try:
+                with self.lock.acquire(timeout=remaining):
+                    outcome = self._read_outcome()
+            except Timeout:
+                outcome = None
+            if outcome is not None:
+                break
+            if deadline is not None and time() >= deadline:
+                raise Exception(
+                    "Timed out after {} seconds waiting for {} on the first worker".format(
+                        timeout, self.name
+                    )
+                )
+            sleep(CLAIM_POLL_INTERVAL)
+        if outcome["status"] == OUTCOME_FAILED:
+            raise Exception(
+                "{} failed on the first worker: {}".format(
+                    self.name, outcome["message"]
+                )
+            )
+        return outcome["status"] == OUTCOME_PASSED
+
+    def release(self):
+        """
+        Release the barrier of the first worker at the end of the session.
+        Workers still waiting for a task that was never run are told so.
+        """
+        if not self.lock.is_locked:
+            return
+        if not self.completed:
+            self._write_outcome(OUTCOME_NOT_RUN)
+        self.lock.release(force=True)
+
+    def cleanup(self):
+        """
+        Remove the barrier files. Should only be called by the xdist controller
+        once all the workers are finished, as a worker reaching the barrier
+        after they are removed would wait for the outcome until its timeout.
+        """
+        for path in [self.outcome_file, self.lock.lock_file]:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                LOGGER.warning("Failed to clean barrier file %s: %s", path, str(e))
+
+    def _write_outcome(self, status: str, message: str = ""):
+        with open(self.outcome_file, "w") as outcome_file:
+            json.dump({"status": status, "message": message}, outcome_file)
+
+    def _read_outcome(self) -> Optional[dict]:
+        if not os.path.exists(self.outcome_file):
+            return None
+        with open(self.outcome_file) as outcome_file:
+            return json.load(outcome_file)
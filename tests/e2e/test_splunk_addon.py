@@ -121,6 +121,68 @@ def test_splunk_connection_docker(testdir, request):
     assert result.ret == 0
 
 
+test_field_search_aggregator = """
+        from pytest_splunk_addon.fields_tests import FieldSearchAggregator
+
+        def fields_group(fields):
+            return {"stanza_type": "sourcetype", "stanza": "splunkd", "fields": fields}
+
+        def test_field_search_aggregator(splunk_search_util):
+            splunk_search_util.search_index = "_internal"
+            splunk_search_util.search_retry = 0
+            groups = [
+                fields_group([]),
+                fields_group([{"name": "component"}]),
+                fields_group([{"name": "log_level"}, {"name": "component"}]),
+                fields_group(
+                    [{"name": "component", "expected_values": ["psa_no_such_value"]}]
+                ),
+            ]
+            aggregator = FieldSearchAggregator(
+                splunk_search_util, groups, max_conditions=2
+            )
+            counts = [aggregator.get_count(group) for group in groups]
+            assert counts[0] > 0
+            assert counts[1] > 0
+            assert counts[2] > 0
+            assert counts[3] == 0
+            # Each count agrees with the search of the test alone
+            for group, count in zip(groups, counts):
+                assert splunk_search_util.checkQueryCountIsGreaterThanZero(
+                    aggregator.get_test_search(group), interval=1, retries=1
+                ) == (count > 0)
+    """
+
+
+@pytest.mark.docker
+@pytest.mark.splunk_field_search_aggregator
+def test_splunk_field_search_aggregator(testdir, request):
+    """Make sure that the coalesced searches of test_props_fields run on Splunk."""
+
+    testdir.makepyfile(test_field_search_aggregator)
+
+    shutil.copytree(
+        os.path.join(testdir.request.fspath.dirname, "addons/TA_fiction"),
+        os.path.join(testdir.tmpdir, "package"),
+    )
+
+    setup_test_dir(testdir)
+    SampleGenerator.clean_samples()
+    Rule.clean_rules()
+
+    # run pytest with the following cmd args
+    result = testdir.runpytest(
+        f"--splunk-version={request.config.getoption('splunk_version')}",
+        "--splunk-type=docker",
+        "-v",
+    )
+
+    result.assert_outcomes(passed=1, failed=0)
+
+    # make sure that we get a '0' exit code for the testsuite
+    assert result.ret == 0
+
+
 @pytest.mark.docker
 @pytest.mark.splunk_app_fiction
 def test_splunk_app_fiction(testdir, request):
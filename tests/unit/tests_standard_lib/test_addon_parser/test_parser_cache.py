@@ -17,12 +17,18 @@
 Unit tests for ParserCache.
 """
 import os
+import shutil
 import tempfile
 from unittest.mock import patch
 
 import pytest
 
-from pytest_splunk_addon.addon_parser.parser_cache import ParserCache
+from pytest_splunk_addon.addon_parser.parser_cache import (
+    MEMO,
+    ParserCache,
+    ParserCacheMemo,
+    get_addon_content_hash,
+)
 
 
 class TestParserCacheNoXdist:
@@ -34,7 +40,7 @@ class TestParserCacheNoXdist:
             # Ensure no xdist env var
             os.environ.pop("PYTEST_XDIST_TESTRUNUID", None)
             cache = ParserCache()
-            assert cache._cache_file is None
+            assert cache._shard_dir is None
             assert cache._cache_lock is None
 
     def test_get_or_parse_no_xdist(self):
@@ -72,23 +78,23 @@ class TestParserCacheWithXdist:
     @pytest.fixture
     def cache(self, xdist_env):
         """Create a ParserCache with xdist enabled."""
+        MEMO.clear()
         cache = ParserCache()
         yield cache
+        MEMO.clear()
         # Cleanup
-        if cache._cache_file and os.path.exists(cache._cache_file):
-            os.remove(cache._cache_file)
-        if cache._cache_hash_file and os.path.exists(cache._cache_hash_file):
-            os.remove(cache._cache_hash_file)
-        lock_file = f"{cache._cache_file}.lock" if cache._cache_file else None
+        if cache._shard_dir and os.path.exists(cache._shard_dir):
+            shutil.rmtree(cache._shard_dir)
+        lock_file = f"{cache._shard_dir}.lock" if cache._shard_dir else None
         if lock_file and os.path.exists(lock_file):
             os.remove(lock_file)
 
     def test_init_with_xdist(self, xdist_env):
         """Cache should be initialized when PYTEST_XDIST_TESTRUNUID is set."""
         cache = ParserCache()
-        assert cache._cache_file is not None
+        assert cache._shard_dir is not None
         assert cache._cache_lock is not None
-        assert "test_run_123" in cache._cache_file
+        assert "test_run_123" in cache._shard_dir
 
     def test_get_or_parse_caches_result(self, cache):
         """get_or_parse should cache the result and return it on subsequent calls."""
@@ -143,16 +149,213 @@ class TestParserCacheWithXdist:
 
     def test_is_cache_file_valid_accepts_inside_dir(self, cache):
         """Cache file validation should accept files inside cache dir."""
-        # The cache file itself should be valid once created
-        cache._save_cached_data({"test": "data"})
-        assert cache._is_cache_file_valid(cache._cache_file)
+        # The shard file of the key should be valid once created
+        cache._save_cached_data("test", {"test": "data"})
+        assert cache._is_cache_file_valid(cache._get_key_path("test"))
 
     def test_get_cached_data_returns_none_for_missing_file(self, cache):
-        """get_cached_data should return None if cache file doesn't exist."""
-        assert cache.get_cached_data() is None
+        """get_cached_data should return None if the shard file doesn't exist."""
+        assert cache.get_cached_data("test") is None
 
     def test_get_cached_data_returns_none_for_missing_hash(self, cache):
-        """get_cached_data should return None if hash file is missing."""
-        # Create cache file without hash file
-        cache._write_atomic(cache._cache_file, b"test data")
-        assert cache.get_cached_data() is None
+        """get_cached_data should return None if the shard has no valid hash."""
+        # Create shard file without hash
+        cache._write_atomic(cache._get_key_path("test"), b"test data")
+        assert cache.get_cached_data("test") is None
+
+    def test_get_cached_data_returns_none_for_hash_mismatch(self, cache):
+        """get_cached_data should return None if the shard is corrupted."""
+        cache._save_cached_data("test", {"test": "data"})
+        key_path = cache._get_key_path("test")
+        with open(key_path, "rb") as f:
+            shard_bytes = f.read()
+        cache._write_atomic(key_path, shard_bytes[:-1] + b"x")
+        assert cache.get_cached_data("test") is None
+
+    def test_keys_are_stored_in_separate_shards(self, cache):
+        """Every key should be stored in its own shard file."""
+        cache.get_or_parse(lambda: {"type": "a"}, "pytest_params::fixture_a")
+        cache.get_or_parse(lambda: {"type": "b"}, "pytest_params::fixture_b")
+        key_path_a = cache._get_key_path("pytest_params::fixture_a")
+        key_path_b = cache._get_key_path("pytest_params::fixture_b")
+        assert key_path_a != key_path_b
+        assert os.path.dirname(key_path_a) == cache._shard_dir
+        assert cache.get_cached_data("pytest_params::fixture_a") == {
+            "pytest_params::fixture_a": {"type": "a"}
+        }
+        assert cache.get_cached_data("pytest_params::fixture_b") == {
+            "pytest_params::fixture_b": {"type": "b"}
+        }
+
+    def test_get_or_parse_shared_between_workers(self, cache, xdist_env):
+        """Another worker should load the shard from disk once."""
+        cache.get_or_parse(lambda: {"data": "parsed"}, "my_key")
+        # Another worker process does not share the memo
+        MEMO.clear()
+        with patch.object(
+            ParserCache, "get_cached_data", autospec=True
+        ) as get_cached_data:
+            get_cached_data.side_effect = lambda self, key: {key: {"data": "parsed"}}
+            for _ in range(3):
+                # A cache instance is created for every fixture
+                assert ParserCache().get_or_parse(
+                    lambda: {"data": "new"}, "my_key"
+                ) == {"data": "parsed"}
+        get_cached_data.assert_called_once()
+
+    def test_get_or_parse_reloads_replaced_shard(self, cache):
+        """A shard replaced on disk should not be served from the memo."""
+        cache.get_or_parse(lambda: {"data": "parsed"}, "my_key")
+        cache._save_cached_data("my_key", {"data": "replaced"})
+        assert cache.get_or_parse(lambda: {"data": "new"}, "my_key") == {
+            "data": "replaced"
+        }
+
+    def test_cleanup_cache(self, cache):
+        """The first worker should remove the shards on exit."""
+        cache.get_or_parse(lambda: {"data": "parsed"}, "my_key")
+        with patch(
+            "pytest_splunk_addon.addon_parser.parser_cache.utils.check_first_worker",
+            return_value=True,
+        ):
+            cache._cleanup_cache()
+        assert not os.path.exists(cache._shard_dir)
+
+
+class TestParserCacheMemo:
+    """Tests for the process-local LRU memo."""
+
+    def test_get_put(self):
+        memo = ParserCacheMemo()
+        assert memo.get("path", (1, 2, 3)) == (False, None)
+        memo.put("path", (1, 2, 3), None)
+        assert memo.get("path", (1, 2, 3)) == (True, None)
+        assert memo.get("path", (1, 2, 4)) == (False, None)
+
+    def test_least_recently_used_is_evicted(self):
+        memo = ParserCacheMemo(max_entries=2)
+        memo.put("a", (1,), "a")
+        memo.put("b", (1,), "b")
+        memo.get("a", (1,))
+        memo.put("c", (1,), "c")
+        assert memo.get("a", (1,)) == (True, "a")
+        assert memo.get("b", (1,)) == (False, None)
+        assert memo.get("c", (1,)) == (True, "c")
+
+    def test_clear(self):
+        memo = ParserCacheMemo()
+        memo.put("a", (1,), "a")
+        memo.clear()
+        assert memo.get("a", (1,)) == (False, None)
+
+
+class TestPersistentParserCache:
+    """Tests for the parser cache kept across sessions."""
+
+    @pytest.fixture
+    def persistent_cache(self, monkeypatch, tmp_path):
+        """Enable the persistent cache without xdist."""
+        monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+        monkeypatch.setattr(ParserCache, "persistent_dir", None)
+        monkeypatch.setattr(ParserCache, "persist_event_keys", False)
+        MEMO.clear()
+
+        def enable(persist_event_keys=False):
+            ParserCache.enable_persistent_cache(
+                str(tmp_path / "cache"), "content_hash", persist_event_keys
+            )
+            return ParserCache()
+
+        yield enable
+        MEMO.clear()
+
+    def test_get_or_parse_across_sessions(self, persistent_cache):
+        """Parsed data should be loaded from disk in the next session."""
+        cache = persistent_cache()
+        assert cache.get_or_parse(lambda: {"data": "parsed"}, "props") == {
+            "data": "parsed"
+        }
+        # A new session does not share the memo
+        MEMO.clear()
+        assert ParserCache().get_or_parse(lambda: {"data": "new"}, "props") == {
+            "data": "parsed"
+        }
+        assert cache._get_key_path("props").startswith(ParserCache.persistent_dir)
+
+    def test_event_keys_are_not_persisted(self, persistent_cache):
+        """Tests generated from new events should not be kept across sessions."""
+        cache = persistent_cache()
+        assert cache._get_key_path("pytest_params::fixture") is None
+        assert cache._get_key_path("tests::fixture") is None
+        assert cache.get_or_parse(lambda: ["parsed"], "tests::fixture") == ["parsed"]
+        assert cache.get_or_parse(lambda: ["new"], "tests::fixture") == ["new"]
+
+    def test_event_keys_are_persisted_for_pregenerated_events(self, persistent_cache):
+        """Tests generated from pregenerated events should be kept across sessions."""
+        cache = persistent_cache(persist_event_keys=True)
+        cache.get_or_parse(lambda: ["parsed"], "tests::fixture")
+        MEMO.clear()
+        assert cache.get_or_parse(lambda: ["new"], "tests::fixture") == ["parsed"]
+
+
+class TestAddonContentHash:
+    """Tests for the content hash the persistent cache is keyed by."""
+
+    @pytest.fixture
+    def addon(self, tmp_path):
+        (tmp_path / "default").mkdir()
+        (tmp_path / "default" / "props.conf").write_text("[sourcetype]\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "pytest-splunk-addon-data.conf").write_text(
+            "[sample.log]\n"
+        )
+        (tmp_path / "samples").mkdir()
+        (tmp_path / "samples" / "sample.log").write_text("event\n")
+        (tmp_path / "lookups").mkdir()
+        (tmp_path / "lookups" / "lookup.csv").write_text("field,output\n")
+        return tmp_path
+
+    def get_hash(self, addon, **kwargs):
+        return get_addon_content_hash(str(addon), str(addon / "tests"), **kwargs)
+
+    def test_hash_is_stable(self, addon):
+        assert self.get_hash(addon) == self.get_hash(addon)
+
+    @pytest.mark.parametrize(
+        "changed_file",
+        [
+            "default/props.conf",
+            "tests/pytest-splunk-addon-data.conf",
+            "samples/sample.log",
+            "lookups/lookup.csv",
+        ],
+    )
+    def test_hash_changes_with_content(self, addon, changed_file):
+        content_hash = self.get_hash(addon)
+        (addon / changed_file).write_text("changed\n")
+        assert self.get_hash(addon) != content_hash
+
+    def test_hash_changes_with_new_sample(self, addon):
+        content_hash = self.get_hash(addon)
+        (addon / "samples" / "other.log").write_text("event\n")
+        assert self.get_hash(addon) != content_hash
+
+    def test_hash_changes_with_plugin_version(self, addon):
+        content_hash = self.get_hash(addon)
+        with patch(
+            "pytest_splunk_addon.addon_parser.parser_cache.__version__", "0.0.0"
+        ):
+            assert self.get_hash(addon) != content_hash
+
+    def test_hash_changes_with_extra_values(self, addon):
+        assert self.get_hash(addon, extra_values=[True]) != self.get_hash(
+            addon, extra_values=[False]
+        )
+
+    def test_hash_changes_with_extra_dirs_content(self, addon, tmp_path_factory):
+        data_models = tmp_path_factory.mktemp("data_models")
+        (data_models / "Network_Traffic.json").write_text("{}")
+        content_hash = self.get_hash(addon, extra_dirs=[str(data_models)])
+        assert content_hash != self.get_hash(addon)
+        (data_models / "Network_Traffic.json").write_text('{"objects": []}')
+        assert self.get_hash(addon, extra_dirs=[str(data_models)]) != content_hash
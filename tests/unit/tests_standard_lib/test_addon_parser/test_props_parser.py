@@ -205,3 +205,26 @@ def test_get_props_method_unknown_classname(default_props_parser):
 def test_no_props_config_file():
     props_parser = PropsParser("unused_path")
     assert props_parser.props is None
+
+
+def test_get_single_line_sourcetypes():
+    props_parser = PropsParser(
+        "fake_path",
+        {
+            "single_line": {"SHOULD_LINEMERGE": "false"},
+            "single_line_breaker": {
+                "SHOULD_LINEMERGE": "0",
+                "LINE_BREAKER": r"([\r\n]+)",
+            },
+            "line_merge": {"LINE_BREAKER": r"([\r\n]+)"},
+            "custom_breaker": {
+                "SHOULD_LINEMERGE": "false",
+                "LINE_BREAKER": r"([\r\n]+)\d{4}-",
+            },
+            "source::...test.log": {"SHOULD_LINEMERGE": "false"},
+        },
+    )
+    assert props_parser.get_single_line_sourcetypes() == {
+        "single_line",
+        "single_line_breaker",
+    }
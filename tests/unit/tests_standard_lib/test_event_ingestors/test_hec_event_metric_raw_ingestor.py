@@ -1,4 +1,6 @@
+import copy
 import pytest
+from unittest.mock import MagicMock
 from pytest_splunk_addon.event_ingestors.hec_event_ingestor import (
     HECEventIngestor,
 )
@@ -6,6 +8,7 @@ from pytest_splunk_addon.event_ingestors.hec_metric_ingestor import (
     HECMetricEventIngestor,
 )
 from pytest_splunk_addon.event_ingestors.hec_raw_ingestor import (
+    DEFAULT_SOURCETYPE,
     HECRawEventIngestor,
 )
 from urllib.parse import unquote
@@ -32,6 +35,17 @@ def hec_raw_event_ingestor():
     return HECRawEventIngestor({"session_headers": HEADERS, "splunk_hec_uri": HEC_URI})
 
 
+@pytest.fixture()
+def hec_raw_batch_ingestor():
+    return HECRawEventIngestor(
+        {
+            "session_headers": HEADERS,
+            "splunk_hec_uri": HEC_URI,
+            "batch_sourcetypes": {DEFAULT_SOURCETYPE},
+        }
+    )
+
+
 @pytest.fixture()
 def ingestors(
     hec_event_ingestor,
@@ -104,3 +118,124 @@ def test_exception_raised_when_event_ingestion_returns_error(
             f"\n\nAn error occurred while data ingestion.\nStatus code: 404 \nReason: None \ntext:Not Found"
             in caplog.messages
         )
+
+
+def test_raw_events_with_same_params_are_batched(
+    requests_mock, hec_raw_batch_ingestor, file_monitor_events
+):
+    requests_mock.post(f"{HEC_URI}/raw", request_headers=HEADERS)
+    events = file_monitor_events[2:] * 3
+    hec_raw_batch_ingestor.ingest(events, 1)
+    assert requests_mock.call_count == 1
+    assert requests_mock.request_history[0].text == "\n".join(
+        [file_monitor_events[2].event] * 3
+    )
+
+
+def test_raw_events_of_line_merged_sourcetypes_are_not_batched(
+    requests_mock, hec_raw_event_ingestor, file_monitor_events
+):
+    requests_mock.post(f"{HEC_URI}/raw", request_headers=HEADERS)
+    hec_raw_event_ingestor.ingest(file_monitor_events[2:] * 3, 1)
+    assert requests_mock.call_count == 3
+    assert all(
+        req.text == file_monitor_events[2].event
+        for req in requests_mock.request_history
+    )
+
+
+def test_raw_events_with_breaker_are_not_batched(
+    requests_mock, hec_raw_batch_ingestor, file_monitor_events
+):
+    requests_mock.post(f"{HEC_URI}/raw", request_headers=HEADERS)
+    event = file_monitor_events[2]
+    event.metadata["breaker"] = r"^\d{4}"
+    hec_raw_batch_ingestor.ingest([event] * 3, 1)
+    assert requests_mock.call_count == 3
+    assert all(req.text == event.event for req in requests_mock.request_history)
+
+
+@pytest.mark.parametrize("raw_event", ["line 1\nline 2", b"line 1\nline 2"])
+def test_multiline_raw_events_are_not_batched(
+    requests_mock, hec_raw_batch_ingestor, file_monitor_events, raw_event
+):
+    requests_mock.post(f"{HEC_URI}/raw", request_headers=HEADERS)
+    single_line_event = file_monitor_events[2]
+    multiline_event = copy.copy(single_line_event)
+    multiline_event.event = raw_event
+    hec_raw_batch_ingestor.ingest(
+        [single_line_event, multiline_event, single_line_event, multiline_event], 1
+    )
+    assert requests_mock.call_count == 3
+    assert sorted(req.text for req in requests_mock.request_history) == sorted(
+        ["\n".join([single_line_event.event] * 2)] + ["line 1\nline 2"] * 2
+    )
+
+
+@pytest.mark.parametrize(
+    "raw_events, event_count, max_bytes, expected",
+    [
+        (["a", "b", "c"], 2, 100, ["a\nb", "c"]),
+        (["aaaa", "bbbb", "cccc"], 10, 9, ["aaaa\nbbbb", "cccc"]),
+        ([b"a", b"b"], 10, 100, [b"a\nb"]),
+        (["a" * 10], 10, 5, ["a" * 10]),
+    ],
+)
+def test_raw_events_batches_are_bounded(raw_events, event_count, max_bytes, expected):
+    batches = HECRawEventIngestor.get_batches(raw_events, event_count, max_bytes)
+    assert [HECRawEventIngestor.join_events(batch) for batch in batches] == expected
+
+
+@pytest.mark.parametrize(
+    "batch_size, call_count",
+    [(1, 3), (2, 2), (100, 1)],
+)
+def test_hec_event_batch_size_is_configurable(
+    requests_mock, modinput_events, batch_size, call_count
+):
+    requests_mock.post(f"{HEC_URI}/event", request_headers=HEADERS)
+    ingestor = HECEventIngestor(
+        {
+            "session_headers": HEADERS,
+            "splunk_hec_uri": HEC_URI,
+            "hec_batch_size": batch_size,
+        }
+    )
+    ingestor.ingest(modinput_events, 2)
+    assert requests_mock.call_count == call_count
+
+
+def test_hec_request_is_retried_when_server_is_busy(
+    monkeypatch, requests_mock, hec_raw_event_ingestor, file_monitor_events
+):
+    sleep_mock = MagicMock()
+    monkeypatch.setattr(
+        "pytest_splunk_addon.event_ingestors.hec_backoff.sleep", sleep_mock
+    )
+    requests_mock.post(
+        f"{HEC_URI}/raw",
+        [
+            {"status_code": 503, "text": "Server is busy"},
+            {"status_code": 503, "text": "Server is busy"},
+            {"status_code": 200},
+        ],
+    )
+    hec_raw_event_ingestor.ingest(file_monitor_events[2:], 1)
+    assert requests_mock.call_count == 3
+    assert [each.args[0] for each in sleep_mock.call_args_list] == [1, 2]
+    assert hec_raw_event_ingestor.backoff.delay == 1
+
+
+def test_exception_raised_when_server_stays_busy(
+    monkeypatch, requests_mock, hec_raw_event_ingestor, file_monitor_events, caplog
+):
+    monkeypatch.setattr(
+        "pytest_splunk_addon.event_ingestors.hec_backoff.sleep", MagicMock()
+    )
+    requests_mock.post(f"{HEC_URI}/raw", text="Server is busy", status_code=503)
+    with pytest.raises(Exception, match="An error occurred while data ingestion"):
+        hec_raw_event_ingestor.ingest(file_monitor_events[2:], 1)
+    assert requests_mock.call_count == hec_raw_event_ingestor.backoff.max_retries + 1
+    retries = [each for each in caplog.messages if "retry" in each]
+    assert retries[-1] == "HEC server is busy, retry 10/10 in 30 seconds"
+    assert "HEC server is still busy after 10 retries" in caplog.messages
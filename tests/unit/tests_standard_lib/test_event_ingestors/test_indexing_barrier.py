@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from pytest_splunk_addon.event_ingestors.indexing_barrier import IndexingBarrier
+
+BARRIER_PATH = "pytest_splunk_addon.event_ingestors.indexing_barrier"
+
+
+@pytest.fixture()
+def search_util():
+    search_util = MagicMock()
+    search_util.search_index = "main,fake_index"
+    return search_util
+
+
+@pytest.fixture()
+def sleep_mock():
+    with patch(f"{BARRIER_PATH}.sleep") as sleep_mock:
+        yield sleep_mock
+
+
+def test_query_counts_events_of_sample(search_util):
+    barrier = IndexingBarrier(search_util, 10, 1)
+    assert barrier.get_query(
+        {"sourcetype": "test:sourcetype", "host": {"host_2", "host_1"}}
+    ) == (
+        "search (index=main OR index=fake_index) sourcetype=test:sourcetype "
+        'host IN ("host_1","host_2") | stats count'
+    )
+
+
+def test_wait_returns_when_all_events_are_searchable(
+    search_util, sleep_mock, modinput_events
+):
+    search_util.getFieldValuesList.side_effect = [
+        iter([{"count": "0"}]),
+        iter([{"count": "1"}]),
+        iter([{"count": "2"}]),
+    ]
+    barrier = IndexingBarrier(search_util, 60, 5)
+    assert barrier.wait(modinput_events) is True
+    assert search_util.getFieldValuesList.call_count == 3
+    sleep_mock.assert_called_once_with(5)
+
+
+def test_wait_returns_false_on_timeout(search_util, sleep_mock, modinput_events):
+    search_util.getFieldValuesList.side_effect = lambda *args, **kwargs: iter(
+        [{"count": "0"}]
+    )
+    with patch(f"{BARRIER_PATH}.time", side_effect=[0, 4, 8]):
+        barrier = IndexingBarrier(search_util, 10, 4)
+        assert barrier.wait(modinput_events[:2]) is False
+    sleep_mock.assert_called_once_with(4)
@@ -1,6 +1,6 @@
 import importlib
 import pytest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, call, ANY
 import pytest_splunk_addon.event_ingestors as event_ingestors
 
 
@@ -72,6 +72,19 @@ def sample_mock(monkeypatch, tokenized_events):
     return sample_mock
 
 
+@pytest.fixture(autouse=True)
+def props_parser_mock(monkeypatch):
+    props_parser_mock = MagicMock()
+    props_parser_mock.return_value.get_single_line_sourcetypes.return_value = {
+        "test:sourcetype"
+    }
+    monkeypatch.setattr(
+        "pytest_splunk_addon.event_ingestors.ingestor_helper.PropsParser",
+        props_parser_mock,
+    )
+    return props_parser_mock
+
+
 @pytest.fixture()
 def requirement_mock(monkeypatch, requirement_events):
     req_mock = MagicMock()
@@ -122,7 +135,11 @@ def test_non_implemented_ingestor_can_not_be_obtained(ingestor_helper, ingest_me
 
 
 def test_events_can_be_ingested(
-    get_ingestor_mock, sample_mock, file_monitor_events, modinput_events
+    get_ingestor_mock,
+    sample_mock,
+    props_parser_mock,
+    file_monitor_events,
+    modinput_events,
 ):
     event_ingestors.ingestor_helper.IngestorHelper.ingest_events(
         ingest_meta_data={"splunk_ep": False},
@@ -131,17 +148,32 @@ def test_events_can_be_ingested(
         thread_count=20,
         store_events=False,
     )
+    props_parser_mock.assert_called_once_with("fake_path")
     assert get_ingestor_mock.call_count == 2
     get_ingestor_mock.assert_has_calls(
         [
-            call("file_monitor", {"splunk_ep": False}),
-            call("modinput", {"splunk_ep": False}),
+            call(
+                "file_monitor",
+                {
+                    "splunk_ep": False,
+                    "http_session": ANY,
+                    "batch_sourcetypes": {"test:sourcetype"},
+                },
+            ),
+            call(
+                "modinput",
+                {
+                    "splunk_ep": False,
+                    "http_session": ANY,
+                    "batch_sourcetypes": {"test:sourcetype"},
+                },
+            ),
         ],
         any_order=True,
     )
     assert get_ingestor_mock.ingest.call_count == 2
     get_ingestor_mock.ingest.assert_has_calls(
-        [call(file_monitor_events, 20), call(modinput_events, 20)]
+        [call(file_monitor_events, 10), call(modinput_events, 10)], any_order=True
     )
 
 
@@ -166,8 +198,22 @@ def test_all_events_ingested_when_splunk_ep_enabled(
     assert get_ingestor_mock.call_count == 2
     get_ingestor_mock.assert_has_calls(
         [
-            call("file_monitor", {"splunk_ep": True}),
-            call("modinput", {"splunk_ep": True}),
+            call(
+                "file_monitor",
+                {
+                    "splunk_ep": True,
+                    "http_session": ANY,
+                    "batch_sourcetypes": {"test:sourcetype"},
+                },
+            ),
+            call(
+                "modinput",
+                {
+                    "splunk_ep": True,
+                    "http_session": ANY,
+                    "batch_sourcetypes": {"test:sourcetype"},
+                },
+            ),
         ],
         any_order=True,
     )
@@ -175,5 +221,71 @@ def test_all_events_ingested_when_splunk_ep_enabled(
     # ALL events should be ingested
     assert get_ingestor_mock.ingest.call_count == 2
     get_ingestor_mock.ingest.assert_has_calls(
-        [call(file_monitor_events, 20), call(modinput_events, 20)]
+        [call(file_monitor_events, 10), call(modinput_events, 10)], any_order=True
+    )
+
+
+def test_http_session_is_shared_between_ingestors(
+    get_ingestor_mock, sample_mock, file_monitor_events, modinput_events
+):
+    event_ingestors.ingestor_helper.IngestorHelper.ingest_events(
+        ingest_meta_data={"splunk_ep": False},
+        addon_path="fake_path",
+        config_path="tests/unit/event_ingestors",
+        thread_count=5,
+        store_events=False,
+    )
+    sessions = {
+        id(each_call.args[1]["http_session"])
+        for each_call in get_ingestor_mock.call_args_list
+    }
+    assert len(sessions) == 1
+
+
+def test_http_session_pool_is_sized_to_thread_count():
+    http_session = event_ingestors.ingestor_helper.IngestorHelper.get_http_session(5)
+    adapter = http_session.get_adapter("https://127.0.0.1:8088")
+    assert adapter._pool_maxsize == 5
+    http_session.close()
+
+
+def test_errors_of_all_ingestors_are_aggregated(
+    get_ingestor_mock, sample_mock, file_monitor_events, modinput_events
+):
+    get_ingestor_mock.ingest.side_effect = [
+        Exception("first failure"),
+        Exception("second failure"),
+    ]
+    with pytest.raises(Exception) as exc_info:
+        event_ingestors.ingestor_helper.IngestorHelper.ingest_events(
+            ingest_meta_data={"splunk_ep": False},
+            addon_path="fake_path",
+            config_path="tests/unit/event_ingestors",
+            thread_count=20,
+            store_events=False,
+        )
+    assert get_ingestor_mock.ingest.call_count == 2
+    assert "Ingestion failed for the following input types" in str(exc_info.value)
+    assert "file_monitor: " in str(exc_info.value)
+    assert "modinput: " in str(exc_info.value)
+
+
+def test_failing_ingestor_does_not_stop_other_ingestors(
+    get_ingestor_mock, sample_mock, file_monitor_events, modinput_events
+):
+    def ingest(events, thread_count):
+        if events[0].metadata["input_type"] == "file_monitor":
+            raise Exception("file monitor failure")
+
+    get_ingestor_mock.ingest.side_effect = ingest
+    with pytest.raises(Exception, match="file_monitor: file monitor failure"):
+        event_ingestors.ingestor_helper.IngestorHelper.ingest_events(
+            ingest_meta_data={"splunk_ep": False},
+            addon_path="fake_path",
+            config_path="tests/unit/event_ingestors",
+            thread_count=1,
+            store_events=False,
+        )
+    get_ingestor_mock.ingest.assert_has_calls(
+        [call(file_monitor_events, 1), call(modinput_events, 1)], any_order=True
     )
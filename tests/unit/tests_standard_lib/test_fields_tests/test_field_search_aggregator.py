@@ -0,0 +1,156 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from pytest_splunk_addon.fields_tests.field_search_aggregator import (
+    FieldSearchAggregator,
+    get_fields_condition,
+)
+
+AGGREGATOR_PATH = "pytest_splunk_addon.fields_tests.field_search_aggregator"
+
+
+def fields_group(stanza="test:sourcetype", stanza_type="sourcetype", fields=()):
+    return {
+        "stanza": stanza,
+        "stanza_type": stanza_type,
+        "classname": "EXTRACT-test",
+        "fields": list(fields),
+    }
+
+
+STANZA_GROUP = fields_group()
+ACTION_GROUP = fields_group(fields=[{"name": "action"}])
+USER_GROUP = fields_group(
+    fields=[
+        {"name": "user", "expected_values": ["admin", 'a"b'], "negative_values": []},
+        {"name": "action"},
+    ]
+)
+SOURCE_GROUP = fields_group("/var/log/test.log", "source", [{"name": "src"}])
+
+
+@pytest.fixture()
+def search_util():
+    search_util = MagicMock()
+    search_util.search_index = "main,fake_index"
+    search_util.search_retry = 2
+    search_util.search_interval = 5
+    return search_util
+
+
+@pytest.fixture()
+def sleep_mock():
+    with patch(f"{AGGREGATOR_PATH}.sleep") as sleep_mock:
+        yield sleep_mock
+
+
+def test_get_fields_condition():
+    assert get_fields_condition(STANZA_GROUP) == ""
+    assert get_fields_condition(USER_GROUP) == (
+        '(user IN ("admin", "a"b") AND NOT user IN ())'
+        ' AND (action IN ("*") AND NOT action IN ("-", ""))'
+    )
+
+
+def test_get_test_search(search_util):
+    aggregator = FieldSearchAggregator(search_util, [])
+    assert aggregator.get_test_search(STANZA_GROUP) == (
+        'search (index=main OR index=fake_index) sourcetype="test:sourcetype"'
+        " | stats count by sourcetype"
+    )
+    assert aggregator.get_test_search(ACTION_GROUP) == (
+        'search (index=main OR index=fake_index) sourcetype="test:sourcetype"'
+        ' AND (action IN ("*") AND NOT action IN ("-", "")) | stats count by sourcetype'
+    )
+
+
+def test_get_search(search_util):
+    aggregator = FieldSearchAggregator(search_util, [])
+    assert aggregator.get_search(
+        ("sourcetype", "test:sourcetype"),
+        ["", get_fields_condition(ACTION_GROUP), 'x IN ("a\\b")'],
+    ) == (
+        'search (index=main OR index=fake_index) sourcetype="test:sourcetype"'
+        " | stats count AS condition_0,"
+        ' count(eval(if(searchmatch("(action IN (\\"*\\") AND NOT action IN'
+        ' (\\"-\\", \\"\\"))"), 1, null()))) AS condition_1,'
+        ' count(eval(if(searchmatch("x IN (\\"a\\\\b\\")"), 1, null()))) AS condition_2'
+    )
+
+
+def test_get_search_lists_fields(search_util):
+    aggregator = FieldSearchAggregator(
+        search_util, [STANZA_GROUP, ACTION_GROUP, USER_GROUP, SOURCE_GROUP]
+    )
+    stanza_key = ("sourcetype", "test:sourcetype")
+    aggregator.add_stanza(stanza_key)
+    assert aggregator.get_search(stanza_key, [""]) == (
+        'search (index=main OR index=fake_index) sourcetype="test:sourcetype"'
+        " | fields action, user | stats count AS condition_0"
+    )
+
+
+def test_one_search_per_stanza(search_util, sleep_mock):
+    search_util.getFieldValuesList.side_effect = [
+        iter([{"condition_0": "10", "condition_1": "4", "condition_2": "2"}]),
+        iter([{"condition_0": "3"}]),
+    ]
+    aggregator = FieldSearchAggregator(
+        search_util,
+        [STANZA_GROUP, ACTION_GROUP, USER_GROUP, ACTION_GROUP, SOURCE_GROUP],
+    )
+    assert aggregator.get_count(USER_GROUP) == 2
+    assert aggregator.get_count(STANZA_GROUP) == 10
+    assert aggregator.get_count(ACTION_GROUP) == 4
+    assert search_util.getFieldValuesList.call_count == 1
+    assert "source=" not in search_util.getFieldValuesList.call_args.args[0]
+    assert aggregator.get_last_search(SOURCE_GROUP) is None
+    assert aggregator.get_count(SOURCE_GROUP) == 3
+    assert search_util.getFieldValuesList.call_count == 2
+    assert search_util.getFieldValuesList.call_args.args[0].startswith(
+        'search (index=main OR index=fake_index) source="/var/log/test.log"'
+        " | fields src | stats"
+    )
+    sleep_mock.assert_not_called()
+
+
+def test_retries_conditions_without_events(search_util, sleep_mock):
+    search_util.getFieldValuesList.side_effect = [
+        iter([{"condition_0": "10", "condition_1": "0", "condition_2": "0"}]),
+        iter([{"condition_0": "0", "condition_1": "1"}]),
+        iter([{"condition_0": "0"}]),
+    ]
+    aggregator = FieldSearchAggregator(
+        search_util, [STANZA_GROUP, ACTION_GROUP, USER_GROUP]
+    )
+    assert aggregator.get_count(STANZA_GROUP) == 10
+    assert aggregator.get_count(ACTION_GROUP) == 0
+    assert aggregator.get_count(USER_GROUP) == 1
+    searches = [call.args[0] for call in search_util.getFieldValuesList.call_args_list]
+    assert searches[1].count("condition_") == 2
+    assert searches[2].count("condition_") == 1
+    assert aggregator.get_last_search(STANZA_GROUP) == searches[0]
+    assert aggregator.get_last_search(ACTION_GROUP) == searches[2]
+    assert aggregator.get_last_search(USER_GROUP) == searches[1]
+    assert "action IN" in searches[2]
+    assert "user IN" not in searches[2]
+    assert sleep_mock.call_count == 2
+    sleep_mock.assert_called_with(5)
+
+
+def test_unknown_test_and_chunks(search_util, sleep_mock):
+    search_util.search_retry = 0
+    search_util.getFieldValuesList.side_effect = [
+        iter([{"condition_0": "1", "condition_1": "2"}]),
+        iter([{"condition_0": "3"}]),
+        iter([]),
+    ]
+    aggregator = FieldSearchAggregator(
+        search_util, [STANZA_GROUP, ACTION_GROUP, USER_GROUP], max_conditions=2
+    )
+    assert aggregator.get_count(USER_GROUP) == 3
+    assert search_util.getFieldValuesList.call_count == 2
+    other_group = fields_group(fields=[{"name": "dest"}])
+    assert aggregator.get_count(other_group) == 0
+    assert search_util.getFieldValuesList.call_count == 3
+    assert "dest IN" in search_util.getFieldValuesList.call_args.args[0]
@@ -495,6 +495,8 @@ def test_generate_field_tests(
                             "target_users": "dummy.user@splunk.com",
                         },
                         "modinput_params": {"sourcetype": "dummy_sourcetype"},
+                "sample_name": "file1.xml",
+                        "sample_name": "file1.xml",
                     },
                     "sample_name::file1.xml::host::dummy_host",
                 ),
@@ -508,6 +510,8 @@ def test_generate_field_tests(
                             "target_users": "dummy.user@splunk.com",
                         },
                         "modinput_params": {"sourcetype": "dummy_sourcetype"},
+                "sample_name": "file1.xml",
+                        "sample_name": "file1.xml",
                     },
                     "sample_name::file1.xml::host::dummy_host_syslog",
                 ),
@@ -571,6 +575,7 @@ def test_generate_requirement_tests_with_uuid(mock_uuid4):
                     "type": "event",
                 },
                 "modinput_params": {"sourcetype": "dummy_sourcetype"},
+                "sample_name": "file1.xml",
             },
             "sample_name::file1.xml::host::dummy_host",
         )
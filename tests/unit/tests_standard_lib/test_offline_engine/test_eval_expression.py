@@ -0,0 +1,94 @@
+import pytest
+
+from pytest_splunk_addon.offline_engine.eval_expression import (
+    EvalExpression,
+    UnknownValue,
+    UnsupportedExpression,
+)
+
+FIELDS = {
+    "action": "allowed",
+    "bytes_in": "10",
+    "bytes_out": "5",
+    "dest": ["10.0.0.1", "10.0.0.2"],
+    "user": "User@Example.com",
+}
+
+
+def get_field(name):
+    if name == "unknown_field":
+        raise UnknownValue(name)
+    return FIELDS.get(name)
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ('"test"', "test"),
+        ("action", "allowed"),
+        ("'bytes_in'", "10"),
+        ("bytes_in + bytes_out", "15"),
+        ("bytes_in * 2 - bytes_out / 5", "19"),
+        ('action . "-" . user', "allowed-User@Example.com"),
+        ('if(isnull(missing), "unknown", action)', "unknown"),
+        ('if(action == "allowed" AND bytes_in > 9, "yes", "no")', "yes"),
+        ('if(NOT action = "allowed" OR bytes_in < 2, "yes", "no")', "no"),
+        ('case(action="blocked", "deny", action="allowed", "allow")', "allow"),
+        ('case(action="blocked", "deny")', None),
+        ("coalesce(missing, bytes_out, bytes_in)", "5"),
+        ("lower(user)", "user@example.com"),
+        ('replace(user, "@(.*)", "_\\1")', "User_Example.com"),
+        ("substr(user, 1, 4)", "User"),
+        ('mvindex(split(user, "@"), -1)', "Example.com"),
+        ("mvcount(dest)", "2"),
+        ('mvjoin(dest, ",")', "10.0.0.1,10.0.0.2"),
+        ('if(cidrmatch("10.0.0.0/8", dest), "internal", "external")', "internal"),
+        ('if(action LIKE "allow%", 1, 0)', "1"),
+        ('if(in(action, "allowed", "blocked"), "known", "other")', "known"),
+        ("tonumber(bytes_in) + 1", "11"),
+        ("null()", None),
+        ("missing . action", None),
+        ('split(user, "@")', ["User", "Example.com"]),
+    ],
+)
+def test_evaluate(expression, expected):
+    assert EvalExpression(expression).evaluate(get_field) == expected
+
+
+def test_fields():
+    assert EvalExpression("if(isnull(a), b . \"x\", 'c d')").fields == {
+        "a",
+        "b",
+        "c d",
+    }
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        'strftime(_time, "%Y")',
+        "if(a, b",
+        "a b",
+        "1 +",
+        "a | b",
+    ],
+)
+def test_unsupported_expression(expression):
+    with pytest.raises(UnsupportedExpression):
+        EvalExpression(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["bytes_in / 3", 'tostring(bytes_in, "hex")', "isnull(action)"],
+)
+def test_unsupported_result(expression):
+    with pytest.raises(UnsupportedExpression):
+        EvalExpression(expression).evaluate(get_field)
+
+
+def test_unknown_field():
+    with pytest.raises(UnknownValue):
+        EvalExpression('if(isnull(unknown_field), "a", "b")').evaluate(get_field)
+    # Only the evaluated arguments are looked up
+    assert EvalExpression('if(true(), "a", unknown_field)').evaluate(get_field) == "a"
@@ -0,0 +1,181 @@
+import pytest
+from unittest.mock import patch
+
+from pytest_splunk_addon.offline_engine import OfflineFieldChecker, OfflineFieldEngine
+from pytest_splunk_addon.offline_engine.field_checker import matches_any
+from pytest_splunk_addon.sample_generation.indexed_events import IndexedEvents
+from pytest_splunk_addon.sample_generation.sample_event import SampleEvent
+
+PROPS = {
+    "test:sourcetype": {
+        "EXTRACT-action": r"action=(?<action>\w+)",
+        "EXTRACT-user": r"user=(?<user>\S+)",
+        "EXTRACT-dest": r"dest=(?<dest>\S+)",
+        "KV_MODE": "none",
+    },
+    "test:auto": {"EXTRACT-action": r"action=(?<action>\w+)"},
+}
+
+
+def make_event(raw, sourcetype="test:sourcetype", requirement_fields=None, **kwargs):
+    metadata = {"sourcetype": sourcetype, "source": "test.log", "host": "host"}
+    metadata.update(kwargs)
+    event = SampleEvent(
+        raw,
+        metadata,
+        "sample.log",
+        requirement_test_data={"cim_fields": requirement_fields}
+        if requirement_fields is not None
+        else None,
+    )
+    event.unique_identifier = None
+    return event
+
+
+def fields_group(*fields, stanza="test:sourcetype"):
+    return {
+        "stanza_type": "sourcetype",
+        "stanza": stanza,
+        "fields": [
+            {"name": name, "expected_values": expected, "negative_values": negative}
+            for name, expected, negative in fields
+        ],
+    }
+
+
+@pytest.fixture
+def checker(tmp_path):
+    def func(*events):
+        engine = OfflineFieldEngine(str(tmp_path), props=PROPS, transforms={})
+        return OfflineFieldChecker(engine, events)
+
+    return func
+
+
+@pytest.mark.parametrize(
+    "values, patterns, expected",
+    [
+        (["Allowed"], ["allowed"], True),
+        (["allowed"], ["*"], True),
+        (["blocked"], ["allow*", "deny"], False),
+        ([], ["*"], False),
+        (["a.b"], ["a?b"], False),
+    ],
+)
+def test_matches_any(values, patterns, expected):
+    assert matches_any(values, patterns) is expected
+
+
+def test_props_fields(checker):
+    offline_checker = checker(
+        make_event("action=blocked"), make_event("action=allowed user=admin")
+    )
+    assert offline_checker.check_props_fields(
+        fields_group(("action", ["*"], ["-", ""]), ("user", ["*"], ["-", ""]))
+    ).passed
+    result = offline_checker.check_props_fields(
+        fields_group(("dest", ["*"], ["-", ""]))
+    )
+    assert result.passed is False
+    assert "dest=[]" in result.message
+
+
+def test_props_fields_negative(checker):
+    offline_checker = checker(make_event("user=- action=allowed"))
+    result = offline_checker.check_props_fields_negative(
+        fields_group(("user", ["*"], ["-", ""]), ("action", ["*"], ["-", ""]))
+    )
+    assert result.passed is False
+    assert "user=['-']" in result.message
+    assert offline_checker.check_props_fields_negative(
+        fields_group(("action", ["*"], ["-", ""]))
+    ).passed
+
+
+def test_props_fields_unknown(checker):
+    offline_checker = checker(
+        make_event("action=allowed user=admin", "test:auto"),
+        make_event("action=allowed user=admin", input_type="syslog_tcp"),
+    )
+    result = offline_checker.check_props_fields(
+        fields_group(("user", ["*"], ["-", ""]), stanza="test:auto")
+    )
+    assert result.passed is None
+    assert "KV_MODE=auto" in result.message
+    assert (
+        offline_checker.check_props_fields(
+            fields_group(("user", ["*"], ["-", ""]))
+        ).passed
+        is None
+    )
+    assert offline_checker.check_props_fields(
+        fields_group(("user", ["*"], ["-", ""]), stanza="other")
+    ) == (None, "No generated event has sourcetype=other")
+
+
+def test_props_fields_sourcetype_to_search(checker):
+    offline_checker = checker(
+        make_event("action=allowed", "other", sourcetype_to_search="test:sourcetype")
+    )
+    assert offline_checker.check_props_fields(
+        fields_group(("action", ["allowed"], []))
+    ).passed
+
+
+def test_requirements_fields(checker):
+    event = make_event(
+        "action=allowed user=admin", requirement_fields={"action": "allowed"}
+    )
+    event.unique_identifier = "1234"
+    offline_checker = checker(event)
+    assert offline_checker.check_requirements_fields(
+        {"unique_identifier": "1234", "fields": {"action": "allowed", "user": "admin"}}
+    ).passed
+    result = offline_checker.check_requirements_fields(
+        {
+            "escaped_event": "action\\=allowed user\\=admin",
+            "fields": {"action": "blocked", "dest": "host"},
+        }
+    )
+    assert result.passed is False
+    assert "action='allowed', expected 'blocked'" in result.message
+    assert "dest=None, expected 'host'" in result.message
+    assert (
+        offline_checker.check_requirements_fields(
+            {"unique_identifier": "5678", "fields": {}}
+        ).passed
+        is None
+    )
+
+
+def test_indexed_events_read_by_stanza_and_sample(tmp_path):
+    events = [
+        make_event(
+            "action=allowed user=admin", requirement_fields={"action": "allowed"}
+        ),
+        make_event("action=blocked", "test:auto", requirement_fields={}),
+    ]
+    events[1].sample_name = "auto.log"
+    indexed_events = IndexedEvents.write(str(tmp_path / "events"), "conf", events)
+    engine = OfflineFieldEngine(str(tmp_path), props=PROPS, transforms={})
+    offline_checker = OfflineFieldChecker(engine, indexed_events)
+    with patch.object(
+        indexed_events, "_read_chunks", wraps=indexed_events._read_chunks
+    ) as read_mock:
+        assert offline_checker.check_props_fields(
+            fields_group(("action", ["blocked"], []), stanza="test:auto")
+        ).passed
+        assert offline_checker.check_props_fields_negative(
+            fields_group(("action", ["*"], ["allowed"]), stanza="test:auto")
+        ).passed
+        assert read_mock.call_count == 1
+        assert [chunk[0] for chunk in read_mock.call_args.args[0]] == ["auto.log"]
+        assert offline_checker.check_requirements_fields(
+            {
+                "escaped_event": "action\\=allowed user\\=admin",
+                "fields": {"action": "allowed"},
+                "sample_name": "sample.log",
+            }
+        ).passed
+        assert read_mock.call_count == 2
+        assert [chunk[0] for chunk in read_mock.call_args.args[0]] == ["sample.log"]
@@ -0,0 +1,172 @@
+import pytest
+
+from pytest_splunk_addon.offline_engine.field_engine import (
+    OfflineFieldEngine,
+    clean_key,
+    convert_regex,
+)
+
+PROPS = {
+    "test:sourcetype": {
+        "EXTRACT-one": r"user=(?<user>\w+)",
+        "EXTRACT-two": r"user=(?'first_user'\w+).*dest=(?P<dest>[^,\s]+)",
+        "EXTRACT-with_source_key": r"(?<user_initial>\w) in first_user",
+        "EXTRACT-after_report": r"(?<user_name>[^@]+)@ in email",
+        "EXTRACT-possessive": r"group=(?<group>\w++)(?i)",
+        "REPORT-kv": "test_key_value, test_delims",
+        "REPORT-format": "test_format",
+        "FIELDALIAS-user": "user AS src_user, missing AS action, user ASNEW dest",
+        "EVAL-vendor": '"Test"',
+        "EVAL-user": "upper(user)",
+        "EVAL-user_upper": "user",
+        "EVAL-time": 'strftime(_time, "%Y")',
+        "LOOKUP-status": "test_lookup code AS status_code OUTPUT description AS status",
+        "LOOKUP-external": "test_external code OUTPUTNEW category",
+        "KV_MODE": "none",
+    },
+    "source::.../test_*.log": {
+        "EVAL-vendor": '"Source"',
+    },
+    "test:json": {"KV_MODE": "json"},
+    "test:auto": {"EXTRACT-user": r"user=(?<user>\w+)"},
+}
+TRANSFORMS = {
+    "test_key_value": {"REGEX": r"(?<_KEY_1>[\w ]+):(?<_VAL_1>\d+)"},
+    "test_delims": {
+        "SOURCE_KEY": "pairs",
+        "DELIMS": '"|", "="',
+    },
+    "test_format": {
+        "REGEX": r"email=(\S+)@(\S+)",
+        "FORMAT": 'email::"$1@$2" domain::$2',
+    },
+    "test_lookup": {"filename": "status.csv", "case_sensitive_match": "false"},
+    "test_external": {"external_cmd": "lookup.py code"},
+}
+RAW = "user=admin dest=10.0.0.1 email=jdoe@example.com code=OK ,port count:42"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    (tmp_path / "lookups").mkdir()
+    (tmp_path / "lookups" / "status.csv").write_text(
+        "code,description\nok,Success\nerr,Failure\n"
+    )
+    return OfflineFieldEngine(str(tmp_path), props=PROPS, transforms=TRANSFORMS)
+
+
+def test_convert_regex():
+    assert (
+        convert_regex(r"(?<a>\d)(?'b'\w)(?P<c>.)(?<=x)(?<!y)")
+        == r"(?P<a>\d)(?P<b>\w)(?P<c>.)(?<=x)(?<!y)"
+    )
+
+
+def test_clean_key():
+    assert clean_key("12_Port Count-1") == "Port_Count_1"
+
+
+def test_extract(engine):
+    fields = engine.extract(RAW, "test:sourcetype", source="/var/log/other.log")
+    assert fields.get("first_user") == ["admin"]
+    assert fields.get("dest") == ["10.0.0.1"]
+    assert fields.get("user_initial") == ["a"]
+    # The EXTRACTs are applied before the REPORTs
+    assert fields.get("user_name") == []
+    assert fields.get("port_count") == ["42"]
+    assert fields.get("email") == ["jdoe@example.com"]
+    assert fields.get("domain") == ["example.com"]
+    assert fields.get("sourcetype") == ["test:sourcetype"]
+
+
+def test_unsupported_regex(engine):
+    fields = engine.extract(RAW, "test:sourcetype")
+    assert fields.get("group") is None
+    assert fields.get_reason("group").startswith("EXTRACT-possessive can not be")
+
+
+def test_fieldalias_and_eval(engine):
+    fields = engine.extract(RAW, "test:sourcetype", source="/var/log/other.log")
+    assert fields.get("src_user") == ["admin"]
+    assert fields.get("action") == []
+    # ASNEW does not overwrite dest
+    assert fields.get("dest") == ["10.0.0.1"]
+    assert fields.get("vendor") == ["Test"]
+    # The EVALs are evaluated from the fields before the EVALs
+    assert fields.get("user") == ["ADMIN"]
+    assert fields.get("user_upper") == ["admin"]
+    assert fields.get("time") is None
+
+
+def test_source_stanza(engine):
+    fields = engine.extract(RAW, "test:sourcetype", source="/var/log/test_1.log")
+    assert fields.get("vendor") == ["Source"]
+    fields = engine.extract(RAW, "test:sourcetype", source="/var/log/a/test_1.log")
+    assert fields.get("vendor") == ["Source"]
+    fields = engine.extract(RAW, "test:sourcetype", source="/var/log/test/1.log")
+    assert fields.get("vendor") == ["Test"]
+
+
+def test_lookup_without_input(engine):
+    fields = engine.extract(RAW, "test:sourcetype")
+    assert fields.get("status") == []
+    assert fields.get("category") is None
+    assert "filename" in fields.get_reason("category")
+
+
+def test_lookup(engine):
+    props = {
+        "test:sourcetype": {
+            "EXTRACT-code": r"code=(?<status_code>\w+)",
+            "LOOKUP-status": PROPS["test:sourcetype"]["LOOKUP-status"],
+            "KV_MODE": "none",
+        }
+    }
+    engine = OfflineFieldEngine(engine.splunk_app_path, props, TRANSFORMS)
+    assert engine.extract(RAW, "test:sourcetype").get("status") == ["Success"]
+    assert engine.extract("code=NONE", "test:sourcetype").get("status") == []
+
+
+def test_delims(engine):
+    fields = engine.extract(RAW, "test:sourcetype")
+    assert fields.get("pairs") == []
+    props = {
+        "test:sourcetype": {
+            "EXTRACT-pairs": r"pairs=(?<pairs>\S+)",
+            "REPORT-delims": "test_delims",
+            "KV_MODE": "none",
+        }
+    }
+    engine = OfflineFieldEngine(engine.splunk_app_path, props, TRANSFORMS)
+    fields = engine.extract("pairs=a=1|b=2|c", "test:sourcetype")
+    assert fields.get("a") == ["1"]
+    assert fields.get("b") == ["2"]
+    assert fields.get("c") == []
+
+
+def test_kv_mode_json(engine):
+    fields = engine.extract(
+        '{"user": {"name": "admin"}, "ids": [1, 2], "ok": true}', "test:json"
+    )
+    assert fields.get("user.name") == ["admin"]
+    assert fields.get("ids{}") == ["1", "2"]
+    assert fields.get("ok") == ["true"]
+    assert fields.get("missing") == []
+
+
+def test_kv_mode_auto(engine):
+    fields = engine.extract("user=admin action=allowed", "test:auto")
+    assert fields.get("user") == ["admin"]
+    # KV_MODE=auto extracts action=allowed in Splunk, which is not emulated
+    assert fields.get("action") is None
+    assert "KV_MODE=auto" in fields.get_reason("action")
+    assert fields.get("missing") == []
+
+
+def test_default_fields(engine):
+    fields = engine.extract(RAW, "test:sourcetype", host="host_1")
+    assert fields.get("host") == ["host_1"]
+    assert fields.get("index") == ["main"]
+    assert fields.get("source") is None
+    assert fields.get("eventtype") is None
+    assert fields.get("date_hour") is None
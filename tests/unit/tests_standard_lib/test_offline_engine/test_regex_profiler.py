@@ -0,0 +1,183 @@
+import pytest
+
+from pytest_splunk_addon.offline_engine import OfflineFieldEngine
+from pytest_splunk_addon.offline_engine.regex_profiler import (
+    RegexProfile,
+    RegexProfiler,
+    growth_exponent,
+    percentile,
+    profile_regex,
+)
+from pytest_splunk_addon.sample_generation.sample_event import SampleEvent
+
+PROPS = {
+    "test:sourcetype": {
+        "EXTRACT-linear": r"user=(?<user>\w+)",
+        "EXTRACT-quadratic": r"(?<x>\w*,)",
+        "EXTRACT-in_field": r"(?<initial>\w) in user",
+        "REPORT-transforms": "test_regex, test_delims, missing",
+    },
+    "test:other": {
+        "EXTRACT-catastrophic": r"^(?<y>(a+)+)$",
+        "EXTRACT-invalid": r"(?<z>\w+",
+    },
+    "source::.../test_*.log": {"EXTRACT-source": r"(?<a>\d+)"},
+    "test:no_events": {"EXTRACT-user": r"user=(?<user>\w+)"},
+}
+TRANSFORMS = {
+    "test_regex": {"REGEX": r"(\w+)=(\w+)", "SOURCE_KEY": "_raw"},
+    "test_delims": {"REGEX": r"\w", "DELIMS": '","'},
+}
+
+
+def make_event(raw, sourcetype="test:sourcetype", source="/var/log/test_1.log"):
+    return SampleEvent(raw, {"sourcetype": sourcetype, "source": source}, "sample")
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    def func(events, **kwargs):
+        engine = OfflineFieldEngine(str(tmp_path), props=PROPS, transforms=TRANSFORMS)
+        return RegexProfiler(engine, events, **kwargs)
+
+    return func
+
+
+@pytest.mark.parametrize(
+    "values, percent, expected",
+    [
+        ([], 50, None),
+        ([3, 1, 2], 50, 2),
+        ([3, 1, 2], 99, 3),
+        (list(range(100)), 99, 98),
+    ],
+)
+def test_percentile(values, percent, expected):
+    assert percentile(values, percent) == expected
+
+
+def test_growth_exponent():
+    assert growth_exponent([(10, 1.0), (20, 2.0), (40, 4.0)]) == pytest.approx(1)
+    assert growth_exponent([(10, 1.0), (20, 4.0), (40, 16.0)]) == pytest.approx(2)
+    assert growth_exponent([(10, 1.0), (10, 2.0)]) is None
+
+
+def test_profile_regex():
+    messages = []
+    profile_regex(messages.append, r"a", ["aaa"], repeat=1)
+    assert messages[0][:3] == ("event", None, 3)
+    growth = [message[1:3] for message in messages[1:-1]]
+    assert growth == [("repeated", length) for length in (3, 6, 12, 24, 48)] + [
+        ("stretched", length) for length in (3, 6, 12, 24, 48)
+    ]
+    assert messages[-1] == ("done",)
+
+
+def test_get_regexes(profiler):
+    assert list(profiler([]).get_regexes()) == [
+        ("test:sourcetype", "EXTRACT-in_field", r"(?<initial>\w)", "user"),
+        ("test:sourcetype", "EXTRACT-linear", r"user=(?<user>\w+)", None),
+        ("test:sourcetype", "EXTRACT-quadratic", r"(?<x>\w*,)", None),
+        (
+            "test:sourcetype",
+            "REPORT-transforms::test_regex",
+            r"(\w+)=(\w+)",
+            "_raw",
+        ),
+        ("test:other", "EXTRACT-catastrophic", r"^(?<y>(a+)+)$", None),
+        ("test:other", "EXTRACT-invalid", r"(?<z>\w+", None),
+        ("source::.../test_*.log", "EXTRACT-source", r"(?<a>\d+)", None),
+        ("test:no_events", "EXTRACT-user", r"user=(?<user>\w+)", None),
+    ]
+
+
+def test_get_texts(profiler):
+    regex_profiler = profiler(
+        [
+            make_event("user=admin"),
+            make_event("user=admin"),
+            make_event("user=root 1", source="/var/log/other.log"),
+            make_event("user=guest", "test:other"),
+        ]
+    )
+    assert regex_profiler.get_texts("test:sourcetype", None) == [
+        "user=admin",
+        "user=root 1",
+    ]
+    assert regex_profiler.get_texts("test:sourcetype", "user") == ["root", "admin"]
+    assert regex_profiler.get_texts("source::.../test_*.log", "_raw") == [
+        "user=admin",
+        "user=guest",
+    ]
+
+
+def test_get_texts_max_events(profiler):
+    regex_profiler = profiler(
+        [make_event("a" * length) for length in range(1, 11)], max_events=3
+    )
+    assert regex_profiler.get_texts("test:sourcetype", None) == [
+        "a",
+        "a" * 5,
+        "a" * 10,
+    ]
+
+
+def test_profile(profiler, tmp_path):
+    regex_profiler = profiler(
+        [
+            make_event("user=admin " + "a" * 300),
+            make_event("a" * 25 + "!", "test:other"),
+        ],
+        timeout=1,
+    )
+    profiles = regex_profiler.profile()
+    ranked = [(profile.name, profile.get_flag(1)) for profile in profiles]
+    assert ranked[0] == ("EXTRACT-catastrophic", "catastrophic: not done in 1s")
+    # \w* and \w+ scan the rest of a long run of letters from every position
+    assert set(ranked[1:3]) == {
+        ("EXTRACT-quadratic", "super-linear"),
+        ("REPORT-transforms::test_regex", "super-linear"),
+    }
+    assert ranked[-2:] == [
+        ("EXTRACT-invalid", "error: missing ), unterminated subpattern at position 0"),
+        ("EXTRACT-user", "no events"),
+    ]
+    linear = next(profile for profile in profiles if profile.name == "EXTRACT-linear")
+    assert len(linear.timings) == 1
+    assert not linear.super_linear
+    assert linear.p50 == linear.p99 > 0
+
+    report_path = tmp_path / "regex_profile.md"
+    regex_profiler.write_report(profiles, str(report_path))
+    report = report_path.read_text().splitlines()
+    assert report[0] == "# Regex profile"
+    assert report[6].startswith(
+        "| 1 | test:other | EXTRACT-catastrophic | 0 | - | - | - | - |"
+        " catastrophic: not done in 1s |"
+    )
+    assert report[-1].startswith("| 8 | test:no_events | EXTRACT-user | 0 |")
+
+
+def test_sort_key():
+    profiles = []
+    for name, timings, growth, timed_out in [
+        ("fast", [(1, 1e-6)], {"repeated": [(1, 1.0), (2, 2.0)]}, False),
+        ("no_events", [], {}, False),
+        ("slow", [(1, 1e-3)], {"repeated": [(1, 1.0), (2, 2.0)]}, False),
+        ("quadratic", [(1, 1e-6)], {"stretched": [(1, 1.0), (2, 4.0)]}, False),
+        ("timed_out", [], {}, True),
+        ("cubic", [(1, 1e-6)], {"repeated": [(1, 1.0), (2, 8.0)]}, False),
+    ]:
+        profile = RegexProfile("stanza", name, "regex")
+        profile.timings, profile.growth, profile.timed_out = timings, growth, timed_out
+        profiles.append(profile)
+    assert [
+        profile.name for profile in sorted(profiles, key=RegexProfile.sort_key)
+    ] == [
+        "timed_out",
+        "cubic",
+        "quadratic",
+        "slow",
+        "fast",
+        "no_events",
+    ]
@@ -0,0 +1,92 @@
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from pytest_splunk_addon.worker_barrier import WorkerBarrier
+
+
+@pytest.fixture()
+def barriers(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "pytest_splunk_addon.worker_barrier.tempfile.gettempdir",
+        lambda: str(tmp_path),
+    )
+
+    def create_barriers():
+        # The first and second worker use different lock handles on the same files
+        return (
+            WorkerBarrier("ingestion", "test_run"),
+            WorkerBarrier("ingestion", "test_run"),
+        )
+
+    return create_barriers
+
+
+def test_wait_blocks_until_first_worker_is_done(barriers):
+    first_worker, second_worker = barriers()
+    first_worker.claim()
+    outcome = []
+    waiter = threading.Thread(target=lambda: outcome.append(second_worker.wait()))
+    waiter.start()
+    waiter.join(0.5)
+    assert waiter.is_alive()
+    assert first_worker.run(MagicMock(return_value="ingested"), 1) == "ingested"
+    waiter.join(5)
+    assert outcome == [True]
+
+
+def test_wait_fails_fast_when_task_failed(barriers):
+    first_worker, second_worker = barriers()
+    first_worker.claim()
+    with pytest.raises(ValueError):
+        first_worker.run(MagicMock(side_effect=ValueError("HEC unavailable")))
+    with pytest.raises(
+        Exception,
+        match="ingestion failed on the first worker: ValueError: HEC unavailable",
+    ):
+        second_worker.wait()
+
+
+def test_wait_when_first_worker_did_not_run_task(barriers):
+    first_worker, second_worker = barriers()
+    first_worker.claim()
+    first_worker.release()
+    assert second_worker.wait() is False
+
+
+def test_wait_before_first_worker_claimed(barriers, monkeypatch):
+    first_worker, second_worker = barriers()
+    sleep_mock = MagicMock(side_effect=lambda _: first_worker.run(MagicMock()))
+    monkeypatch.setattr("pytest_splunk_addon.worker_barrier.sleep", sleep_mock)
+    assert second_worker.wait() is True
+    sleep_mock.assert_called_once()
+
+
+def test_wait_times_out_while_first_worker_runs_task(barriers):
+    first_worker, second_worker = barriers()
+    first_worker.claim()
+    with pytest.raises(
+        Exception,
+        match="Timed out after 0.2 seconds waiting for ingestion on the first worker",
+    ):
+        second_worker.wait(0.2)
+
+
+def test_late_worker_reads_outcome_after_first_worker_finished(barriers):
+    first_worker, late_worker = barriers()
+    first_worker.claim()
+    first_worker.run(MagicMock())
+    first_worker.release()
+    assert late_worker.wait(1) is True
+
+
+def test_cleanup_removes_barrier_files(barriers):
+    first_worker, _ = barriers()
+    first_worker.claim()
+    first_worker.run(MagicMock())
+    first_worker.release()
+    first_worker.cleanup()
+    assert not os.path.exists(first_worker.outcome_file)
+    assert not os.path.exists(first_worker.lock.lock_file)
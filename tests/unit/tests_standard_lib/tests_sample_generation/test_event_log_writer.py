@@ -0,0 +1,105 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from pytest_splunk_addon.sample_generation import SampleEvent
+from pytest_splunk_addon.sample_generation.event_log_writer import (
+    MANIFEST_FILE,
+    EventLogWriter,
+)
+from pytest_splunk_addon.sample_generation.indexed_events import IndexedEvents
+
+
+def get_events(suffix=""):
+    metadata = {
+        "input_type": "modinput",
+        "host": "host",
+        "sourcetype": "sourcetype",
+        "expected_event_count": 3,
+    }
+    return [
+        SampleEvent(
+            "event_{}{}".format(i, suffix),
+            metadata,
+            sample_name,
+            stanza_metadata=metadata,
+        )
+        for i, sample_name in enumerate(["sample_1", "sample_2", "sample_1"])
+    ]
+
+
+def read_lines(file_path):
+    with open(file_path) as file_obj:
+        return [json.loads(line) for line in file_obj]
+
+
+def test_write_json(tmp_path):
+    written = EventLogWriter(str(tmp_path)).write(get_events())
+    assert sorted(written) == ["sample_1.json", "sample_2.json"]
+    with open(tmp_path / "sample_1.json") as file_obj:
+        content = file_obj.read()
+    assert "\n" not in content
+    stored = json.loads(content)["sample_1"]
+    assert stored["metadata"]["host"] == "host"
+    assert stored["metadata"]["index"] == "main"
+    assert [event["event"] for event in stored["events"]] == ["event_0", "event_2"]
+    assert "unique_identifier" not in stored["events"][0]
+
+
+def test_write_jsonl(tmp_path):
+    events = get_events()
+    for event in events:
+        event.unique_identifier = "uuid_{}".format(event.event)
+    EventLogWriter(str(tmp_path), splunk_ep=True, event_format="jsonl").write(events)
+    lines = read_lines(tmp_path / "sample_1.jsonl")
+    assert lines[0]["sample_name"] == "sample_1"
+    assert lines[0]["metadata"]["expected_event_count"] == 3
+    assert [line["event"] for line in lines[1:]] == ["event_0", "event_2"]
+    assert [line["unique_identifier"] for line in lines[1:]] == [
+        "uuid_event_0",
+        "uuid_event_2",
+    ]
+
+
+def test_write_compressed(tmp_path):
+    EventLogWriter(str(tmp_path), compress=True).write(get_events())
+    with gzip.open(str(tmp_path / "sample_2.json.gz"), "rt") as file_obj:
+        stored = json.load(file_obj)
+    assert [event["event"] for event in stored["sample_2"]["events"]] == ["event_1"]
+    content = (tmp_path / "sample_2.json.gz").read_bytes()
+    EventLogWriter(str(tmp_path), compress=True).write(get_events())
+    assert (tmp_path / "sample_2.json.gz").read_bytes() == content
+
+
+def test_write_indexed_events(tmp_path):
+    events = get_events()
+    indexed_events = IndexedEvents.write(str(tmp_path / "events"), "conf", events)
+    EventLogWriter(str(tmp_path / "logs"), event_format="jsonl").write(indexed_events)
+    assert [
+        line["event"] for line in read_lines(tmp_path / "logs" / "sample_1.jsonl")[1:]
+    ] == ["event_0", "event_2"]
+
+
+def test_write_changed_only(tmp_path):
+    writer = EventLogWriter(str(tmp_path), changed_only=True)
+    assert len(writer.write(get_events())) == 2
+    with open(tmp_path / MANIFEST_FILE) as file_obj:
+        assert sorted(json.load(file_obj)) == ["sample_1.json", "sample_2.json"]
+    assert writer.write(get_events()) == []
+    events = get_events()
+    events[1] = get_events("_changed")[1]
+    assert writer.write(events) == ["sample_2.json"]
+    os.remove(tmp_path / "sample_1.json")
+    assert writer.write(events) == ["sample_1.json"]
+
+
+def test_write_no_events(tmp_path):
+    assert EventLogWriter(str(tmp_path / "logs")).write([]) == []
+    assert os.listdir(tmp_path / "logs") == [MANIFEST_FILE]
+
+
+def test_invalid_format(tmp_path):
+    with pytest.raises(Exception, match="Invalid event log format 'xml'"):
+        EventLogWriter(str(tmp_path), event_format="xml")
@@ -0,0 +1,95 @@
+import pickle
+
+import pytest
+
+from pytest_splunk_addon.sample_generation import SampleEvent
+from pytest_splunk_addon.sample_generation.indexed_events import IndexedEvents
+
+
+@pytest.fixture()
+def events():
+    metadata = {"input_type": "modinput", "host": "host"}
+    return [
+        SampleEvent(
+            "event_{}".format(i), metadata, sample_name, stanza_metadata=metadata
+        )
+        for i, sample_name in enumerate(
+            ["sample_1", "sample_1", "sample_1", "sample_2", "sample_1"]
+        )
+    ]
+
+
+def as_tuples(events):
+    return [(event.sample_name, event.event, event.metadata) for event in events]
+
+
+@pytest.fixture()
+def indexed_events(tmp_path, events):
+    return IndexedEvents.write(str(tmp_path / "fake_id_events"), "conf", events, 2)
+
+
+def test_write_and_iterate(indexed_events, events):
+    assert indexed_events.conf_name == "conf"
+    assert len(indexed_events) == 5
+    assert as_tuples(indexed_events) == as_tuples(events)
+    # Can be iterated more than once
+    assert as_tuples(indexed_events) == as_tuples(events)
+
+
+def test_chunks_are_indexed_by_sample_name(indexed_events):
+    assert [(chunk[0], chunk[3]) for chunk in indexed_events.chunks] == [
+        ("sample_1", 2),
+        ("sample_1", 1),
+        ("sample_2", 1),
+        ("sample_1", 1),
+    ]
+    assert indexed_events.sample_names == ["sample_1", "sample_2"]
+
+
+def test_get_sample_events(indexed_events, events):
+    assert as_tuples(indexed_events.get_sample_events("sample_1")) == as_tuples(
+        events[:3] + events[4:]
+    )
+    assert indexed_events.get_sample_events("sample_3") == []
+
+
+def test_get_metadata_events(tmp_path, events):
+    events[3].metadata = dict(events[3].metadata, sourcetype="test:sourcetype")
+    indexed_events = IndexedEvents.write(str(tmp_path / "events"), "conf", events)
+    assert [chunk[4]["sourcetype"] for chunk in indexed_events.chunks] == [
+        {None},
+        {"test:sourcetype"},
+        {None},
+    ]
+    assert as_tuples(
+        indexed_events.get_metadata_events(
+            ("sourcetype_to_search", "sourcetype"),
+            lambda sourcetype: sourcetype == "test:sourcetype",
+        )
+    ) == as_tuples(events[3:4])
+    assert list(indexed_events.get_metadata_events(("source",), bool)) == []
+
+
+def test_reopen_reads_only_the_index(indexed_events, events):
+    reopened = IndexedEvents(indexed_events.file_path)
+    assert reopened.chunks == indexed_events.chunks
+    assert as_tuples(reopened) == as_tuples(events)
+
+
+def test_pickled_as_list(indexed_events, events):
+    loaded = pickle.loads(pickle.dumps({"tokenized_events": indexed_events}))
+    assert isinstance(loaded["tokenized_events"], list)
+    assert as_tuples(loaded["tokenized_events"]) == as_tuples(events)
+
+
+def test_write_empty(tmp_path):
+    indexed_events = IndexedEvents.write(str(tmp_path / "events"), "conf", [])
+    assert list(indexed_events) == []
+    assert len(indexed_events) == 0
+
+
+def test_not_an_indexed_events_file(tmp_path):
+    file_path = tmp_path / "events"
+    file_path.write_bytes(pickle.dumps({"tokenized_events": []}))
+    with pytest.raises(Exception, match="is not an indexed events file"):
+        IndexedEvents(str(file_path))
@@ -0,0 +1,101 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pytest_splunk_addon.sample_generation.replacement_file import (
+    ReplacementFile,
+    ReplacementFileCache,
+)
+
+LOOKUP_DATA = (
+    "name,email,name\n user1 ,user1@email.com,x\n\n  \nuser2,user2@email.com,y"
+)
+
+
+@pytest.fixture
+def replacement_file(tmp_path):
+    def func(name="lookup.csv", data=LOOKUP_DATA):
+        file_path = tmp_path / name
+        file_path.write_text(data)
+        return str(file_path)
+
+    return func
+
+
+def test_replacement_file_lines():
+    replacement_file = ReplacementFile(LOOKUP_DATA)
+    assert replacement_file.values == [
+        "name,email,name",
+        "user1 ,user1@email.com,x",
+        "",
+        "user2,user2@email.com,y",
+    ]
+    assert replacement_file.lines == [
+        "name,email,name",
+        "user1 ,user1@email.com,x",
+        "user2,user2@email.com,y",
+    ]
+    assert replacement_file.rows[1] == ["user1 ", "user1@email.com", "x"]
+
+
+def test_replacement_file_lookup():
+    replacement_file = ReplacementFile(LOOKUP_DATA)
+    assert replacement_file.header == "name,email,name\n"
+    assert replacement_file.data_lines == [
+        "user1 ,user1@email.com,x",
+        "user2,user2@email.com,y",
+    ]
+    assert replacement_file.data_rows[1] == ["user2", "user2@email.com", "y"]
+    assert replacement_file.column_index("email") == 1
+    # Same as list.index, the first column of that name
+    assert replacement_file.column_index("name") == 0
+    with pytest.raises(ValueError):
+        replacement_file.column_index("ip")
+
+
+def test_cache_reads_file_once(replacement_file):
+    cache = ReplacementFileCache()
+    file_path = replacement_file()
+    with patch("builtins.open", wraps=open) as open_mock:
+        first = cache.get(file_path)
+        second = cache.get(file_path)
+    open_mock.assert_called_once()
+    assert first is second
+
+
+def test_cache_reads_changed_file(replacement_file):
+    cache = ReplacementFileCache()
+    file_path = replacement_file()
+    assert cache.get(file_path).lines[0] == "name,email,name"
+    replacement_file(data="changed\n")
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(file_path).lines == ["changed"]
+    assert cache.cached_bytes == len("changed\n")
+
+
+def test_cache_evicts_least_recently_used(replacement_file):
+    cache = ReplacementFileCache(max_bytes=10)
+    first = replacement_file("first", "12345")
+    second = replacement_file("second", "12345")
+    third = replacement_file("third", "12345")
+    cache.get(first)
+    cache.get(second)
+    cache.get(first)
+    cache.get(third)
+    assert list(cache._files) == [first, third]
+    assert cache.cached_bytes == 10
+
+
+def test_cache_skips_too_large_file(replacement_file):
+    cache = ReplacementFileCache(max_bytes=4)
+    file_path = replacement_file(data="12345")
+    assert cache.get(file_path).lines == ["12345"]
+    assert cache.cached_bytes == 0
+    assert not cache._files
+
+
+def test_cache_missing_file(tmp_path):
+    with pytest.raises(IOError):
+        ReplacementFileCache().get(str(tmp_path / "missing.csv"))
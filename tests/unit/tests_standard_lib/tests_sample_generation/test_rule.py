@@ -6,6 +6,10 @@ from freezegun import freeze_time
 from unittest.mock import MagicMock, call, patch, mock_open, ANY
 
 import pytest_splunk_addon.sample_generation.rule
+from pytest_splunk_addon.sample_generation.value_pool import shared_random
+from pytest_splunk_addon.sample_generation.replacement_file import (
+    ReplacementFileCache,
+)
 
 TOKEN_DATA = "token_data"
 FIELD = "Field"
@@ -286,7 +290,14 @@ class TestRule:
 @pytest.mark.parametrize(
     "repl_type, repl, expected, class_name, to_mock, ret_value",
     [
-        (RANDOM, "integer[30:212]", ([44, 44], [44, 44]), INT, "randint", 44),
+        (
+            RANDOM,
+            "integer[30:212]",
+            ([44, 44], [44, 44]),
+            INT,
+            "random_ints",
+            [44, 44],
+        ),
         (
             ALL,
             "Integer[4:7]",
@@ -300,24 +311,24 @@ class TestRule:
             "float[13.55:664.545]",
             ([22.33, 22.33], [22.33, 22.33]),
             FLOAT,
-            "uniform",
-            22.331,
+            "random_floats",
+            [22.331, 22.331],
         ),
         (
             RANDOM,
             "Float[13:664.545]",
             ([22.3, 22.3], [22.3, 22.3]),
             FLOAT,
-            "uniform",
-            22.331,
+            "random_floats",
+            [22.331, 22.331],
         ),
         (
             RANDOM,
             "List['elem_1', 'elem_2']",
             ([ELEM_1, ELEM_1], [ELEM_1, ELEM_1]),
             LIST,
-            CHOICE,
-            ELEM_1,
+            "random_choices",
+            [ELEM_1, ELEM_1],
         ),
         (
             ALL,
@@ -353,28 +364,59 @@ def test_rule(
 
 
 @pytest.mark.parametrize(
-    "class_name, return_value",
+    "class_name, random_bits, return_value",
     [
-        (IPV4_LOWER, "192.168.1.1"),
-        (IPV6_LOWER, "2001:0db8:0000:0000:0000:ff00:0042:8329"),
-        (MAC_ADDRESS, "AA-00-04-00-XX-YY"),
+        (IPV4_LOWER, 0xC0A80101, "192.168.1.1"),
+        (
+            IPV6_LOWER,
+            0x20010DB8000000000000FF0000428329,
+            "2001:db8::ff00:42:8329",
+        ),
     ],
 )
-def test_ip_rule(event, class_name, return_value):
+def test_ip_rule(event, class_name, random_bits, return_value):
     eve = event()
     rule = get_rule_class(class_name)(token())
-    with patch.object(rule.fake, class_name, MagicMock(return_value=return_value)):
+    with patch.object(
+        shared_random, "getrandbits", MagicMock(return_value=random_bits)
+    ):
         assert list(rule.replace(eve, 2)) == [
             token_value(key=return_value, value=return_value),
             token_value(key=return_value, value=return_value),
         ]
 
 
+def test_mac_rule(event):
+    eve = event()
+    rule = get_rule_class(MAC_ADDRESS)(token())
+    with patch.object(
+        shared_random, "getrandbits", MagicMock(return_value=0x0123456789AB)
+    ):
+        assert list(rule.replace(eve, 2)) == [
+            token_value(key="00:23:45:67:89:ab", value="00:23:45:67:89:ab"),
+            token_value(key="00:23:45:67:89:ab", value="00:23:45:67:89:ab"),
+        ]
+
+
+def test_rule_draws_from_value_pool(event):
+    eve = event()
+    rule = get_rule_class(INT)(
+        token(replacement="integer[1:10]", replacement_type=RANDOM)
+    )
+    with get_patch("random_ints", list(range(1, 9))) as random_ints:
+        values = [list(rule.replace(eve, 3)), list(rule.replace(eve, 3))]
+    assert values == [
+        [token_value(key=i, value=i) for i in range(1, 4)],
+        [token_value(key=i, value=i) for i in range(4, 7)],
+    ]
+    random_ints.assert_called_once_with(1, 10, 3)
+
+
 def test_guid_rule(event):
     eve = event()
     rule = get_rule_class(GUID)(token())
     _uuid = "123e4567-e89b-12d3-a456-426614174000"
-    with get_patch("uuid.uuid4", _uuid):
+    with get_patch("random_guids", [_uuid, _uuid]):
         assert list(rule.replace(eve, 2)) == [
             token_value(key=_uuid, value=_uuid),
             token_value(key=_uuid, value=_uuid),
@@ -406,6 +448,21 @@ def test_int_rule_no_match(event, caplog, class_name, warning_message):
 
 
 class TestFileRule:
+    @pytest.fixture(autouse=True)
+    def replacement_files(self, monkeypatch):
+        # The replacement files are mocked with mock_open, so they are read on every call
+        replacement_files = ReplacementFileCache()
+        monkeypatch.setattr(
+            replacement_files,
+            "_get_signature",
+            MagicMock(side_effect=lambda _: (object(), 0)),
+        )
+        monkeypatch.setattr(
+            "pytest_splunk_addon.sample_generation.rule.replacement_files",
+            replacement_files,
+        )
+        return replacement_files
+
     @pytest.mark.parametrize("index_sample_se", [(ELEM_1, ELEM_2), ValueError])
     def test_replace(self, event, index_sample_se):
         eve = event()
@@ -699,7 +756,7 @@ class TestTimeRule:
             token(), psa_data_params={"earliest": earliest, "latest": latest}
         )
         with get_patch("time_parse.convert_to_time", mocked_datetime), get_patch(
-            "randint", 1439905910
+            "random_ints", [1439905910] * 3
         ), get_patch("datetime.fromtimestamp", mocked_datetime), get_patch(
             "mktime", 1616779126
         ) as mktime_mock:
@@ -708,19 +765,21 @@ class TestTimeRule:
 
     @freeze_time("2020-11-01T04:16:13-04:00")
     @pytest.mark.parametrize(
-        "timezone, replacement, expected",
+        "timezone, replacement, timezone_offset, expected",
         [
             (
                 "local",
                 REPL,
+                None,
                 [
                     token_value(key=1616779126.0, value=REPL),
                     token_value(key=1616779126.0, value=REPL),
                 ],
             ),
             (
-                "0001",
+                "+0530",
                 "%s",
+                datetime.timedelta(hours=5, minutes=30),
                 [
                     token_value(key=1616779126.0, value="1616779126"),
                     token_value(key=1616779126.0, value="1616779126"),
@@ -728,21 +787,62 @@ class TestTimeRule:
             ),
         ],
     )
-    def test_replace_local_timezone(self, event, timezone, replacement, expected):
+    def test_replace_local_timezone(
+        self, event, timezone, replacement, timezone_offset, expected
+    ):
         eve = event()
         rule = get_rule_class(TIME)(
             token(replacement=replacement),
             psa_data_params={"earliest": "24h", "latest": "6h", "timezone": timezone},
         )
         with get_patch("time_parse.convert_to_time", mocked_datetime), get_patch(
-            "randint", 1616801099
-        ), get_patch("time_parse.get_timezone_time", mocked_datetime), patch.object(
-            rule, "invert_timezone", MagicMock(return_value="0000")
+            "random_ints", [1616801099] * 2
+        ), patch.object(
+            rule, "invert_timezone", MagicMock(return_value="+0000")
         ), get_patch(
             "mktime", 1616779126
         ) as mktime_mock:
             assert list(rule.replace(eve, 2)) == expected
-            mktime_mock.assert_has_calls([call(mocked_datetime.timetuple())] * 2)
+        random_time = datetime.datetime.fromtimestamp(1616801099)
+        if timezone_offset:
+            random_time += timezone_offset
+        else:
+            random_time = random_time.replace(tzinfo=datetime.timezone.utc).astimezone()
+        mktime_mock.assert_has_calls([call(random_time.timetuple())] * 2)
+
+    def test_time_window_resolved_once(self, event):
+        eve = event()
+        rule = get_rule_class(TIME)(
+            token(replacement="%s"),
+            psa_data_params={"earliest": "-1d", "latest": "now"},
+        )
+        with patch.object(
+            pytest_splunk_addon.sample_generation.rule.time_parse,
+            "convert_to_time",
+            MagicMock(return_value=datetime.datetime(2021, 3, 26)),
+        ) as convert_mock, get_patch("random_ints", [1616779126] * 4):
+            assert list(rule.replace(eve, 2)) == list(rule.replace(eve, 2))
+        convert_mock.assert_called_once_with("-", "1", "d")
+
+    def test_replace_latest_before_earliest(self, event):
+        eve = event()
+        rule = get_rule_class(TIME)(
+            token(), psa_data_params={"earliest": "now", "latest": "-1d"}
+        )
+        assert list(rule.replace(eve, 2)) == [TOKEN_DATA]
+
+    def test_time_sampler_timezone(self):
+        time_sampler = pytest_splunk_addon.sample_generation.rule.TimeSampler(
+            0, 1, "-0430", "%Y-%m-%d %H:%M", lambda _: "+0430"
+        )
+        epoch = 1616779126
+        random_time = datetime.datetime.fromtimestamp(epoch) - datetime.timedelta(
+            hours=4, minutes=30
+        )
+        assert time_sampler.get_time(epoch) == (
+            pytest.approx(epoch + time_sampler.time_delta),
+            random_time.strftime("%Y-%m-%d %H:%M"),
+        )
 
     @pytest.mark.parametrize(
         "timezone_time, expected",
@@ -955,7 +1055,7 @@ class TestSrcPortRule:
     def test_replace(self, event):
         eve = event()
         rule = get_rule_class(SRCPORT)(token())
-        with get_patch("randint", 4211):
+        with get_patch("random_ints", [4211, 4211]):
             assert list(rule.replace(eve, 2)) == [
                 token_value(key=4211, value=4211),
                 token_value(key=4211, value=4211),
@@ -966,7 +1066,7 @@ class TestDestPortRule:
     def test_replace(self, event):
         eve = event()
         rule = get_rule_class(DESTPORT)(token())
-        with get_patch(CHOICE, 22):
+        with get_patch("random_choices", [22, 22]):
             assert list(rule.replace(eve, 2)) == [
                 token_value(key=22, value=22),
                 token_value(key=22, value=22),
@@ -1030,7 +1130,7 @@ class TestHexRule:
                 "hex(3)",
                 [
                     token_value(key="888", value="888"),
-                    token_value(key="888888", value="888888"),
+                    token_value(key="888", value="888"),
                 ],
             ),
             ("not_correct(3)", []),
@@ -1040,5 +1140,5 @@ class TestHexRule:
     def test_replace(self, event, replacement, expected):
         eve = event()
         rule = get_rule_class(HEX)(token(replacement=replacement))
-        with get_patch("randint", 8):
+        with patch.object(shared_random, "getrandbits", MagicMock(return_value=0x888)):
             assert list(rule.replace(eve, 2)) == expected
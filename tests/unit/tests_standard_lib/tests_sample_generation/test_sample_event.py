@@ -1,4 +1,5 @@
 import importlib
+import pickle
 import pytest
 from collections import namedtuple
 from unittest.mock import patch, MagicMock
@@ -19,13 +20,16 @@ HOST = "host"
 
 
 @pytest.fixture
-def samp_eve():
+def samp_eve(monkeypatch):
     ip_mock = MagicMock()
     ip_mock.ipv4.return_value = FAKE_IPV4
     ip_mock.ipv6.return_value = FAKE_IPV6
-    with patch("faker.Faker") as faker_mock:
-        faker_mock.return_value = ip_mock
-        importlib.reload(pytest_splunk_addon.sample_generation.sample_event)
+    importlib.reload(pytest_splunk_addon.sample_generation.sample_event)
+    monkeypatch.setattr(
+        pytest_splunk_addon.sample_generation.sample_event,
+        "get_faker",
+        MagicMock(return_value=ip_mock),
+    )
     return pytest_splunk_addon.sample_generation.sample_event.SampleEvent(
         event_string=EVENT_STRING,
         metadata=METADATA,
@@ -169,6 +173,19 @@ def test_replace_token(samp_eve):
     assert samp_eve.event == f"Event_string {VALUE_1} {VALUE_2} dfd ddas {VALUE_1}"
 
 
+def test_replace_token_group(samp_eve):
+    TokenValue = namedtuple("TokenValue", ["value"])
+    samp_eve.replace_token(r"Value_(\d)", [TokenValue("X"), TokenValue("Y")])
+    assert samp_eve.event == "Event_string dad ad dfd ddas Value_X."
+
+
+def test_get_token_pattern():
+    module = pytest_splunk_addon.sample_generation.sample_event
+    pattern = module.get_token_pattern("d?ad", 0)
+    assert pattern.pattern == "d?ad"
+    assert module.get_token_pattern("d?ad", 0) is pattern
+
+
 def test_register_field_value(samp_eve, monkeypatch):
     field_1 = "field1"
     field_2 = "field2"
@@ -211,6 +228,53 @@ def test_copy(samp_eve):
     assert new_eve.host_count == 0
 
 
+def test_copy_requirement_test_data(samp_eve):
+    samp_eve.requirement_test_data = {
+        "cim_fields": {"src": "##src##"},
+        "other_fields": {"user": "##user##"},
+        "datamodels": {"model": "Authentication"},
+    }
+    TokenValue = namedtuple("TokenValue", ["key"])
+    new_eve = pytest_splunk_addon.sample_generation.sample_event.SampleEvent.copy(
+        samp_eve
+    )
+    new_eve.metadata["host"] = HOST
+    new_eve.update_requirement_test_field("src", "##src##", TokenValue("10.1.0.1"))
+    assert "host" not in samp_eve.metadata
+    assert new_eve.requirement_test_data["cim_fields"] == {"src": "10.1.0.1"}
+    assert samp_eve.requirement_test_data["cim_fields"] == {"src": "##src##"}
+    assert (
+        new_eve.requirement_test_data["datamodels"]
+        is samp_eve.requirement_test_data["datamodels"]
+    )
+
+
+def test_pickle_shares_stanza_metadata():
+    module = pytest_splunk_addon.sample_generation.sample_event
+    stanza_metadata = {"sourcetype": "test:sourcetype", "host": SAMPLE_HOST}
+    events = [
+        module.SampleEvent(
+            EVENT_STRING,
+            dict(stanza_metadata, host=f"{SAMPLE_HOST}_{index}"),
+            SAMPLE_NAME,
+            stanza_metadata=stanza_metadata,
+        )
+        for index in range(2)
+    ]
+    del events[1].metadata["sourcetype"]
+    events[1].unique_identifier = "uuid"
+    loaded_events = pickle.loads(pickle.dumps(events))
+    assert loaded_events[0].metadata == {
+        "sourcetype": "test:sourcetype",
+        "host": f"{SAMPLE_HOST}_0",
+    }
+    assert loaded_events[1].metadata == {"host": f"{SAMPLE_HOST}_1"}
+    assert loaded_events[0].stanza_metadata is loaded_events[1].stanza_metadata
+    assert not hasattr(loaded_events[0], "unique_identifier")
+    assert loaded_events[1].unique_identifier == "uuid"
+    assert not hasattr(loaded_events[0], "__dict__")
+
+
 def test_update_metadata(samp_eve):
     value = "value"
     header_without_prefix = f"{HOST}={value}_1 header={value}_2"
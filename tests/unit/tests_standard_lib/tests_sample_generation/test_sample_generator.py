@@ -1,7 +1,12 @@
-from unittest.mock import MagicMock, patch
+import pytest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, call, patch
 
+from pytest_splunk_addon.sample_generation import sample_event
+from pytest_splunk_addon.sample_generation.sample_event import SampleEvent
 from pytest_splunk_addon.sample_generation.sample_generator import (
     SampleGenerator,
+    tokenize_stanza,
 )
 
 MODULE_PATH = "pytest_splunk_addon.sample_generation.sample_generator"
@@ -10,12 +15,18 @@ CONFIG_PATH = "/config/path"
 
 
 class TestSampleGenerator:
+    @pytest.fixture(autouse=True)
+    def clean_samples(self):
+        yield
+        SampleGenerator.clean_samples()
+
     def test_init(self):
         sg = SampleGenerator(ADDON_PATH, CONFIG_PATH)
         assert sg.addon_path == ADDON_PATH
         assert sg.config_path == CONFIG_PATH
         assert sg.process_count == 4
         assert sg.splunk_ep is False
+        assert sg.seed is None
         sg = SampleGenerator(ADDON_PATH, CONFIG_PATH, splunk_ep=True, process_count=2)
         assert sg.addon_path == ADDON_PATH
         assert sg.config_path == CONFIG_PATH
@@ -34,12 +45,139 @@ class TestSampleGenerator:
         with patch(
             f"{MODULE_PATH}.PytestSplunkAddonDataParser",
             MagicMock(return_value=psa_data_mock),
-        ), patch(f"{MODULE_PATH}.SampleStanza", MagicMock()) as sample_stanza_mock:
-            sample_stanza_mock.get_raw_events = ["event_1", "event_2"]
-            sample_stanza_mock.tokenize = lambda x, y: (x, y)
+        ), patch(f"{MODULE_PATH}.ProcessPoolExecutor") as pool_mock:
             psa_data_mock.conf_name = CONFIG_PATH
-            sg = SampleGenerator(ADDON_PATH)
+            sg = SampleGenerator(ADDON_PATH, process_count=1)
             assert list(sg.get_samples()) == [tks_1, tks_2, tks_1, tks_2]
+            sample_mock.tokenize.assert_has_calls([call(CONFIG_PATH)] * 2)
+            pool_mock.assert_not_called()
+
+    def test_get_samples_in_processes(self):
+        stanzas = [MagicMock(), MagicMock(), MagicMock()]
+        for index, stanza in enumerate(stanzas):
+            stanza.get_tokenized_events.return_value = [f"tokenized_{index}"]
+            stanza.uses_counters.return_value = index == 1
+        psa_data_mock = MagicMock()
+        psa_data_mock.get_sample_stanzas.return_value = stanzas
+        psa_data_mock.conf_name = CONFIG_PATH
+
+        def submit(function, *args):
+            future = Future()
+            future.set_result(function(*args))
+            return future
+
+        with patch(
+            f"{MODULE_PATH}.PytestSplunkAddonDataParser",
+            MagicMock(return_value=psa_data_mock),
+        ), patch(f"{MODULE_PATH}.ProcessPoolExecutor") as pool_mock, patch(
+            f"{MODULE_PATH}.tokenize_stanza"
+        ) as tokenize_mock, patch(
+            f"{MODULE_PATH}.threading.active_count", return_value=1
+        ):
+            executor_mock = pool_mock.return_value.__enter__.return_value
+            executor_mock.submit.side_effect = submit
+            tokenize_mock.side_effect = lambda stanza, *args: stanza
+            sg = SampleGenerator(ADDON_PATH, process_count=2, seed=7)
+            assert list(sg.get_samples()) == [
+                "tokenized_0",
+                "tokenized_1",
+                "tokenized_2",
+            ]
+            assert pool_mock.call_args[0] == (2,)
+            executor_mock.submit.assert_has_calls(
+                [
+                    call(tokenize_mock, stanzas[0], CONFIG_PATH, 0, 7),
+                    call(tokenize_mock, stanzas[2], CONFIG_PATH, 2, 7),
+                ]
+            )
+            assert executor_mock.submit.call_count == 2
+            tokenize_mock.assert_has_calls(
+                [
+                    call(stanza, CONFIG_PATH, index, 7)
+                    for index, stanza in enumerate(stanzas)
+                ],
+                any_order=True,
+            )
+
+    def test_get_samples_not_in_processes_with_threads(self):
+        stanzas = [MagicMock(), MagicMock()]
+        for index, stanza in enumerate(stanzas):
+            stanza.get_tokenized_events.return_value = [f"tokenized_{index}"]
+            stanza.uses_counters.return_value = False
+        psa_data_mock = MagicMock()
+        psa_data_mock.get_sample_stanzas.return_value = stanzas
+        psa_data_mock.conf_name = CONFIG_PATH
+        with patch(
+            f"{MODULE_PATH}.PytestSplunkAddonDataParser",
+            MagicMock(return_value=psa_data_mock),
+        ), patch(f"{MODULE_PATH}.ProcessPoolExecutor") as pool_mock, patch(
+            f"{MODULE_PATH}.threading.active_count", return_value=3
+        ):
+            sg = SampleGenerator(ADDON_PATH, process_count=2)
+            assert list(sg.get_samples()) == ["tokenized_0", "tokenized_1"]
+            pool_mock.assert_not_called()
+            for stanza in stanzas:
+                stanza.tokenize.assert_called_once_with(CONFIG_PATH)
+
+    def test_get_samples_counters_are_sequential(self, monkeypatch):
+        for counter in [
+            "host_count",
+            "fqdn_count",
+            "url_ip_count",
+            "host_ipv4",
+            "dvc_ipv4",
+            "host_ipv4_octet_count",
+            "dvc_ipv4_octet_count",
+        ]:
+            monkeypatch.setattr(sample_event, counter, getattr(sample_event, counter))
+        monkeypatch.setattr(sample_event, "host_count", 0)
+        rules = ["src", "dest", "host", "dvc", "url"]
+        generated = {rule: [] for rule in rules + ["host_name"]}
+
+        def stanza_of_size(value_count):
+            def tokenize(conf_name):
+                event = SampleEvent("event", {}, "sample")
+                for rule in rules:
+                    generated[rule].extend(
+                        event.get_ipv4(rule) for _ in range(value_count)
+                    )
+                generated["host_name"].extend(
+                    event.get_host() for _ in range(value_count)
+                )
+
+            stanza = MagicMock()
+            stanza.tokenize.side_effect = tokenize
+            stanza.get_tokenized_events.return_value = []
+            stanza.uses_counters.return_value = True
+            return stanza
+
+        stanzas = [stanza_of_size(2000)] + [stanza_of_size(10) for _ in range(49)]
+        psa_data_mock = MagicMock()
+        psa_data_mock.get_sample_stanzas.return_value = stanzas
+        psa_data_mock.conf_name = CONFIG_PATH
+        with patch(
+            f"{MODULE_PATH}.PytestSplunkAddonDataParser",
+            MagicMock(return_value=psa_data_mock),
+        ):
+            list(SampleGenerator(ADDON_PATH, process_count=4).get_samples())
+        for values in generated.values():
+            assert len(values) == 2490
+            assert len(set(values)) == len(values)
+        assert generated["host_name"] == [
+            "host-sample-{}".format(count) for count in range(1, 2491)
+        ]
+
+    def test_tokenize_stanza(self):
+        stanza = MagicMock()
+        assert tokenize_stanza(stanza, CONFIG_PATH, 3) == stanza
+        stanza.tokenize.assert_called_once_with(CONFIG_PATH)
+
+    def test_tokenize_stanza_seeded(self):
+        with patch(f"{MODULE_PATH}.seed_random") as seed_mock:
+            tokenize_stanza(MagicMock(), CONFIG_PATH, 3)
+            seed_mock.assert_not_called()
+            tokenize_stanza(MagicMock(), CONFIG_PATH, 3, seed=42)
+            seed_mock.assert_called_once_with("42-3")
 
     def test_clean_samples(self):
         SampleGenerator.sample_stanzas = [10]
@@ -103,6 +103,24 @@ class TestSampleStanza:
                 assert m.metadata == "two"
                 assert m.key_fields == "three"
 
+    @pytest.mark.parametrize(
+        "uses_counters, replacement_type, expected",
+        [
+            (False, "random", False),
+            (True, "random", True),
+            (False, "all", True),
+        ],
+    )
+    def test_uses_counters(
+        self, sample_stanza, uses_counters, replacement_type, expected
+    ):
+        ss = sample_stanza()
+        rule = MagicMock(uses_counters=uses_counters, replacement_type=replacement_type)
+        ss.sample_rules = [MagicMock(uses_counters=False, replacement_type="static")]
+        assert ss.uses_counters() is False
+        ss.sample_rules.append(rule)
+        assert ss.uses_counters() is expected
+
     @pytest.mark.parametrize(
         "psa_data_params, conf_name, expected",
         [
@@ -269,7 +287,58 @@ class TestSampleStanza:
             MagicMock(return_value="sample_event"),
         ) as sample_event_mock:
             assert list(ss._get_raw_sample()) == ["sample_event"]
-            sample_event_mock.assert_called_with(*sample_event_params)
+            sample_event_mock.assert_called_with(
+                *sample_event_params, stanza_metadata=ss.metadata
+            )
+
+    def test_get_raw_sample_reads_file_once(self, sample_stanza):
+        ss = sample_stanza(psa_data_params={"tokens": tokens, "input_type": "modinput"})
+        with patch("builtins.open", mock_open(read_data="one\ntwo\n")) as open_mock:
+            first = list(ss._get_raw_sample())
+            second = list(ss._get_raw_sample())
+        open_mock.assert_called_once()
+        assert [e.event for e in first + second] == ["one", "two", "one", "two"]
+        assert [e.metadata["host"] for e in first + second] == [
+            "path_to.file_1",
+            "path_to.file_2",
+            "path_to.file_3",
+            "path_to.file_4",
+        ]
+
+    def test_get_raw_sample_requirement_templates_are_copied(self, sample_stanza):
+        ss = sample_stanza(
+            psa_data_params={
+                "tokens": tokens,
+                "input_type": "modinput",
+                "requirement_test_sample": "1",
+            }
+        )
+        data = (
+            "<device><event>"
+            '<raw>user=##user##</raw><transport host="static_host"/>'
+            "<cim><models><model>Authentication</model></models><cim_fields>"
+            '<field name="user" value="##user##"/></cim_fields></cim>'
+            "</event></device>"
+        )
+        with patch("builtins.open", mock_open(read_data=data)) as open_mock:
+            first = list(ss._get_raw_sample())
+            first[0].requirement_test_data["cim_fields"]["user"] = "tokenized"
+            second = list(ss._get_raw_sample())
+        open_mock.assert_called_once()
+        assert second[0].event == "user=##user##"
+        assert second[0].metadata["host"] == "static_host"
+        assert second[0].requirement_test_data["cim_fields"] == {"user": "##user##"}
+
+    def test_tokenize_clears_event_templates(self, sample_stanza):
+        ss = sample_stanza(
+            psa_data_params={"tokens": tokens, "input_type": "modinput", "count": "3"}
+        )
+        ss.sample_rules = []
+        with patch("builtins.open", mock_open(read_data="one\n")) as open_mock:
+            ss.tokenize("eventgen")
+        open_mock.assert_called_once()
+        assert [e.event for e in ss.tokenized_events] == ["one", "one", "one"]
+        assert ss._event_templates is None
 
     def test_get_raw_sample_empty_event(self, sample_stanza):
         ss = sample_stanza(
@@ -1,7 +1,12 @@
+import json
+import os
+import pickle
+
 import pytest
 from collections import namedtuple
-from unittest.mock import MagicMock, patch, mock_open, call
+from unittest.mock import MagicMock, patch, mock_open
 
+from pytest_splunk_addon.sample_generation.indexed_events import IndexedEvents
 from pytest_splunk_addon.sample_generation.sample_xdist_generator import (
     SampleXdistGenerator,
 )
@@ -74,6 +79,11 @@ tokenized_events = [
 
 
 class TestSampleXdistGenerator:
+    @pytest.fixture(autouse=True)
+    def clean_samples(self):
+        yield
+        SampleXdistGenerator.clean_samples()
+
     def test_init(self):
         sample_xdist_generator = SampleXdistGenerator("path", False, "config_path", 5)
         assert sample_xdist_generator.addon_path == "path"
@@ -87,18 +97,19 @@ class TestSampleXdistGenerator:
     )
     @patch("builtins.open", mock_open())
     @patch("pytest_splunk_addon.sample_generation.sample_xdist_generator.pickle")
+    @patch("pytest_splunk_addon.sample_generation.sample_xdist_generator.IndexedEvents")
     @pytest.mark.parametrize(
         "exists_value, environ, expected",
         [
             (
                 True,
                 {"PYTEST_XDIST_WORKER": "", "PYTEST_XDIST_TESTRUNUID": "fake_id"},
-                "pickle_loaded",
+                {"conf_name": "indexed_conf_name", "tokenized_events": "indexed"},
             ),
             (
                 False,
                 {"PYTEST_XDIST_WORKER": "", "PYTEST_XDIST_TESTRUNUID": "fake_id"},
-                {"conf_name": "conf_name", "tokenized_events": []},
+                {"conf_name": "indexed_conf_name", "tokenized_events": "indexed"},
             ),
             (
                 False,
@@ -107,8 +118,20 @@ class TestSampleXdistGenerator:
             ),
         ],
     )
-    def test_get_samples(self, pickle_mock, exists_value, environ, expected):
-        pickle_mock.load.return_value = "pickle_loaded"
+    def test_get_samples(
+        self,
+        indexed_events_mock,
+        pickle_mock,
+        exists_value,
+        environ,
+        expected,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(
+            SampleXdistGenerator, "tokenized_event_source", "new", False
+        )
+        indexed_events_mock.return_value.conf_name = "indexed_conf_name"
+        indexed_events_mock.return_value.__eq__ = lambda _, other: other == "indexed"
         sample_xdist_generator = SampleXdistGenerator("path", False)
         sample_xdist_generator.store_events = MagicMock()
         with patch("os.path.exists", MagicMock(return_value=exists_value)), patch(
@@ -121,43 +144,209 @@ class TestSampleXdistGenerator:
             sample_generator_mock.conf_name = "conf_name"
             sample_generator_mock.tokenized_events = "tokenized_events"
             assert sample_xdist_generator.get_samples(True) == expected
+        if exists_value:
+            indexed_events_mock.assert_called_once_with("fake_id_events")
+        elif "PYTEST_XDIST_WORKER" in environ:
+            indexed_events_mock.write.assert_called_once_with(
+                "fake_id_events", "conf_name", []
+            )
+            indexed_events_mock.assert_called_once_with("fake_id_events")
+        else:
+            indexed_events_mock.write.assert_not_called()
+
+    def test_get_samples_loaded_once(self, monkeypatch):
+        sample_xdist_generator = SampleXdistGenerator("path", False, "config")
+        store_sample = {"conf_name": "conf_name", "tokenized_events": tokenized_events}
+        monkeypatch.setattr(
+            sample_xdist_generator, "load_samples", MagicMock(return_value=store_sample)
+        )
+        assert sample_xdist_generator.get_samples(True) is store_sample
+        assert (
+            SampleXdistGenerator("path", False, "config").get_samples(True)
+            is store_sample
+        )
+        sample_xdist_generator.load_samples.assert_called_once_with(True)
+
+    def test_get_samples_from_controller(self, monkeypatch, tmp_path):
+        events_file = str(tmp_path / "fake_id_controller_events")
+        IndexedEvents.write(events_file, "conf_name", tokenized_events)
+        monkeypatch.setattr(SampleXdistGenerator, "events_file", events_file)
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        sample_xdist_generator = SampleXdistGenerator("path", False)
+        sample_xdist_generator.store_events = MagicMock()
+        with patch(
+            "pytest_splunk_addon.sample_generation.sample_xdist_generator.SampleGenerator"
+        ) as sample_generator_mock:
+            store_sample = sample_xdist_generator.get_samples(True)
+            sample_generator_mock.assert_not_called()
+        assert store_sample["conf_name"] == "conf_name"
+        assert list(store_sample["tokenized_events"]) == tokenized_events
+        sample_xdist_generator.store_events.assert_not_called()
+
+    @pytest.mark.parametrize("tokenized_event_source", ["new", "pregenerated"])
+    def test_write_events_file(self, monkeypatch, tmp_path, tokenized_event_source):
+        event_path = tmp_path / "events.pickle"
+        event_path.write_bytes(
+            pickle.dumps(
+                {"conf_name": "conf_name", "tokenized_events": tokenized_events}
+            )
+        )
+        monkeypatch.setattr(
+            SampleXdistGenerator,
+            "tokenized_event_source",
+            tokenized_event_source,
+            False,
+        )
+        monkeypatch.setattr(SampleXdistGenerator, "event_path", str(event_path), False)
+        sample_xdist_generator = SampleXdistGenerator("path", False)
+        sample_xdist_generator.store_events = MagicMock()
+        sample_xdist_generator.save_samples = MagicMock()
+        monkeypatch.setattr(
+            sample_xdist_generator,
+            "generate_events",
+            MagicMock(return_value=("conf_name", tokenized_events)),
+        )
+        events_file = str(tmp_path / "fake_id_controller_events")
+        sample_xdist_generator.write_events_file(events_file, True)
+        indexed_events = IndexedEvents(events_file)
+        assert indexed_events.conf_name == "conf_name"
+        assert list(indexed_events) == tokenized_events
+        sample_xdist_generator.store_events.assert_called_once_with(tokenized_events)
+        if tokenized_event_source == "new":
+            sample_xdist_generator.save_samples.assert_called_once_with(
+                {"conf_name": "conf_name", "tokenized_events": tokenized_events}
+            )
+        else:
+            sample_xdist_generator.generate_events.assert_not_called()
+            sample_xdist_generator.save_samples.assert_not_called()
+
+    def test_write_events_file_of_loaded_samples(self, tmp_path):
+        sample_xdist_generator = SampleXdistGenerator("path", False, "config")
+        SampleXdistGenerator.loaded_samples[sample_xdist_generator.memo_key] = {
+            "conf_name": "conf_name",
+            "tokenized_events": tokenized_events,
+        }
+        sample_xdist_generator.store_events = MagicMock()
+        sample_xdist_generator.save_samples = MagicMock()
+        sample_xdist_generator.generate_events = MagicMock()
+        events_file = str(tmp_path / "fake_id_controller_events")
+        sample_xdist_generator.write_events_file(events_file, True)
+        indexed_events = IndexedEvents(events_file)
+        assert indexed_events.conf_name == "conf_name"
+        assert list(indexed_events) == tokenized_events
+        sample_xdist_generator.generate_events.assert_not_called()
+        sample_xdist_generator.store_events.assert_not_called()
+        sample_xdist_generator.save_samples.assert_not_called()
 
     @pytest.mark.parametrize(
-        "exists_value, makedirs_calls, splunk_ep",
+        "seed, splunk_ep, expected",
         [
-            (True, [], False),
-            (False, [call("/path/to/cwd/.tokenized_events")], False),
-            (False, [call("/path/to/cwd/.tokenized_events")], False),
+            (None, False, None),
+            (42, True, None),
+            (42, False, "store/42_0123456789abcdef0123456789abcdef.events"),
         ],
     )
-    def test_store_events(self, exists_value, makedirs_calls, splunk_ep):
-        with patch("os.path.exists", MagicMock(return_value=exists_value)), patch(
-            "os.getcwd", MagicMock(return_value="/path/to/cwd")
-        ), patch("os.makedirs", MagicMock()) as mock_makedirs, patch(
-            "builtins.open", mock_open()
-        ) as open_mock:
-            sample_xdist_generator = SampleXdistGenerator("path", splunk_ep)
-            sample_xdist_generator.store_events(tokenized_events)
-            mock_makedirs.assert_has_calls(makedirs_calls)
-            open_mock.assert_has_calls(
-                [
-                    call("/path/to/cwd/.tokenized_events/sample_name_1.json", "w"),
-                    call("/path/to/cwd/.tokenized_events/sample_name_2.json", "w"),
-                ],
-                any_order=True,
+    def test_get_event_store_path(self, monkeypatch, seed, splunk_ep, expected):
+        monkeypatch.setattr(SampleXdistGenerator, "generation_seed", seed)
+        monkeypatch.setattr(SampleXdistGenerator, "event_store_dir", "store")
+        with patch(
+            "pytest_splunk_addon.sample_generation.sample_xdist_generator.get_addon_content_hash",
+            MagicMock(return_value="0123456789abcdef" * 4),
+        ) as hash_mock:
+            sample_xdist_generator = SampleXdistGenerator("path", splunk_ep, "config")
+            assert sample_xdist_generator.get_event_store_path() == expected
+            assert sample_xdist_generator.get_event_store_path() == expected
+        if expected:
+            hash_mock.assert_called_once_with("path", "config", extra_values=[42])
+
+    def test_generate_events_with_event_store(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(SampleXdistGenerator, "generation_seed", 42)
+        monkeypatch.setattr(SampleXdistGenerator, "event_store_dir", str(tmp_path))
+        sample_xdist_generator = SampleXdistGenerator("path", False, "config")
+        monkeypatch.setattr(
+            sample_xdist_generator,
+            "get_event_store_path",
+            lambda: str(tmp_path / "42_hash.events"),
+        )
+        with patch(
+            "pytest_splunk_addon.sample_generation.sample_xdist_generator.SampleGenerator",
+            MagicMock(),
+        ) as sample_generator_mock:
+            sample_generator_mock.conf_name = "conf_name"
+            sample_generator_mock.return_value.get_samples.return_value = iter(
+                tokenized_events
+            )
+            assert sample_xdist_generator.generate_events() == (
+                "conf_name",
+                tokenized_events,
             )
-            open_mock().write.assert_has_calls(
-                [
-                    call(
-                        '{\n\t"sample_name_1": {\n\t\t"metadata": {\n\t\t\t"host": "host_1",\n\t\t\t"source": "source_1",\n\t\t\t"sourcetype": "sourcetype_1",\n\t\t\t"timestamp_type": "timestamp_type_1",\n\t\t\t"input_type": "modinput",\n\t\t\t"expected_event_count": 1,\n\t\t\t"index": "main"\n\t\t},\n\t\t"events": [\n\t\t\t{\n\t\t\t\t"event": "event_field",\n\t\t\t\t"key_fields": "key_fields_field",\n\t\t\t\t"time_values": "time_values_field",\n\t\t\t\t"requirement_test_data": "requirement_test_data"\n\t\t\t},\n\t\t\t{\n\t\t\t\t"event": "event_field",\n\t\t\t\t"key_fields": "key_fields_field_3",\n\t\t\t\t"time_values": "time_values_field_3",\n\t\t\t\t"requirement_test_data": "requirement_test_data"\n\t\t\t}\n\t\t]\n\t}\n}'
-                    ),
-                    call(
-                        '{\n\t"sample_name_2": {\n\t\t"metadata": {\n\t\t\t"host": "host_2",\n\t\t\t"source": "source_2",\n\t\t\t"sourcetype": "sourcetype_2",\n\t\t\t"timestamp_type": "timestamp_type_2",\n\t\t\t"input_type": "input_else",\n\t\t\t"expected_event_count": 8,\n\t\t\t"index": "main"\n\t\t},\n\t\t"events": [\n\t\t\t{\n\t\t\t\t"event": "event_field",\n\t\t\t\t"key_fields": "key_fields_field",\n\t\t\t\t"time_values": "time_values_field",\n\t\t\t\t"requirement_test_data": "requirement_test_data"\n\t\t\t}\n\t\t]\n\t}\n}'
-                    ),
-                ]
+            sample_generator_mock.assert_called_once_with(
+                "path", "config", False, seed=42
             )
+            conf_name, stored_events = sample_xdist_generator.generate_events()
+            sample_generator_mock.assert_called_once()
+        assert conf_name == "conf_name"
+        assert list(stored_events) == tokenized_events
+
+    @pytest.mark.parametrize("exists_value", [True, False])
+    def test_store_events(self, monkeypatch, tmp_path, exists_value):
+        monkeypatch.chdir(tmp_path)
+        if exists_value:
+            (tmp_path / ".tokenized_events").mkdir()
+        sample_xdist_generator = SampleXdistGenerator("path", False)
+        sample_xdist_generator.store_events(tokenized_events)
+        with open(tmp_path / ".tokenized_events" / "sample_name_1.json") as file_obj:
+            assert json.load(file_obj) == {
+                "sample_name_1": {
+                    "metadata": {
+                        "host": "host_1",
+                        "source": "source_1",
+                        "sourcetype": "sourcetype_1",
+                        "timestamp_type": "timestamp_type_1",
+                        "input_type": "modinput",
+                        "expected_event_count": 1,
+                        "index": "main",
+                    },
+                    "events": [
+                        {
+                            "event": "event_field",
+                            "key_fields": "key_fields_field",
+                            "time_values": "time_values_field",
+                            "requirement_test_data": "requirement_test_data",
+                        },
+                        {
+                            "event": "event_field",
+                            "key_fields": "key_fields_field_3",
+                            "time_values": "time_values_field_3",
+                            "requirement_test_data": "requirement_test_data",
+                        },
+                    ],
+                }
+            }
+        with open(tmp_path / ".tokenized_events" / "sample_name_2.json") as file_obj:
+            assert json.load(file_obj) == {
+                "sample_name_2": {
+                    "metadata": {
+                        "host": "host_2",
+                        "source": "source_2",
+                        "sourcetype": "sourcetype_2",
+                        "timestamp_type": "timestamp_type_2",
+                        "input_type": "input_else",
+                        "expected_event_count": 8,
+                        "index": "main",
+                    },
+                    "events": [
+                        {
+                            "event": "event_field",
+                            "key_fields": "key_fields_field",
+                            "time_values": "time_values_field",
+                            "requirement_test_data": "requirement_test_data",
+                        }
+                    ],
+                }
+            }
 
-    def test_store_events_with_uuid(self):
+    def test_store_events_with_uuid(self, monkeypatch, tmp_path):
         tokenized_event = namedtuple(
             "tokenized_event",
             [
@@ -206,24 +395,23 @@ class TestSampleXdistGenerator:
                 "requirement_test_data",
             ),
         ]
-        with patch("os.path.exists", MagicMock(return_value=False)), patch(
-            "os.getcwd", MagicMock(return_value="/path/to/cwd")
-        ), patch("os.makedirs", MagicMock()) as mock_makedirs, patch(
-            "builtins.open", mock_open()
-        ) as open_mock:
-            sample_xdist_generator = SampleXdistGenerator("path", True)
-            sample_xdist_generator.store_events(tokenized_events)
-            mock_makedirs.assert_has_calls([call("/path/to/cwd/.tokenized_events")])
-            open_mock.assert_has_calls(
-                [
-                    call("/path/to/cwd/.tokenized_events/sample_with_uuid.json", "w"),
-                ],
-                any_order=True,
-            )
-            open_mock().write.assert_has_calls(
-                [
-                    call(
-                        '{\n\t"sample_with_uuid": {\n\t\t"metadata": {\n\t\t\t"host": "host_1",\n\t\t\t"source": "source_1",\n\t\t\t"sourcetype": "sourcetype_1",\n\t\t\t"timestamp_type": "timestamp_type_1",\n\t\t\t"input_type": "modinput",\n\t\t\t"expected_event_count": 1,\n\t\t\t"index": "main"\n\t\t},\n\t\t"events": [\n\t\t\t{\n\t\t\t\t"event": "event_field",\n\t\t\t\t"key_fields": "key_fields_field",\n\t\t\t\t"time_values": "time_values_field",\n\t\t\t\t"requirement_test_data": "requirement_test_data",\n\t\t\t\t"unique_identifier": "uuid"\n\t\t\t},\n\t\t\t{\n\t\t\t\t"event": "event_field",\n\t\t\t\t"key_fields": "key_fields_field_3",\n\t\t\t\t"time_values": "time_values_field_3",\n\t\t\t\t"requirement_test_data": "requirement_test_data",\n\t\t\t\t"unique_identifier": "uuid"\n\t\t\t}\n\t\t]\n\t}\n}'
-                    ),
-                ]
-            )
+        monkeypatch.chdir(tmp_path)
+        sample_xdist_generator = SampleXdistGenerator("path", True)
+        sample_xdist_generator.store_events(tokenized_events)
+        with open(tmp_path / ".tokenized_events" / "sample_with_uuid.json") as file_obj:
+            stored = json.load(file_obj)
+        assert [
+            event["unique_identifier"] for event in stored["sample_with_uuid"]["events"]
+        ] == ["uuid", "uuid"]
+        assert stored["sample_with_uuid"]["metadata"]["expected_event_count"] == 1
+
+    def test_store_events_options(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(SampleXdistGenerator, "event_log_format", "jsonl")
+        monkeypatch.setattr(SampleXdistGenerator, "event_log_compress", True)
+        SampleXdistGenerator("path", False).store_events(tokenized_events)
+        assert sorted(os.listdir(tmp_path / ".tokenized_events")) == [
+            ".manifest.json",
+            "sample_name_1.jsonl.gz",
+            "sample_name_2.jsonl.gz",
+        ]
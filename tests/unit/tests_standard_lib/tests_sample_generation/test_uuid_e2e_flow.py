@@ -432,7 +432,7 @@ class TestUUIDInTestGeneration:
 class TestUUIDInStoredEvents:
     """Test UUID persistence in stored tokenized events"""
 
-    def test_uuid_stored_in_tokenized_events_json(self):
+    def test_uuid_stored_in_tokenized_events_json(self, monkeypatch, tmp_path):
         """Verify UUID is included in stored tokenized events JSON"""
         tokenized_event = namedtuple(
             "tokenized_event",
@@ -466,32 +466,25 @@ class TestUUIDInStoredEvents:
             )
         ]
 
-        with patch("os.path.exists", return_value=False), patch(
-            "os.getcwd", return_value="/fake/path"
-        ), patch("os.makedirs"), patch("builtins.open", mock_open()) as open_mock:
-
-            xdist_generator = SampleXdistGenerator("/fake/addon", True, "/fake/config")
-            xdist_generator.store_events(events)
-
-            # Get the written JSON
-            write_calls = [call.args[0] for call in open_mock().write.call_args_list]
-            assert len(write_calls) > 0
-
-            # Parse the JSON
-            json_content = write_calls[0]
-            stored_data = json.loads(json_content)
-
-            # Verify UUID is in the stored data
-            assert "test_sample" in stored_data
-            sample_data = stored_data["test_sample"]
-            assert "metadata" in sample_data
-            assert "events" in sample_data
-            assert len(sample_data["events"]) > 0
-            # Verify unique_identifier is stored in events when splunk_ep is True
-            assert "unique_identifier" in sample_data["events"][0]
-            assert sample_data["events"][0]["unique_identifier"] == "uuid-12345-67890"
-
-    def test_uuid_not_stored_when_disabled(self):
+        monkeypatch.chdir(tmp_path)
+        xdist_generator = SampleXdistGenerator("/fake/addon", True, "/fake/config")
+        xdist_generator.store_events(events)
+
+        # Parse the written JSON
+        with open(tmp_path / ".tokenized_events" / "test_sample.json") as file_obj:
+            stored_data = json.load(file_obj)
+
+        # Verify UUID is in the stored data
+        assert "test_sample" in stored_data
+        sample_data = stored_data["test_sample"]
+        assert "metadata" in sample_data
+        assert "events" in sample_data
+        assert len(sample_data["events"]) > 0
+        # Verify unique_identifier is stored in events when splunk_ep is True
+        assert "unique_identifier" in sample_data["events"][0]
+        assert sample_data["events"][0]["unique_identifier"] == "uuid-12345-67890"
+
+    def test_uuid_not_stored_when_disabled(self, monkeypatch, tmp_path):
         """Verify UUID is NOT stored when flag is disabled"""
         tokenized_event = namedtuple(
             "tokenized_event",
@@ -525,26 +518,22 @@ class TestUUIDInStoredEvents:
             )
         ]
 
-        with patch("os.path.exists", return_value=False), patch(
-            "os.getcwd", return_value="/fake/path"
-        ), patch("os.makedirs"), patch("builtins.open", mock_open()) as open_mock:
-
-            xdist_generator = SampleXdistGenerator("/fake/addon", False, "/fake/config")
-            xdist_generator.store_events(events)
-
-            # Get the written JSON
-            write_calls = [call.args[0] for call in open_mock().write.call_args_list]
+        monkeypatch.chdir(tmp_path)
+        xdist_generator = SampleXdistGenerator("/fake/addon", False, "/fake/config")
+        xdist_generator.store_events(events)
 
-            if write_calls:
-                json_content = write_calls[0]
-                stored_data = json.loads(json_content)
+        # Parse the written JSON
+        with open(
+            tmp_path / ".tokenized_events" / "test_sample_no_uuid.json"
+        ) as file_obj:
+            stored_data = json.load(file_obj)
 
-                sample_data = stored_data["test_sample_no_uuid"]
-                assert "metadata" in sample_data
+        sample_data = stored_data["test_sample_no_uuid"]
+        assert "metadata" in sample_data
 
-                # Verify unique_identifier is NOT in events when splunk_ep is False
-                for event in sample_data["events"]:
-                    assert "unique_identifier" not in event
+        # Verify unique_identifier is NOT in events when splunk_ep is False
+        for event in sample_data["events"]:
+            assert "unique_identifier" not in event
 
 
 class TestUUIDSearchQueryGeneration:
@@ -0,0 +1,73 @@
+import pickle
+import ipaddress
+import random
+import re
+from unittest.mock import MagicMock
+
+from pytest_splunk_addon.sample_generation import value_pool
+from pytest_splunk_addon.sample_generation.value_pool import ValuePool
+
+
+def test_get_faker_is_shared():
+    assert value_pool.get_faker() is value_pool.get_faker()
+
+
+def test_pool_batches_grow_up_to_batch_size(monkeypatch):
+    monkeypatch.setattr(value_pool, "POOL_BATCH_SIZE", 8)
+    generate_batch = MagicMock(side_effect=lambda count: list(range(count)))
+    pool = ValuePool(generate_batch)
+    assert list(pool.take(3)) == [0, 1, 2]
+    assert list(pool.take(5)) == [0, 1, 2, 3, 4]
+    assert list(pool.take(4)) == [5, 0, 1, 2]
+    assert list(pool.take(12)) == [3, 4, 5, 6, 7, 0, 1, 2, 3, 4, 5, 6]
+    assert [each.args[0] for each in generate_batch.call_args_list] == [3, 6, 8, 8]
+
+
+def test_pool_larger_request_than_batch_size(monkeypatch):
+    monkeypatch.setattr(value_pool, "POOL_BATCH_SIZE", 2)
+    pool = ValuePool(lambda count: list(range(count)))
+    assert list(pool.take(5)) == [0, 1, 2, 3, 4]
+
+
+def test_pool_empty_batch():
+    assert list(ValuePool(lambda count: []).take(3)) == []
+
+
+def test_pool_pickled_without_values():
+    pool = ValuePool(value_pool.random_guids)
+    list(pool.take(2))
+    loaded = pickle.loads(pickle.dumps(pool))
+    assert loaded.generate_batch is value_pool.random_guids
+    assert loaded._values == [] and loaded.batch_size == 0
+
+
+def test_random_values_are_seeded():
+    value_pool.seed_random(10)
+    first = value_pool.random_ints(1, 3, 50), random.random()
+    value_pool.seed_random(10)
+    assert (value_pool.random_ints(1, 3, 50), random.random()) == first
+    assert set(first[0]) == {1, 2, 3}
+    value_pool.seed_random()
+
+
+def test_random_value_formats():
+    assert all(
+        13.5 <= each < 664.5 for each in value_pool.random_floats(13.5, 664.5, 20)
+    )
+    assert all(
+        re.fullmatch(r"[0-9a-f]{5}", each) for each in value_pool.random_hex(5, 20)
+    )
+    assert value_pool.random_hex(0, 1) == [""]
+    for mac in value_pool.random_macs(20):
+        assert re.fullmatch(r"([0-9a-f]{2}:){5}[0-9a-f]{2}", mac)
+        assert int(mac[:2], 16) % 2 == 0
+    for guid in value_pool.random_guids(20):
+        assert re.fullmatch(
+            r"[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}", guid
+        )
+    for ipv4 in value_pool.random_ipv4s(200):
+        address = ipaddress.IPv4Address(ipv4)
+        assert not (address.is_loopback or address.is_multicast or address.is_reserved)
+        assert not ipv4.startswith("0.")
+    for ipv6 in value_pool.random_ipv6s(20):
+        assert int(ipaddress.IPv6Address(ipv6)) >= 1 << 32